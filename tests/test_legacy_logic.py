@@ -1,6 +1,7 @@
 import os
 import tempfile
 import unittest
+import zipfile
 from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
 import twitch_drop_automator as legacy
@@ -60,6 +61,81 @@ class GeneralDropCompletionTests(unittest.IsolatedAsyncioTestCase):
 
         self.assertTrue(complete)
 
+    async def test_incomplete_progress_skips_claimed_lookups(self):
+        claimed_check = AsyncMock(return_value=True)
+        with (
+            patch.object(legacy, "get_general_drops_progress_map", AsyncMock(return_value={"Later Reward": 40})),
+            patch.object(legacy, "is_general_item_claimed_on_inventory", claimed_check),
+        ):
+            complete = await legacy.are_all_general_drops_complete(
+                object(),
+                [{"item": "Earlier Reward"}, {"item": "Later Reward"}],
+            )
+
+        self.assertFalse(complete)
+        claimed_check.assert_not_awaited()
+
+
+class ExitSignalTests(unittest.IsolatedAsyncioTestCase):
+    async def test_request_exit_from_thread_cancels_pending_wait(self):
+        never = legacy.asyncio.get_running_loop().create_future()
+        task = legacy.asyncio.ensure_future(never)
+        legacy.EXIT_EVENT.clear()
+        try:
+            legacy.asyncio.get_running_loop().call_later(
+                0.05, lambda: legacy.threading.Thread(target=legacy.request_exit).start()
+            )
+            with self.assertRaises(legacy.asyncio.CancelledError):
+                await legacy.asyncio.wait_for(legacy.wait_with_exit(task), timeout=2)
+        finally:
+            legacy.EXIT_EVENT.clear()
+
+        self.assertTrue(task.cancelled())
+
+    async def test_exit_still_wakes_this_loop_after_another_loop_used_the_mirror(self):
+        legacy.EXIT_EVENT.clear()
+        try:
+            sleeper = legacy.asyncio.ensure_future(legacy.sleep_or_exit(60))
+            await legacy.asyncio.sleep(0)
+            # While this loop waits, a short-lived private loop (like the dashboard scrape
+            # fallback) touches the exit mirror and then closes
+            other = legacy.threading.Thread(target=lambda: legacy.asyncio.run(legacy.sleep_or_exit(0)))
+            other.start()
+            other.join()
+            legacy.threading.Thread(target=legacy.request_exit).start()
+            exiting = await legacy.asyncio.wait_for(sleeper, timeout=2)
+        finally:
+            legacy.EXIT_EVENT.clear()
+
+        self.assertTrue(exiting)
+
+    async def test_sleep_or_exit_wakes_on_exit_request(self):
+        legacy.EXIT_EVENT.clear()
+        try:
+            legacy.asyncio.get_running_loop().call_later(0.05, legacy.request_exit)
+            exiting = await legacy.asyncio.wait_for(legacy.sleep_or_exit(60), timeout=2)
+        finally:
+            legacy.EXIT_EVENT.clear()
+
+        self.assertTrue(exiting)
+
+    def test_tray_stop_runs_inline_on_the_tray_worker_whatever_its_name(self):
+        icon = MagicMock()
+
+        def on_worker():
+            thread = legacy.threading.current_thread()
+            name, thread.name = thread.name, "renamed-worker"
+            try:
+                legacy._stop_tray_for_exit(timeout=0.2)
+                return icon.stop.call_count
+            finally:
+                thread.name = name
+
+        with patch.object(legacy, "TRAY_ICON", icon):
+            calls = legacy.TRAY_EXECUTOR.submit(on_worker).result(timeout=5)
+
+        self.assertEqual(calls, 1)
+
 
 class BrowserProfileLockTests(unittest.TestCase):
     def test_cleanup_removes_only_singleton_files(self):
@@ -75,6 +151,518 @@ class BrowserProfileLockTests(unittest.TestCase):
             self.assertTrue(os.path.exists(os.path.join(profile_dir, "Preferences")))
 
 
+class PreferencePersistenceTests(unittest.TestCase):
+    def test_unchanged_preferences_are_not_rewritten(self):
+        with tempfile.TemporaryDirectory() as config_dir:
+            config_path = os.path.join(config_dir, "config.json")
+            with patch.object(legacy, "CONFIG_PATH", config_path):
+                legacy.save_preferences({"headless": True})
+                os.utime(config_path, (0, 0))
+                legacy.save_preferences({"headless": True})
+                self.assertEqual(os.path.getmtime(config_path), 0)
+
+                legacy.save_preferences({"headless": False})
+                self.assertEqual(legacy.load_preferences()["headless"], False)
+                self.assertFalse(os.path.exists(config_path + ".tmp"))
+
+
+class UpdateCopyTests(unittest.TestCase):
+    def test_replace_copies_every_item_and_reports_failures(self):
+        with tempfile.TemporaryDirectory() as source, tempfile.TemporaryDirectory() as target:
+            os.makedirs(os.path.join(source, "templates"))
+            with open(os.path.join(source, "templates", "index.html"), "w", encoding="utf-8") as handle:
+                handle.write("new")
+            with open(os.path.join(source, "version.txt"), "w", encoding="utf-8") as handle:
+                handle.write("2.0")
+            os.makedirs(os.path.join(target, "templates"))
+            with open(os.path.join(target, "templates", "stale.html"), "w", encoding="utf-8") as handle:
+                handle.write("old")
+            items = [
+                (name, os.path.join(source, name), os.path.join(target, name))
+                for name in ("templates", "version.txt", "missing.txt")
+            ]
+
+            with self.assertRaisesRegex(OSError, "missing.txt"):
+                legacy.copy_update_items(items, "Updated", replace=True)
+
+            self.assertEqual(os.listdir(os.path.join(target, "templates")), ["index.html"])
+            self.assertTrue(os.path.exists(os.path.join(target, "version.txt")))
+
+    def test_backup_links_unchanged_files_and_install_leaves_them_alone(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            current, release, backup = (os.path.join(workdir, name) for name in ("current", "release", "backup"))
+            for root, changed in ((current, "old"), (release, "new")):
+                os.makedirs(os.path.join(root, "static"))
+                with open(os.path.join(root, "static", "same.js"), "w", encoding="utf-8") as handle:
+                    handle.write("same")
+                with open(os.path.join(root, "static", "changed.js"), "w", encoding="utf-8") as handle:
+                    handle.write(changed)
+            same_inode = os.stat(os.path.join(current, "static", "same.js")).st_ino
+
+            legacy.copy_update_items(
+                [("static", os.path.join(current, "static"), os.path.join(backup, "static"))],
+                "Backed up",
+                link_unchanged_from=release,
+            )
+            legacy.copy_update_items(
+                [("static", os.path.join(release, "static"), os.path.join(current, "static"))],
+                "Updated",
+                replace=True,
+            )
+
+            self.assertEqual(os.stat(os.path.join(backup, "static", "same.js")).st_ino, same_inode)
+            self.assertEqual(os.stat(os.path.join(current, "static", "same.js")).st_ino, same_inode)
+            with open(os.path.join(backup, "static", "changed.js"), encoding="utf-8") as handle:
+                self.assertEqual(handle.read(), "old")
+            with open(os.path.join(current, "static", "changed.js"), encoding="utf-8") as handle:
+                self.assertEqual(handle.read(), "new")
+
+    def test_swap_renames_staged_items_into_place_and_clears_old_ones(self):
+        with tempfile.TemporaryDirectory() as base:
+            staging = os.path.join(base, legacy.UPDATE_STAGING_PREFIX + "x")
+            os.makedirs(os.path.join(staging, "templates"))
+            with open(os.path.join(staging, "templates", "index.html"), "w", encoding="utf-8") as handle:
+                handle.write("new")
+            os.makedirs(os.path.join(base, "templates"))
+            with open(os.path.join(base, "templates", "stale.html"), "w", encoding="utf-8") as handle:
+                handle.write("old")
+
+            with patch.object(legacy.threading, "Thread") as thread:
+                legacy.swap_in_update_items(
+                    [("templates", os.path.join(staging, "templates"), os.path.join(base, "templates"))],
+                    "Updated",
+                )
+            (retired,) = thread.call_args.kwargs["args"]
+            legacy._remove_update_leftovers(retired)
+
+            self.assertEqual(os.listdir(os.path.join(base, "templates")), ["index.html"])
+            self.assertEqual(sorted(os.listdir(base)), sorted([legacy.UPDATE_STAGING_PREFIX + "x", "templates"]))
+
+    def test_archive_extraction_writes_members_and_skips_escaping_paths(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            zip_path = os.path.join(workdir, "update.zip")
+            with zipfile.ZipFile(zip_path, "w") as archive:
+                archive.writestr("twitch-drops-main/", "")
+                archive.writestr("twitch-drops-main/templates/index.html", "<html></html>")
+                archive.writestr("../escaped.txt", "nope")
+            extract_dir = os.path.join(workdir, "extracted")
+
+            legacy.extract_update_archive(zip_path, extract_dir)
+
+            with open(os.path.join(extract_dir, "twitch-drops-main", "templates", "index.html"), encoding="utf-8") as handle:
+                self.assertEqual(handle.read(), "<html></html>")
+            self.assertFalse(os.path.exists(os.path.join(workdir, "escaped.txt")))
+
+    def test_large_archive_members_extract_in_parallel(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            zip_path = os.path.join(workdir, "update.zip")
+            with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+                for index in range(6):
+                    archive.writestr(f"repo/static/file{index}.txt", str(index) * 1000)
+            extract_dir = os.path.join(workdir, "extracted")
+
+            with patch.object(legacy, "UPDATE_PARALLEL_MIN_MEMBERS", 2):
+                legacy.extract_update_archive(zip_path, extract_dir)
+
+            extracted = sorted(os.listdir(os.path.join(extract_dir, "repo", "static")))
+            self.assertEqual(extracted, [f"file{index}.txt" for index in range(6)])
+            with open(os.path.join(extract_dir, "repo", "static", "file5.txt"), encoding="utf-8") as handle:
+                self.assertEqual(handle.read(), "5" * 1000)
+
+    def test_installer_failures_are_collected_from_every_process(self):
+        pip, browsers = MagicMock(), MagicMock()
+        pip.wait.return_value = 1
+        browsers.wait.return_value = 2
+
+        with self.assertRaises(legacy.InstallerError) as raised:
+            legacy._wait_for_installers({"pip": (["pip"], pip), "browsers": (["playwright"], browsers)}, 5)
+
+        self.assertEqual([(name, error.returncode) for name, error in raised.exception.failures], [("pip", 1), ("browsers", 2)])
+        browsers.wait.assert_called_once()
+        self.assertIn("browsers", str(raised.exception))
+
+    def test_browsers_install_waits_for_pip_unless_playwright_is_already_satisfied(self):
+        with tempfile.TemporaryDirectory() as workdir:
+            requirements_path = os.path.join(workdir, "requirements.txt")
+            with open(requirements_path, "w", encoding="utf-8") as handle:
+                handle.write("playwright>=1.45.0  # browser automation\nflask>=2.3.0\n")
+
+            for installed, overlapped in (("1.50.0", True), ("1.40.0", False), (None, False)):
+                events = []
+
+                def popen(args, **_kwargs):
+                    name = "browsers" if "playwright" in args else "pip"
+                    events.append(("start", name))
+                    process = MagicMock()
+                    process.wait.side_effect = lambda timeout=None, name=name: events.append(("wait", name)) or 0
+                    return process
+
+                with (
+                    patch.object(legacy, "_venv_playwright_version", return_value=installed),
+                    patch.object(legacy.subprocess, "Popen", side_effect=popen),
+                ):
+                    legacy.install_requirements_and_browsers("python", "pip", requirements_path)
+
+                expected = (
+                    [("start", "pip"), ("start", "browsers"), ("wait", "pip"), ("wait", "browsers")]
+                    if overlapped
+                    else [("start", "pip"), ("wait", "pip"), ("start", "browsers"), ("wait", "browsers")]
+                )
+                self.assertEqual(events, expected, installed)
+
+
+class InventoryNavigationTests(unittest.IsolatedAsyncioTestCase):
+    async def test_back_to_back_scrapes_reuse_loaded_inventory(self):
+        class FakePage:
+            url = "about:blank"
+            locator = MagicMock()
+            reload = AsyncMock(return_value=None)
+
+        page = FakePage()
+        page.locator.return_value.first.wait_for = AsyncMock(return_value=None)
+
+        async def navigate(target, url, **_kwargs):
+            target.url = url
+
+        goto = AsyncMock(side_effect=navigate)
+        with (
+            patch.object(legacy, "goto_with_exit", goto),
+            patch.object(legacy, "maybe_accept_cookies", AsyncMock(return_value=None)),
+        ):
+            await legacy._load_inventory_page(page)
+            await legacy._load_inventory_page(page)
+
+        goto.assert_awaited_once()
+        page.reload.assert_not_awaited()
+        page.locator.return_value.first.wait_for.assert_awaited_once_with(state="attached", timeout=8000)
+
+    async def test_progress_map_and_rewards_share_one_scrape(self):
+        class FakePage:
+            wait_for_timeout = AsyncMock(return_value=None)
+
+        page = FakePage()
+
+        async def load(target, **_kwargs):
+            legacy._INVENTORY_LOADED_AT[target] = 1.0
+
+        scraper = AsyncMock(return_value=[
+            {"title": "Done Reward", "percent": 100, "hours": 2},
+            {"title": "Half Reward", "percent": 50, "hours": 4},
+        ])
+        with (
+            patch.object(legacy, "_load_inventory_page", AsyncMock(side_effect=load)),
+            patch.object(legacy, "evaluate_scraper", scraper),
+            patch.object(legacy, "_INVENTORY_GQL_SNAPSHOT", None),
+            patch.object(legacy, "_INVENTORY_GQL_TEMPLATE", None),
+        ):
+            progress = await legacy.get_inventory_progress_map(page)
+            rewards = await legacy.get_incomplete_rust_rewards(page)
+
+        scraper.assert_awaited_once()
+        self.assertEqual(progress, {"Done Reward": 100, "Half Reward": 50})
+        self.assertEqual([r["title"] for r in rewards], ["Half Reward"])
+
+    async def test_claim_invalidates_cached_inventory_scrapes(self):
+        class FakePage:
+            on = MagicMock()
+            locator = MagicMock()
+
+        page = FakePage()
+        button = MagicMock()
+        button.click = AsyncMock(return_value=None)
+        page.locator.return_value.count = AsyncMock(return_value=1)
+        page.locator.return_value.nth.return_value = button
+        legacy._INVENTORY_LOADED_AT[page] = 1.0
+        legacy._INVENTORY_SCRAPE_CACHE[page] = (1.0, {"inventoryItems": []})
+
+        with patch.object(legacy.asyncio, "sleep", AsyncMock(return_value=None)):
+            claimed = await legacy.claim_available_rewards(page, navigate=False)
+
+        self.assertEqual(claimed, 1)
+        self.assertNotIn(page, legacy._INVENTORY_LOADED_AT)
+        self.assertNotIn(page, legacy._INVENTORY_SCRAPE_CACHE)
+
+    async def test_live_progress_update_marks_inventory_fresh(self):
+        class FakePage:
+            evaluate = AsyncMock(side_effect=[{"hit": True, "value": True}, 1])
+            wait_for_function = AsyncMock(return_value=None)
+
+        page = FakePage()
+        legacy._INVENTORY_LOADED_AT.pop(page, None)
+
+        await legacy.wait_for_inventory_change(page, 60)
+
+        page.wait_for_function.assert_awaited_once()
+        self.assertIn(page, legacy._INVENTORY_LOADED_AT)
+
+    def test_inventory_gql_response_maps_drop_and_reward_names(self):
+        response = {"data": {"currentUser": {"inventory": {"dropCampaignsInProgress": [{
+            "timeBasedDrops": [
+                {
+                    "name": "Streamer Drop",
+                    "requiredMinutesWatched": 120,
+                    "self": {"currentMinutesWatched": 30, "isClaimed": False},
+                    "benefitEdges": [{"benefit": {"name": "Example Hoodie"}}],
+                },
+                {"name": "Claimed Drop", "requiredMinutesWatched": 60, "self": {"isClaimed": True}},
+            ],
+        }]}}}}
+
+        self.assertEqual(
+            legacy.parse_inventory_gql_progress(response),
+            {"Streamer Drop": 25, "Example Hoodie": 25},
+        )
+        self.assertNotIn("Claimed Drop", legacy.parse_inventory_gql_progress(response))
+        self.assertIsNone(legacy.parse_inventory_gql_progress({"errors": [{"message": "failed integrity check"}]}))
+
+    async def test_inventory_tab_gql_response_is_reused_without_replaying(self):
+        handlers = {}
+        page = MagicMock()
+        page.on = lambda event, handler: handlers.setdefault(event, handler)
+        request = MagicMock()
+        request.url = legacy.TWITCH_GQL_URL
+        request.method = "POST"
+        request.post_data = '[{"operationName": "Inventory"}]'
+        request.headers = {"Client-Id": "abc"}
+        response = MagicMock()
+        response.request = request
+        response.json = AsyncMock(return_value=[{"data": {"currentUser": {"inventory": {"dropCampaignsInProgress": [{
+            "timeBasedDrops": [{"name": "Streamer Drop", "requiredMinutesWatched": 100, "self": {"currentMinutesWatched": 40}}],
+        }]}}}}])
+        context = MagicMock()
+        context.request.post = AsyncMock()
+
+        with (
+            patch.object(legacy, "_INVENTORY_GQL_TEMPLATE", None),
+            patch.object(legacy, "_INVENTORY_GQL_SNAPSHOT", None),
+        ):
+            legacy.capture_inventory_gql(page)
+            handlers["request"](request)
+            await handlers["response"](response)
+            progress = await legacy.get_inventory_progress_via_gql(context)
+
+        self.assertEqual(progress, {"Streamer Drop": 40})
+        context.request.post.assert_not_awaited()
+
+
+class FacepunchCacheTests(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_fetches_share_one_scrape(self):
+        context = object()
+        result = {"general": [], "streamer": [{"streamer": "ExampleStreamer", "is_live": True}], "fetch_failed": False}
+
+        async def slow_fetch(_context):
+            await legacy.asyncio.sleep(0.01)
+            return result
+
+        fetch = AsyncMock(side_effect=slow_fetch)
+        with (
+            patch.object(legacy, "_FACEPUNCH_CACHE", None),
+            patch.object(legacy, "_fetch_facepunch_drops_uncached", fetch),
+        ):
+            first, second = await legacy.asyncio.gather(
+                legacy.fetch_facepunch_drops(context),
+                legacy.fetch_facepunch_drops(context),
+            )
+            online = await legacy.is_streamer_online_on_facepunch(context, "examplestreamer")
+
+        fetch.assert_awaited_once()
+        self.assertIs(first, second)
+        self.assertTrue(online)
+
+    async def test_stream_open_uses_first_path_and_cancels_direct_load(self):
+        popup = object()
+        direct_started = legacy.asyncio.Event()
+        direct_cancelled = legacy.asyncio.Event()
+
+        async def slow_direct(_context, _url):
+            direct_started.set()
+            try:
+                await legacy.asyncio.sleep(60)
+            except legacy.asyncio.CancelledError:
+                direct_cancelled.set()
+                raise
+
+        async def click(_context, _name):
+            await direct_started.wait()
+            return popup
+
+        with (
+            patch.object(legacy, "_open_stream_via_facepunch", click),
+            patch.object(legacy, "_open_stream_via_url", slow_direct),
+        ):
+            page = await legacy.open_stream_for_streamer(object(), "ExampleStreamer", "https://www.twitch.tv/example")
+            await legacy.asyncio.sleep(0)
+
+        self.assertIs(page, popup)
+        self.assertTrue(direct_cancelled.is_set())
+
+    async def test_facepunch_path_only_accepts_the_drop_box_popup(self):
+        popup = object()
+
+        class PopupInfo:
+            async def __aenter__(self):
+                info = MagicMock()
+                future = legacy.asyncio.get_running_loop().create_future()
+                future.set_result(popup)
+                info.value = future
+                return info
+
+            async def __aexit__(self, *_exc):
+                return False
+
+        link = MagicMock()
+        link.click = AsyncMock()
+        box = MagicMock()
+        box.query_selector = AsyncMock(return_value=link)
+        fp_page = MagicMock()
+        fp_page.query_selector = AsyncMock(return_value=box)
+        fp_page.expect_popup = MagicMock(return_value=PopupInfo())
+        context = MagicMock()
+
+        with (
+            patch.object(legacy, "fetch_facepunch_drops", AsyncMock(return_value={})),
+            patch.object(legacy, "get_facepunch_page", AsyncMock(return_value=fp_page)),
+        ):
+            page = await legacy._open_stream_via_facepunch(context, "ExampleStreamer")
+
+        self.assertIs(page, popup)
+        fp_page.expect_popup.assert_called_once_with()
+        context.expect_page.assert_not_called()
+        link.click.assert_awaited_once()
+
+
+class ScreencastTests(unittest.IsolatedAsyncioTestCase):
+    async def test_screencast_frames_are_forwarded_and_acked_after_interval(self):
+        handlers = {}
+        session = MagicMock()
+        session.send = AsyncMock(return_value=None)
+        session.on = lambda event, handler: handlers.setdefault(event, handler)
+        page = MagicMock()
+        page.url = "https://www.twitch.tv/example"
+        page.context.new_cdp_session = AsyncMock(return_value=session)
+        emitted = []
+
+        with (
+            patch.object(legacy, "SCREENSHOT_INTERVAL", 0.01),
+            patch.object(legacy, "publish_screenshot", lambda payload: emitted.append(("screenshot", payload))),
+        ):
+            await legacy._start_page_screencast(page)
+            handlers["Page.screencastFrame"]({"data": "A" * 2000, "sessionId": 7})
+            await legacy.asyncio.sleep(0.05)
+
+        event, payload = emitted[0]
+        self.assertEqual(event, "screenshot")
+        self.assertEqual((payload["mime"], payload["image_b64"]), ("image/jpeg", "A" * 2000))
+        session.send.assert_any_await("Page.screencastFrameAck", {"sessionId": 7})
+
+    def test_scanned_preview_page_is_reused_until_a_new_page_opens(self):
+        handlers = {}
+        context = MagicMock()
+        context.on = lambda event, handler: handlers.setdefault(event, handler)
+        page = MagicMock()
+        page.url = "https://www.twitch.tv/example"
+        page.is_closed.return_value = False
+        context.pages = [page]
+
+        with (
+            patch.object(legacy, "current_browser_context", context),
+            patch.object(legacy, "current_working_page", None),
+            patch.dict(legacy._SCREENSHOT_PAGE_CACHE, {"context": None, "page": None}),
+        ):
+            self.assertIs(legacy._select_screenshot_page(), page)
+            stream_page = MagicMock()
+            stream_page.url = "https://www.twitch.tv/example/videos/1"
+            stream_page.is_closed.return_value = False
+            context.pages = [page, stream_page]
+            self.assertIs(legacy._select_screenshot_page(), page)
+            handlers["page"](stream_page)
+            self.assertIs(legacy._select_screenshot_page(), stream_page)
+
+    def test_scanned_preview_page_is_dropped_when_a_blank_tab_navigates_to_a_stream(self):
+        context_handlers, page_handlers = {}, {}
+        context = MagicMock()
+        context.on = lambda event, handler: context_handlers.setdefault(event, handler)
+
+        def make_page(url):
+            page = MagicMock()
+            page.url = url
+            page.is_closed.return_value = False
+            page.on = lambda event, handler, page=page: page_handlers.setdefault((page, event), handler)
+            return page
+
+        facepunch = make_page("https://twitch.facepunch.com/")
+        context.pages = [facepunch]
+
+        with (
+            patch.object(legacy, "current_browser_context", context),
+            patch.object(legacy, "current_working_page", None),
+            patch.dict(legacy._SCREENSHOT_PAGE_CACHE, {"context": None, "page": None}),
+        ):
+            self.assertIs(legacy._select_screenshot_page(), facepunch)
+            new_tab = make_page("about:blank")
+            context.pages = [facepunch, new_tab]
+            context_handlers["page"](new_tab)
+            self.assertIs(legacy._select_screenshot_page(), facepunch)
+
+            new_tab.url = "https://www.twitch.tv/example/videos/1"
+            child_frame = MagicMock()
+            page_handlers[(new_tab, "framenavigated")](child_frame)
+            self.assertIs(legacy._select_screenshot_page(), facepunch)
+            page_handlers[(new_tab, "framenavigated")](MagicMock(parent_frame=None))
+            self.assertIs(legacy._select_screenshot_page(), new_tab)
+
+    async def test_fallback_capture_reuses_one_cdp_session_per_page(self):
+        session = MagicMock()
+        session.send = AsyncMock(return_value={"data": "B" * 1000})
+        page = MagicMock()
+        page.url = "https://www.twitch.tv/example"
+        page.is_closed.return_value = False
+        page.viewport_size = {"width": 1200, "height": 768}
+        page.wait_for_load_state = AsyncMock(return_value=None)
+        page.context.new_cdp_session = AsyncMock(return_value=session)
+        emitted = []
+
+        with (
+            patch.object(legacy, "current_browser_context", MagicMock()),
+            patch.object(legacy, "socketio", MagicMock()),
+            patch.object(legacy, "_select_screenshot_page", return_value=page),
+            patch.object(legacy, "publish_screenshot", emitted.append),
+            patch.object(legacy.asyncio, "sleep", AsyncMock(return_value=None)),
+            patch.dict(legacy._SCREENSHOT_CDP_SESSIONS, clear=True),
+        ):
+            self.assertTrue(await legacy.capture_screenshot_async())
+            self.assertTrue(await legacy.capture_screenshot_async())
+
+        page.context.new_cdp_session.assert_awaited_once_with(page)
+        self.assertEqual([p["image_b64"] for p in emitted], ["B" * 1000] * 2)
+
+    def test_screenshot_sender_only_emits_the_newest_pending_frame(self):
+        self.addCleanup(legacy._SCREENSHOT_READY.clear)
+        server = MagicMock()
+        started = []
+        server.start_background_task = lambda fn, *args: started.append((fn, args))
+
+        with (
+            patch.object(legacy, "socketio", server),
+            patch.dict(legacy._LATEST_SCREENSHOT, {"payload": None, "sender": None}),
+        ):
+            legacy.publish_screenshot({"n": 1})
+            legacy.publish_screenshot({"n": 2})
+            self.assertEqual(len(started), 1)
+            server.emit.side_effect = lambda *_: legacy._LATEST_SCREENSHOT.update(sender=None)
+            fn, args = started[0]
+            fn(*args)
+
+        server.emit.assert_called_once_with("screenshot", {"n": 2})
+
+    def test_screenshot_clip_follows_page_viewport(self):
+        page = MagicMock()
+        page.viewport_size = {"width": 1200, "height": 768}
+        self.assertEqual(legacy.get_screenshot_clip(page), {"x": 0, "y": 0, "width": 1200, "height": 768})
+        page.viewport_size = None
+        self.assertEqual(legacy.get_screenshot_clip(page)["width"], legacy.SCREENSHOT_CLIP_SIZE["width"])
+
+
 class ClaimConsoleLoggingTests(unittest.TestCase):
     def test_console_handler_is_attached_once_per_page(self):
         class FakePage:
@@ -105,6 +693,47 @@ class LegacyNameResolutionRegressionTests(unittest.IsolatedAsyncioTestCase):
 
         self.assertEqual(cache["in_progress"][0]["progress"], 42)
 
+    def test_drops_updates_are_coalesced_into_one_background_emit(self):
+        cache = {"in_progress": [{"type": "general", "item": "Example Reward"}]}
+        server = MagicMock()
+
+        with patch.object(legacy, "cached_drops_data", cache), patch.object(legacy, "socketio", server):
+            legacy.update_cached_drops_data(None, {"Example Reward": 10})
+            legacy.update_cached_drops_data(None, {"Example Reward": 42})
+            server.emit.assert_not_called()
+            server.start_background_task.assert_called_once()
+            task = server.start_background_task.call_args.args[0]
+            task()
+
+        event, payload = server.emit.call_args.args
+        self.assertEqual(event, "drops_update")
+        self.assertEqual(payload["in_progress"][0]["progress"], 42)
+        self.assertIsNot(payload["in_progress"], cache["in_progress"])
+
+    def test_general_drop_matches_first_title_containing_whole_term(self):
+        with patch.object(legacy, "cached_drops_data", {}):
+            legacy.update_cached_drops_data(
+                {"general": [{"item": "Tactical Hoodie", "alias": "ExampleAlias"}], "streamer": []},
+                {},
+                general_progress_map={
+                    "Hoodies Bundle": 10,
+                    "Tactical Hoodie Blue": 40,
+                    "ExampleAlias Tactical Hoodie": 70,
+                },
+            )
+            drop = legacy.cached_drops_data["in_progress"][0]
+
+        self.assertEqual((drop["progress"], drop["progress_title"]), (40, "Tactical Hoodie Blue"))
+
+    def test_intelligent_item_matching_returns_earliest_keyword_title(self):
+        progress_map = {"Hoodie": 5, "Tactical Mask": 30, "Metal Chest Armor": 60}
+        index = legacy.build_item_keyword_index(progress_map)
+
+        result = legacy.intelligent_item_matching("Metal Chestplate Facemask", progress_map, index)
+
+        self.assertEqual(result, (30, "Tactical Mask"))
+        self.assertEqual(legacy.intelligent_item_matching("Sleeping Bag", progress_map, index), (None, None))
+
     async def test_claimed_days_delegates_with_normalized_streamer_name(self):
         implementation = AsyncMock(return_value=3)
         with patch.object(legacy, "_get_claimed_days_for_streamer_impl", implementation):
@@ -127,6 +756,7 @@ class LegacyNameResolutionRegressionTests(unittest.IsolatedAsyncioTestCase):
 
         async def stop_after_cycle(_seconds):
             legacy.EXIT_EVENT.set()
+            return True
 
         legacy.EXIT_EVENT.clear()
         try:
@@ -146,7 +776,7 @@ class LegacyNameResolutionRegressionTests(unittest.IsolatedAsyncioTestCase):
                     ),
                 ),
                 patch.object(legacy, "get_claimed_days_for_streamer", claimed_check),
-                patch.object(legacy.asyncio, "sleep", AsyncMock(side_effect=stop_after_cycle)),
+                patch.object(legacy, "sleep_or_exit", AsyncMock(side_effect=stop_after_cycle)),
             ):
                 result = await legacy.poll_general_until_complete_or_streamer_available(
                     object(),
@@ -231,18 +861,12 @@ class LegacyTargetSelectionTests(unittest.IsolatedAsyncioTestCase):
             self.assertIsNone(await legacy.pick_live_stream_from_enabled_games(object(), enabled))
 
     async def test_rust_picker_reads_drops_from_accessible_tag_label(self):
-        link = MagicMock()
-        link.get_attribute = AsyncMock(return_value="/preferred")
-        tag = MagicMock()
-        tag.inner_text = AsyncMock(return_value="")
-        tag.get_attribute = AsyncMock(
-            side_effect=lambda name: "Tag, DropsEnabled" if name == "aria-label" else None
-        )
-        card = MagicMock()
-        card.query_selector = AsyncMock(return_value=link)
-        card.query_selector_all = AsyncMock(return_value=[tag])
+        cards = [
+            {"href": "/unrelated", "tags": [{"text": "English", "ariaLabel": "Tag, English", "href": ""}]},
+            {"href": "/preferred", "tags": [{"text": "", "ariaLabel": "Tag, DropsEnabled", "href": ""}]},
+        ]
         page = MagicMock()
-        page.query_selector_all = AsyncMock(return_value=[card])
+        page.evaluate = AsyncMock(return_value=cards)
         page.wait_for_timeout = AsyncMock()
         page.close = AsyncMock()
         context = MagicMock()
@@ -395,6 +1019,95 @@ class LegacyWebApiTests(unittest.TestCase):
         self.assertEqual(response.status_code, 400)
         self.assertFalse(response.get_json()["success"])
 
+    def test_restart_endpoint_restarts_only_after_response_closes(self):
+        app, _ = legacy.create_web_app()
+        restarted = legacy.threading.Event()
+
+        with (
+            patch.object(legacy, "restart_program", lambda *_: restarted.set()),
+            patch.object(legacy, "RESTART_AFTER_RESPONSE_DELAY", 0),
+        ):
+            response = app.test_client().post("/api/restart")
+            self.assertTrue(response.get_json()["success"])
+            self.assertFalse(restarted.wait(0.05))
+            response.close()
+            self.assertTrue(restarted.wait(2))
+
+    def test_dashboard_scrape_reuses_running_browser_context(self):
+        page = MagicMock()
+        page.close = AsyncMock(return_value=None)
+        context = MagicMock()
+        context.new_page = AsyncMock(return_value=page)
+        loop = legacy.asyncio.new_event_loop()
+        thread = legacy.threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        fallback = MagicMock()
+
+        async def extract(target):
+            return [target]
+
+        try:
+            with (
+                patch.object(legacy, "current_browser_context", context),
+                patch.object(legacy, "_BROWSER_LOOP", loop),
+            ):
+                result = legacy.run_dashboard_scrape(extract, fallback, timeout=5)
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=5)
+            loop.close()
+
+        self.assertEqual(result, [page])
+        page.close.assert_awaited_once()
+        fallback.assert_not_called()
+
+    def test_dashboard_scrape_cancels_a_stalled_tab_and_falls_back(self):
+        closed = legacy.threading.Event()
+        page = MagicMock()
+        page.route = AsyncMock(return_value=None)
+        page.close = AsyncMock(side_effect=lambda: closed.set())
+        context = MagicMock()
+        context.new_page = AsyncMock(return_value=page)
+        loop = legacy.asyncio.new_event_loop()
+        thread = legacy.threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+
+        async def extract(_target):
+            await legacy.asyncio.sleep(60)
+
+        async def fallback():
+            return ["fallback"]
+
+        try:
+            with (
+                patch.object(legacy, "current_browser_context", context),
+                patch.object(legacy, "_BROWSER_LOOP", loop),
+            ):
+                result = legacy.run_dashboard_scrape(extract, fallback, timeout=0.2)
+            self.assertTrue(closed.wait(2))
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=5)
+            loop.close()
+
+        self.assertEqual(result, ["fallback"])
+        page.route.assert_awaited_once()
+
+    def test_drops_endpoint_answers_unchanged_poll_with_not_modified(self):
+        app, _ = legacy.create_web_app()
+        client = app.test_client()
+        cache = {"in_progress": [], "not_started": [], "completed": [], "last_updated": "t0"}
+
+        with patch.object(legacy, "cached_drops_data", cache):
+            first = client.get("/api/drops")
+            repeat = client.get("/api/drops", headers={"If-None-Match": first.headers["ETag"]})
+            legacy.update_cached_drops_data(None, {"Example Reward": 5})
+            changed = client.get("/api/drops", headers={"If-None-Match": first.headers["ETag"]})
+
+        self.assertEqual(first.get_json()["last_updated"], "t0")
+        self.assertEqual(repeat.status_code, 304)
+        self.assertEqual(changed.status_code, 200)
+
 
 if __name__ == "__main__":
     unittest.main()
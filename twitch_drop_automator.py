@@ -4,18 +4,30 @@ import re
 from playwright.async_api import async_playwright
 from playwright_stealth import Stealth, ALL_EVASIONS_DISABLED_KWARGS
 import os
+import io
 import json
+import queue
+import shutil
+import tempfile
+import zipfile
 import threading
 import atexit
 import signal
 import sys
 import subprocess
 import time
-from datetime import datetime, timezone, timedelta
-import base64
+import weakref
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+import copy
+import functools
+import hashlib
 import argparse
+import webbrowser
 from urllib.parse import urlparse
-from flask import Flask, render_template, jsonify, request
+import requests
+from flask import Flask, Response, render_template, jsonify, request
 from flask_socketio import SocketIO, emit
 
 from app.twitch_pages import (
@@ -31,19 +43,58 @@ from app.twitch_pages import (
 IS_WINDOWS = sys.platform.startswith("win")
 IS_MAC = sys.platform == "darwin"
 
+# Optional faster event loop (uvloop on POSIX, winloop on Windows)
 try:
-	import pystray
-	from PIL import Image, ImageDraw
+	if IS_WINDOWS:
+		import winloop as _fast_loop  # type: ignore
+	else:
+		import uvloop as _fast_loop  # type: ignore
+	asyncio.set_event_loop_policy(_fast_loop.EventLoopPolicy())
 except Exception:
-	pystray = None
+	_fast_loop = None
 
-# Notifications
-Notification = None
-# Optional notifier (single implementation: win10toast)
+# Optional faster JSON codec for the cached /api/drops body and config.json
 try:
-	from win10toast import ToastNotifier  # type: ignore
+	import orjson as _orjson  # type: ignore
 except Exception:
-	ToastNotifier = None
+	_orjson = None
+
+# Tray (pystray + Pillow) is imported on first use by _load_tray_modules
+pystray = None
+Image = None
+ImageDraw = None
+_TRAY_IMPORT_ATTEMPTED = False
+
+def _load_tray_modules() -> bool:
+	"""Import pystray/Pillow the first time the tray is needed; False if unavailable."""
+	global pystray, Image, ImageDraw, _TRAY_IMPORT_ATTEMPTED
+	if not _TRAY_IMPORT_ATTEMPTED:
+		_TRAY_IMPORT_ATTEMPTED = True
+		try:
+			import pystray as _pystray
+			from PIL import Image as _Image, ImageDraw as _ImageDraw
+			pystray, Image, ImageDraw = _pystray, _Image, _ImageDraw
+		except Exception:
+			pystray = None
+	return pystray is not None
+
+# Notifications
+Notification = None
+# Optional notifier (single implementation: win10toast), imported on first notification
+ToastNotifier = None
+_TOAST_IMPORT_ATTEMPTED = False
+
+def _load_toast_notifier() -> bool:
+	"""Import win10toast the first time a Windows notification is sent; False if unavailable."""
+	global ToastNotifier, _TOAST_IMPORT_ATTEMPTED
+	if not _TOAST_IMPORT_ATTEMPTED:
+		_TOAST_IMPORT_ATTEMPTED = True
+		try:
+			from win10toast import ToastNotifier as _ToastNotifier  # type: ignore
+			ToastNotifier = _ToastNotifier
+		except Exception:
+			ToastNotifier = None
+	return ToastNotifier is not None
 
 # --- Configuration ---
 # Resolve base directory for consistent file paths regardless of CWD
@@ -51,6 +102,9 @@ BASE_DIR = os.path.abspath(os.path.dirname(__file__)) if '__file__' in globals()
 LOG_FILE = os.path.join(BASE_DIR, 'drops_log.txt')
 USER_DATA_DIR = os.path.join(BASE_DIR, 'user_data_stealth')
 TWITCH_INVENTORY_URL = 'https://www.twitch.tv/drops/inventory'
+TWITCH_GQL_URL = 'https://gql.twitch.tv/gql'
+# Request headers worth replaying with a captured GQL query (auth, integrity and client identity)
+_GQL_REPLAY_HEADERS = ('authorization', 'client-id', 'client-integrity', 'client-session-id', 'client-version', 'x-device-id')
 TWITCH_RUST_DIRECTORY_URL = 'https://www.twitch.tv/directory/game/Rust'
 TWITCH_DROPS_ENABLED_DIRECTORY_URL = 'https://www.twitch.tv/directory/all/tags/dropsenabled'
 FACEPUNCH_DROPS_URL = 'https://twitch.facepunch.com/#drops'
@@ -58,15 +112,439 @@ DEFAULT_HEADLESS = True  # Default when no config exists
 BROWSER_CHANNEL = "chrome"  # Alternatives: "msedge"
 FORCE_USER_AGENT: str | None = None  # e.g. "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/127.0.0.0 Safari/537.36"
 STEALTH_PROFILE = "minimal"  # Options: "full", "minimal", "off"
+INTERACTIVE_SLOW_MO_MS = 50  # Playwright slow_mo for headed sessions only
 WARM_SSO = False  # Open id.twitch.tv to warm cookies if login is slow
 PASSPORT_429_THRESHOLD = 3
 INVENTORY_POLL_INTERVAL_SECONDS = 60
+LOGIN_RELOAD_INTERVAL_SECONDS = 60  # Fallback re-check while waiting for login
+INVENTORY_READY_SELECTOR = '[role="progressbar"][aria-valuenow]'
+INVENTORY_CLAIMED_READY_SELECTOR = '[role="progressbar"][aria-valuenow], h5'
+CLAIM_BUTTON_SELECTOR = 'button:has-text("Claim")'
+CLAIM_CLICK_SPACING_SECONDS = 0.5  # pause between consecutive Claim clicks
+# Resource types aborted on scrape-only tabs (inventory/Facepunch polling). Stylesheets are kept
+# so layout-dependent clicks and screenshots still behave.
+SCRAPE_BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+INVENTORY_REUSE_SECONDS = 10  # Consecutive inventory scrapes within this window skip re-navigation
+FACEPUNCH_CACHE_SECONDS = 120  # Facepunch drop metadata changes at most every few minutes
+FACEPUNCH_ONLINE_CACHE_SECONDS = 30  # Max age of a Facepunch scrape used for live-status checks
 MAX_WATCH_HOURS_PER_REWARD = 8
 
+# Facepunch parsing patterns (compiled once, used every poll)
+_WORD_RE = re.compile(r'\w+')
+_HOURS_RE = re.compile(r'(\d+)')
+_GENERAL_SECTION_RE = re.compile(r"General Drops(.*?)(Streamer Drops|Drops Metrics|FAQ|Frequently Asked Questions|$)", re.S)
+_GENERAL_ITEM_RE = re.compile(r"General Drop\s+([A-Za-z0-9 \-]+?)\s+(\d+)\s+Hour")
+
+# Directory-card and streamer-matching patterns (run per card/tag on every scan)
+_TWITCH_URL_PREFIX_RE = re.compile(r"https?://(www\.)?twitch\.tv/")
+_NON_ALNUM_SPACE_RE = re.compile(r"[^a-z0-9\s]")
+_WHITESPACE_RE = re.compile(r"\s+")
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]")
+_TAG_ARIA_PREFIX_RE = re.compile(r"^tag,\s*", re.IGNORECASE)
+_VIEWER_COUNT_RE = re.compile(r"(\d+(?:\.\d+)?)\s*([km]?)")
+
+# Shared inventory helper: resolve a reward title for a progressbar container by scanning
+# previous siblings up the ancestor chain. Results are memoized per node so bars that share
+# ancestors don't rescan the same sibling lists.
+_FIND_INVENTORY_TITLE_JS = r"""
+			  const titleCache = new Map();
+			  const findTitleFrom = (container) => {
+				const visited = [];
+				let node = container;
+				let title = null;
+				while (node) {
+				  if (titleCache.has(node)) {
+					title = titleCache.get(node);
+					break;
+				  }
+				  visited.push(node);
+				  let prev = node.previousElementSibling;
+				  while (prev) {
+					const p = prev.querySelector('p');
+					if (p && p.textContent && p.textContent.trim()) {
+					  title = p.textContent.trim();
+					  break;
+					}
+					prev = prev.previousElementSibling;
+				  }
+				  if (title) break;
+				  node = node.parentElement;
+				}
+				for (const v of visited) titleCache.set(v, title);
+				return title;
+			  };
+"""
+
+# Page scrapers. Installed once per scrape tab as an init script (see install_scrapers) so polls
+# only send a short call instead of re-shipping these sources over CDP each time.
+_GENERAL_PROGRESS_JS = r"""
+() => {
+  const out = [];
+  """ + _FIND_INVENTORY_TITLE_JS + r"""
+  
+  // Look for general drops section - try multiple selectors
+  const generalSections = [
+	'[data-test-selector="drops-general-section"]',
+	'.drops-general',
+	'[aria-label*="general" i]',
+	'[aria-label*="General" i]'
+  ];
+  
+  let generalContainer = null;
+  for (const selector of generalSections) {
+	generalContainer = document.querySelector(selector);
+	if (generalContainer) {
+	  console.log('Found general drops section with selector:', selector);
+	  break;
+	}
+  }
+  
+  // If no specific general section found, look for progress bars that are NOT in streamer sections
+  const allProgressBars = document.querySelectorAll('[role="progressbar"][aria-valuenow]');
+  allProgressBars.forEach(pb => {
+	const percent = parseInt(pb.getAttribute('aria-valuenow') || '0', 10);
+	const container = pb.parentElement;
+	
+	// Check if this progress bar is in a streamer-specific section
+	const isInStreamerSection = !!pb.closest('[data-test-selector*="streamer"], .streamer-drops, [aria-label*="streamer" i], [aria-label*="Streamer" i]');
+	
+	// If we found a general container, only include items within it
+	// Otherwise, exclude items that are clearly in streamer sections
+	let shouldInclude = false;
+	if (generalContainer) {
+	  shouldInclude = generalContainer.contains(pb);
+	} else {
+	  shouldInclude = !isInStreamerSection;
+	}
+	
+	if (shouldInclude) {
+	  const title = findTitleFrom(container);
+	  if (title) {
+		// Additional check: exclude titles that clearly contain streamer names
+		// (this is a heuristic to avoid streamer-specific items)
+		const titleLower = title.toLowerCase();
+		const hasStreamerIndicators = /\b(streamer|channel|broadcaster|twitch)\b/.test(titleLower) && 
+		  !/\b(general|campaign|event)\b/.test(titleLower);
+		
+		if (!hasStreamerIndicators) {
+		  out.push({ title, percent });
+		}
+	  }
+	}
+  });
+  
+  return out;
+}
+"""
+_INVENTORY_ITEMS_JS = r"""
+() => {
+  const out = [];
+  """ + _FIND_INVENTORY_TITLE_JS + r"""
+  
+  document.querySelectorAll('[role="progressbar"][aria-valuenow]').forEach(pb => {
+	const percent = parseInt(pb.getAttribute('aria-valuenow') || '0', 10);
+	const container = pb.parentElement; // wraps progressbar and text
+	let title = findTitleFrom(container);
+	let hours = null;
+	const textEl = container ? container.querySelector('div p') : null;
+	const text = textEl ? textEl.textContent : '';
+	const m = text.match(/of\s+(\d+)\s+hours?/i);
+	if (m) hours = parseInt(m[1], 10);
+	if (title) out.push({ title, percent, hours });
+  });
+  
+  return out;
+}
+"""
+_FACEPUNCH_STREAMER_DROPS_JS = r"""
+() => {
+  const absolutize = (src) => src && src.startsWith('/') ? 'https://twitch.facepunch.com' + src : src;
+  const textOf = (root, sel) => {
+    const el = root.querySelector(sel);
+    return el ? (el.innerText || '').trim() : null;
+  };
+  const mediaSelectors = [
+    '.drop-box-body video',
+    '.drop-box video',
+    'video',
+    '.drop-box-body img[src*="item"]',
+    '.drop-box-body img[src*="drop"]',
+    '.drop-box img[src*="item"]',
+    '.drop-box img[src*="drop"]',
+    '.drop-box-body img',
+    '.drop-box img',
+    'img'
+  ];
+  const avatarSelectors = [
+    '.streamer-avatar img',
+    '.streamer-info img',
+    '.drop-box-header img[src*="profile"]',
+    '.drop-box-header img[src*="avatar"]',
+    '.streamer-name + img',
+    '.drop-box-header img'
+  ];
+  const out = [];
+  document.querySelectorAll('.streamer-drops .drop-box').forEach(box => {
+    try {
+      let video = null;
+      for (const sel of mediaSelectors) {
+        const el = box.querySelector(sel);
+        if (!el) continue;
+        let src = null;
+        if (sel.startsWith('video') || el.tagName.toLowerCase() === 'video') {
+          const source = el.querySelector('source');
+          src = source ? source.getAttribute('src') : el.getAttribute('src');
+        } else {
+          src = el.getAttribute('src');
+        }
+        if (src) { video = absolutize(src); break; }
+      }
+      let avatar = null;
+      for (const sel of avatarSelectors) {
+        const el = box.querySelector(sel);
+        const src = el ? el.getAttribute('src') : null;
+        if (src) { avatar = absolutize(src); break; }
+      }
+      const urlEl = box.querySelector('.drop-box-header a.streamer-info');
+      out.push({
+        streamer: textOf(box, '.streamer-name'),
+        item: textOf(box, '.drop-box-footer .drop-type'),
+        hoursText: textOf(box, '.drop-box-footer .drop-time span') || '',
+        url: urlEl ? urlEl.getAttribute('href') : null,
+        isLive: !!box.querySelector('.online-status, div.online-status'),
+        video,
+        avatar,
+      });
+    } catch (e) {}
+  });
+  return out;
+}
+"""
+_FACEPUNCH_GENERAL_DROPS_JS = r"""
+() => {
+  const res = [];
+  const boxes = Array.from(document.querySelectorAll('#drops .drops-container .drop-box'));
+  const allBoxes = boxes.length ? boxes : Array.from(document.querySelectorAll('.drop-box'));
+  for (const box of allBoxes) {
+    const headerEl = box.querySelector('.drop-box-header');
+    let headerText = '';
+    if (headerEl) {
+      headerText = (headerEl.innerText || headerEl.textContent || '').trim();
+    }
+    const inGeneralSection = !!box.closest('#drops');
+    const isGeneral = inGeneralSection || /\bgeneral\s+drop\b/i.test(headerText);
+    const itemEl = box.querySelector('.drop-box-footer .drop-type');
+    const item = itemEl && itemEl.textContent ? itemEl.textContent.trim() : null;
+    // Only general drops with an item name are returned; skip the rest before the media lookups
+    if (!isGeneral || !item) continue;
+    let alias = null;
+    try {
+      const m = headerText.match(/([A-Za-z0-9]+)\s+GENERAL\s+DROP/i);
+      if (m) alias = m[1];
+    } catch (e) {}
+    const timeEl = box.querySelector('.drop-box-footer .drop-time span');
+    let hours = null;
+    if (timeEl && timeEl.textContent) {
+      const m = timeEl.textContent.match(/(\d+)/);
+      if (m) hours = parseInt(m[1], 10);
+    }
+    const isLocked = !!box.querySelector('.drop-lock');
+    
+    // Item video, else its image; relative URLs made absolute
+    let video = null;
+    try {
+      const mediaEl = box.querySelector('.drop-box-body video, .drop-box video, video');
+      const imgEl = mediaEl && mediaEl.src ? null : box.querySelector('.drop-box-body img, .drop-box img, img');
+      const src = (mediaEl && mediaEl.src) || (imgEl && imgEl.src) || null;
+      if (src) video = src.startsWith('/') ? 'https://twitch.facepunch.com' + src : src;
+    } catch (e) {}
+    
+    res.push({ headerText, item, hours, alias, isLocked, video });
+  }
+  return res;
+}
+"""
+# Shared claimed-section helpers for the claimedItems/claimedDays scrapers: relative-time parsing,
+# the checkmark icon test and locating the "Claimed" section.
+_CLAIMED_HELPERS_JS = r"""
+  const isTimeText = (s) => {
+    if (!s) return false;
+    const t = s.trim().toLowerCase();
+    return t.includes('yesterday') || t.includes('ago') || t.includes('last month') || t.includes('months ago') || t.includes('month ago') || t.includes('today');
+  };
+  const toDays = (s) => {
+    if (!s) return null;
+    const t = s.trim().toLowerCase();
+    if (t.includes('today')) return 0;
+    if (t.includes('yesterday')) return 1;
+    let m;
+    if ((m = t.match(/(\d+)\s*minutes?/))) return 0;
+    if ((m = t.match(/(\d+)\s*hours?/))) return 0;
+    if ((m = t.match(/(\d+)\s*days?/))) return parseInt(m[1], 10);
+    if (t.includes('last month')) return 30;
+    if ((m = t.match(/(\d+)\s*months?/))) return parseInt(m[1], 10) * 30;
+    if ((m = t.match(/(\d+)\s*years?/))) return parseInt(m[1], 10) * 365;
+    return null;
+  };
+  // The checkmark SVG has a specific path: "m4 10 5 5 8-8-1.5-1.5L9 12 5.5 8.5 4 10z"
+  const isCheckmarkPath = (d) => {
+    if (!d) return false;
+    return d.includes('m4 10 5 5 8-8-1.5-1.5L9 12 5.5 8.5 4 10z') || d.includes('m4 10 5 5 8-8') || (d.includes('4 10') && d.includes('5 5') && d.includes('8-8'));
+  };
+  // The tower after the "Claimed" header, else any short element mentioning "claimed"
+  const findClaimedSection = () => {
+    const claimedHeader = Array.from(document.querySelectorAll('h5')).find(h5 => (h5.textContent || '').trim().toLowerCase() === 'claimed');
+    let claimedSection = null;
+    if (claimedHeader) {
+      claimedSection = claimedHeader.closest('div')?.querySelector('.ScTower-sc-1sjzzes-0, .tw-tower') || null;
+    }
+    if (!claimedSection) {
+      claimedSection = Array.from(document.querySelectorAll('div, section')).find(el => {
+        const text = (el.textContent || '').toLowerCase();
+        return text.includes('claimed') && text.length < 100;
+      }) || null;
+    }
+    return claimedSection;
+  };
+"""
+_CLAIMED_ITEMS_JS = r"""
+() => {
+  """ + _CLAIMED_HELPERS_JS + r"""
+  const claimedSection = findClaimedSection();
+
+  const searchScopes = [];
+  if (claimedSection) searchScopes.push(claimedSection);
+  searchScopes.push(document);
+
+  const results = [];
+  const seenKeys = new Set();
+
+  for (const scope of searchScopes) {
+    const cards = Array.from(scope.querySelectorAll('div.Layout-sc-1xcs6mc-0.fHdBNk'));
+    for (const card of cards) {
+      // Identify name and time within the card
+      const nameEl = card.querySelector('p.CoreText-sc-1txzju1-0.kGfRxP, p[class*="kGfRxP"]');
+      const timeEl = card.querySelector('p.CoreText-sc-1txzju1-0.jPfhdt, p[class*="jPfhdt"]');
+      const name = (nameEl?.textContent || '').trim();
+      const timeText = (timeEl?.textContent || '').trim();
+      if (!name) continue;
+      // Treat as claimed if inside Claimed section OR contains a checkmark icon
+      const inClaimed = !!claimedSection && claimedSection.contains(card);
+      let hasTick = false;
+      const path = card.querySelector('svg path');
+      if (path) {
+        const d = path.getAttribute('d') || '';
+        hasTick = isCheckmarkPath(d);
+      }
+      if (!inClaimed && !hasTick) continue;
+
+      if (!isTimeText(timeText)) continue;
+      const days = toDays(timeText);
+      if (days === null || days === undefined) continue;
+      if (days > 21) continue;
+      const key = name.toLowerCase();
+      if (seenKeys.has(key)) continue;
+      seenKeys.add(key);
+      results.push({ name, days });
+    }
+  }
+  return results;
+}
+"""
+_CLAIMED_DAYS_JS = r"""
+(args) => {
+  const searchVariations = (args && args.searchVariations) || [];
+  """ + _CLAIMED_HELPERS_JS + r"""
+  const claimedSection = findClaimedSection();
+
+  // Define search scope - prefer claimed section if found, otherwise search entire page
+  const searchScope = claimedSection || document;
+
+  // Look for checkmark/tick icons in the claimed section
+  const checkmarkSvgs = Array.from(searchScope.querySelectorAll('svg path')).filter(svg => isCheckmarkPath(svg.getAttribute('d') || ''));
+
+  // For each checkmark found, try to match it with our search variations
+  for (const checkmarkSvg of checkmarkSvgs) {
+    // Find the drop container that contains this checkmark
+    const dropContainer = checkmarkSvg.closest('div.Layout-sc-1xcs6mc-0.fHdBNk');
+    if (dropContainer) {
+      // Look for the drop name in this container
+      const nameEl = dropContainer.querySelector('p.CoreText-sc-1txzju1-0.kGfRxP, p[class*="kGfRxP"]');
+      if (nameEl) {
+        const dropName = (nameEl.textContent || '').toLowerCase();
+
+        // Check if this drop name matches any of our search variations
+        for (const targetLower of searchVariations) {
+          if (dropName.includes(targetLower)) {
+            // Found a match! Now get the timestamp
+            const timeEl = dropContainer.querySelector('p.CoreText-sc-1txzju1-0.jPfhdt, p[class*="jPfhdt"]');
+            if (timeEl && isTimeText(timeEl.textContent || '')) {
+              const days = toDays(timeEl.textContent || '');
+              if (days !== null && days !== undefined) {
+                // Only return if the drop is not older than 3 weeks (21 days)
+                if (days <= 21) {
+                  return days;
+                }
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+
+  return null;
+}
+"""
+# Queues aria-valuenow changes on the inventory page so pollers can wake on live progress
+# updates instead of reloading on a fixed timer (see wait_for_inventory_change).
+_WATCH_PROGRESS_JS = r"""
+() => {
+  if (window.__tdaDropEvents) return true;
+  const events = [];
+  Object.defineProperty(window, '__tdaDropEvents', {value: events, configurable: true, enumerable: false});
+  new MutationObserver(mutations => {
+    for (const m of mutations) {
+      if (m.target && m.target.getAttribute && m.target.getAttribute('role') === 'progressbar') {
+        events.push(m.target.getAttribute('aria-valuenow'));
+      }
+    }
+  }).observe(document.body, {attributes: true, attributeFilter: ['aria-valuenow'], subtree: true});
+  return true;
+}
+"""
+_SCRAPERS = {
+	"inventoryItems": _INVENTORY_ITEMS_JS,
+	"generalProgress": _GENERAL_PROGRESS_JS,
+	"facepunchStreamerDrops": _FACEPUNCH_STREAMER_DROPS_JS,
+	"facepunchGeneralDrops": _FACEPUNCH_GENERAL_DROPS_JS,
+	"claimedItems": _CLAIMED_ITEMS_JS,
+	"claimedDays": _CLAIMED_DAYS_JS,
+	"watchProgress": _WATCH_PROGRESS_JS,
+}
+_SCRAPER_BUNDLE_JS = (
+	"(() => {\n  const scrapers = {\n"
+	+ ",\n".join(f"  {name}: {source.strip()}" for name, source in _SCRAPERS.items())
+	+ "\n  };\n"
+	"  Object.defineProperty(window, '__tdaScrapers', {value: scrapers, configurable: true, enumerable: false});\n"
+	"})();"
+)
+
+# Twitch's player persists its quality choice in localStorage['video-quality'] and reads it on mount
+LOW_PLAYBACK_QUALITY = '160p30'
+_SEED_LOW_QUALITY_JS = (
+	"(() => { try { if (/(^|\\.)twitch\\.tv$/.test(location.hostname)) "
+	f"localStorage.setItem('video-quality', JSON.stringify({{default: '{LOW_PLAYBACK_QUALITY}'}})); }} catch (e) {{}} }})();"
+)
+
 # Web interface configuration
 WEB_PORT = 5000
 WEB_HOST = '127.0.0.1'
 SCREENSHOT_INTERVAL = 2  # seconds between screenshots
+SCREENSHOT_JPEG_QUALITY = 60  # default JPEG quality for preview frames; PREFERENCES["screenshot_quality"] overrides
+SCREENSHOT_CLIP_SIZE = {"width": 1366, "height": 768}  # fallback clip when the page reports no viewport
+# CDP screencast of the active page for the dashboard preview (JPEG frames from the compositor)
+SCREENCAST_OPTIONS = {"format": "jpeg", "maxWidth": 1280, "maxHeight": 720, "everyNthFrame": 2}
 
 # Testing configuration
 TEST_MODE = False  # Set to True to keep browser open for testing
@@ -74,21 +552,64 @@ TEST_MODE = False  # Set to True to keep browser open for testing
 # Persisted preferences/config
 CONFIG_PATH = os.path.join(BASE_DIR, 'config.json')
 STREAMER_MAPPINGS_PATH = os.path.join(BASE_DIR, 'streamer_mappings.json')
+TRAY_ICON_FILE = os.path.join(BASE_DIR, 'tray.ico')
 CONFIG_LOCK = threading.RLock()
+_LAST_PREFS_JSON: tuple[str, bytes] | None = None  # (path, bytes) of the last config write
 EXIT_EVENT = threading.Event()
+# Single worker for tray/restart side effects and background config writes: actions run in
+# click order and config.json saves never overlap
+_TRAY_WORKER = threading.local()  # .active is True only on TRAY_EXECUTOR's worker thread
+TRAY_EXECUTOR = ThreadPoolExecutor(
+	max_workers=1, thread_name_prefix="tray", initializer=lambda: setattr(_TRAY_WORKER, "active", True),
+)
+# Forced-exit watchdog armed once by _schedule_forced_exit
+_SHUTDOWN_TIMER = None
+_SHUTDOWN_TIMER_LOCK = threading.Lock()
+# Reused across Facepunch polls instead of opening a new tab each cycle
+FACEPUNCH_PAGE = None
+# (context, fetched_at, result) of the last successful fetch_facepunch_drops
+_FACEPUNCH_CACHE: tuple | None = None
+_FACEPUNCH_FETCH_LOCK: asyncio.Lock | None = None
+_FACEPUNCH_FETCH_LOCK_LOOP = None
+# Browser contexts known to hold cookie-banner consent (see maybe_accept_cookies)
+_COOKIE_CONSENT_CONTEXTS = weakref.WeakSet()
+# Browser contexts that have emitted "close" (see track_context_close)
+_CLOSED_CONTEXTS = weakref.WeakSet()
+# Last time each inventory tab was (re)loaded by _load_inventory_page
+_INVENTORY_LOADED_AT = weakref.WeakKeyDictionary()
+# (loaded_at, {scraper: result}) per tab: inventory scrapes reused until the next reload or claim
+_INVENTORY_SCRAPE_CACHE = weakref.WeakKeyDictionary()
+# Twitch's own Inventory GQL request ({"headers", "payload"}), captured from the inventory tab
+# so polls can replay it instead of re-rendering the page (see capture_inventory_gql)
+_INVENTORY_GQL_TEMPLATE: dict | None = None
+# (monotonic time, {title: percent}) from the latest Inventory GQL response, seen passively on the
+# inventory tab or returned by a replay; reused for INVENTORY_REUSE_SECONDS
+_INVENTORY_GQL_SNAPSHOT: tuple | None = None
+# Per-loop mirrors of EXIT_EVENT so awaits can wake without polling. One event per loop: the
+# automator loop and short-lived loops (e.g. dashboard scrape fallbacks) each keep their own
+_ASYNC_EXIT_EVENTS = weakref.WeakKeyDictionary()  # loop -> asyncio.Event
+_ASYNC_EXIT_LOCK = threading.Lock()
 
 PREFERENCES = None
 TRAY_ICON = None
 ICON_PATH = None
+_ICON_PATH_RESOLVED = False  # ICON_PATH is only resolved when the first toast needs it
 NOTIFICATIONS_ENABLED = True
+_TOASTER = None  # Cached ToastNotifier, created on first notification
+_NOTIFICATION_QUEUE: "queue.Queue[tuple[str, str]]" = queue.Queue()
+_NOTIFICATION_WORKER = None  # Daemon thread draining _NOTIFICATION_QUEUE, started on first notification
+_NOTIFICATION_WORKER_LOCK = threading.Lock()
 TRAY_IMAGE = None
 
 # Web server globals
 app = None
 socketio = None
 current_browser_context = None
+_BROWSER_LOOP = None  # Event loop that owns current_browser_context
 current_working_page = None  # Track the page currently being worked on
-screenshot_thread = None
+# Fallback preview page picked by the tab scan; cleared on new pages, main-frame navigations and "close"
+_SCREENSHOT_PAGE_CACHE = {"context": None, "page": None}
+_SCREENSHOT_CDP_SESSIONS = {}  # page -> CDP session for Page.captureScreenshot
 web_server_thread = None
 
 # Drops data cache for web interface
@@ -98,6 +619,8 @@ cached_drops_data = {
 	"completed": [],
 	"last_updated": None
 }
+# (source dict, JSON body, ETag) for /api/drops; rebuilt lazily after each cache update
+_CACHED_DROPS_RESPONSE = None
 cached_games_data = {
 	"games": [],
 	"last_updated": None,
@@ -158,11 +681,7 @@ def update_cached_games_data(
 		cached_games_data["error"] = error
 		cached_games_data["last_updated"] = datetime.now().isoformat()
 		payload = dict(cached_games_data)
-	if socketio:
-		try:
-			socketio.emit('games_update', payload)
-		except Exception:
-			pass
+	emit_in_background('games_update', lambda: payload)
 
 def get_cached_games_data_snapshot() -> dict:
 	with games_data_lock:
@@ -346,7 +865,7 @@ def save_integrity_headers(headers: dict):
 			PREFERENCES["integrity_fetched_at"] = _now_ts()
 			if "integrity_ttl_hours" not in PREFERENCES:
 				PREFERENCES["integrity_ttl_hours"] = 6
-			threading.Thread(target=lambda: save_preferences(PREFERENCES), daemon=True).start()
+			TRAY_EXECUTOR.submit(save_preferences, PREFERENCES)
 	except Exception as e:
 		logging.debug(f"Failed saving integrity headers: {e}")
 
@@ -361,7 +880,6 @@ async def fetch_integrity_headers_with_headed(p) -> dict:
 			USER_DATA_DIR,
 			headless=False,
 			channel=BROWSER_CHANNEL,
-			slow_mo=50,
 			viewport={"width": 1200, "height": 768},
 			locale="en-US",
 		)
@@ -434,7 +952,7 @@ async def fetch_integrity_headers_with_headed(p) -> dict:
 			if ua and "HeadlessChrome" not in ua:
 				with CONFIG_LOCK:
 					PREFERENCES["forced_user_agent"] = ua
-				threading.Thread(target=lambda: save_preferences(PREFERENCES), daemon=True).start()
+				TRAY_EXECUTOR.submit(save_preferences, PREFERENCES)
 				logging.info("Saved headed user agent for reuse")
 		except Exception:
 			pass
@@ -456,13 +974,455 @@ async def apply_integrity_headers_to_context(context):
     return
 drops_data_lock = threading.RLock()
 
+# Bursts of drops updates within this window go out as a single WebSocket broadcast
+DROPS_EMIT_COALESCE_SECONDS = 0.25
+_PENDING_EMITS: set[str] = set()
+_PENDING_EMITS_LOCK = threading.Lock()
+
+def get_cached_drops_data_snapshot() -> dict:
+	"""Deep copy of the drops cache, safe to serialize while the cache keeps changing."""
+	with drops_data_lock:
+		return copy.deepcopy(cached_drops_data)
+
+def get_cached_drops_response() -> tuple[bytes, str]:
+	"""JSON body and ETag for the drops cache, encoded once per cache update."""
+	global _CACHED_DROPS_RESPONSE
+	with drops_data_lock:
+		cached = _CACHED_DROPS_RESPONSE
+		if cached is None or cached[0] is not cached_drops_data:
+			if _orjson is not None:
+				body = _orjson.dumps(cached_drops_data)
+			else:
+				body = json.dumps(cached_drops_data, separators=(',', ':')).encode('utf-8')
+			cached = (cached_drops_data, body, hashlib.blake2b(body, digest_size=16).hexdigest())
+			_CACHED_DROPS_RESPONSE = cached
+		return cached[1], cached[2]
+
+def emit_in_background(event: str, build_payload, coalesce_seconds: float = 0.0) -> None:
+	"""Emit a WebSocket event from a SocketIO background task so socket writes never block the caller.
+
+	`build_payload` runs on the background task, which keeps JSON encoding and
+	per-client writes off the Playwright loop and outside drops_data_lock. With
+	`coalesce_seconds`, calls made while an emit for `event` is still pending are
+	folded into it, so bursts of updates go out as one broadcast of the latest state.
+	"""
+	if not socketio:
+		return
+	server = socketio
+	if coalesce_seconds > 0:
+		with _PENDING_EMITS_LOCK:
+			if event in _PENDING_EMITS:
+				return
+			_PENDING_EMITS.add(event)
+
+	def _send():
+		try:
+			if coalesce_seconds > 0:
+				server.sleep(coalesce_seconds)
+				# Cleared before the payload is built so later changes schedule a fresh emit
+				with _PENDING_EMITS_LOCK:
+					_PENDING_EMITS.discard(event)
+			server.emit(event, build_payload())
+			logging.debug(f"Emitted {event} via WebSocket")
+		except Exception as e:
+			logging.debug(f"Failed to emit {event} via WebSocket: {e}")
+
+	try:
+		server.start_background_task(_send)
+	except Exception as e:
+		with _PENDING_EMITS_LOCK:
+			_PENDING_EMITS.discard(event)
+		logging.debug(f"Failed to schedule {event} emit: {e}")
+
+# Single-slot mailbox for preview frames: a frame not yet sent is replaced by the newer one
+_LATEST_SCREENSHOT = {"payload": None, "sender": None}
+_LATEST_SCREENSHOT_LOCK = threading.Lock()
+_SCREENSHOT_READY = threading.Event()
+
+def publish_screenshot(payload: dict) -> None:
+	"""Hand a preview frame to the screenshot sender task, dropping any frame still waiting."""
+	if not socketio:
+		return
+	server = socketio
+	with _LATEST_SCREENSHOT_LOCK:
+		_LATEST_SCREENSHOT["payload"] = payload
+		start_sender = _LATEST_SCREENSHOT["sender"] is not server
+		if start_sender:
+			_LATEST_SCREENSHOT["sender"] = server
+	_SCREENSHOT_READY.set()
+	if start_sender:
+		try:
+			server.start_background_task(_screenshot_sender, server)
+		except Exception as e:
+			with _LATEST_SCREENSHOT_LOCK:
+				_LATEST_SCREENSHOT["sender"] = None
+			logging.debug(f"Failed to start screenshot sender: {e}")
+
+def _screenshot_sender(server) -> None:
+	"""Emit the newest preview frame whenever one is published; one frame in flight at a time."""
+	while _LATEST_SCREENSHOT["sender"] is server:
+		if not _SCREENSHOT_READY.wait(timeout=5.0):
+			continue
+		with _LATEST_SCREENSHOT_LOCK:
+			_SCREENSHOT_READY.clear()
+			payload, _LATEST_SCREENSHOT["payload"] = _LATEST_SCREENSHOT["payload"], None
+		if payload is None:
+			continue
+		try:
+			server.emit('screenshot', payload)
+		except Exception as e:
+			logging.debug(f"Failed to emit screenshot via WebSocket: {e}")
+
 # Track current working item
 current_working_item = None
 current_working_lock = threading.RLock()
 
 
+def _sha256_file(path: str) -> str:
+	digest = hashlib.sha256()
+	with open(path, 'rb', buffering=0) as f:
+		for chunk in iter(lambda: f.read(UPDATE_IO_CHUNK), b''):
+			digest.update(chunk)
+	return digest.hexdigest()
+
+def files_identical(a: str, b: str) -> bool:
+	"""True if both paths are files with the same size and sha256."""
+	try:
+		if not (os.path.isfile(a) and os.path.isfile(b)) or os.path.getsize(a) != os.path.getsize(b):
+			return False
+		return _sha256_file(a) == _sha256_file(b)
+	except OSError:
+		return False
+
+def copy_file_unless_same(src: str, dst: str, link_if_same_as: str | None = None, skip_if_same: bool = False) -> int:
+	"""Copy one file, avoiding the copy when its content is already known. Returns bytes not copied.
+
+	`skip_if_same` leaves an identical dst untouched. `link_if_same_as` hardlinks dst to src
+	when src matches that reference file, falling back to copy2 where links aren't supported.
+	"""
+	if skip_if_same and files_identical(src, dst):
+		return os.path.getsize(src)
+	if link_if_same_as and files_identical(src, link_if_same_as):
+		try:
+			os.link(src, dst)
+			return os.path.getsize(src)
+		except OSError:
+			pass
+	shutil.copy2(src, dst)
+	return 0
+
+def fast_copytree(src: str, dst: str, skip=frozenset(), link_if_same_as: str | None = None, skip_if_same: bool = False) -> int:
+	"""Copy a directory tree with os.scandir and shutil.copy2. Returns bytes not copied.
+
+	DirEntry type information avoids a stat per entry, and copy2 goes straight to the
+	platform fast path (CopyFile2 on Windows, sendfile on Linux). Names in `skip` are
+	ignored at the top level only. `link_if_same_as` / `skip_if_same` apply per file,
+	as in copy_file_unless_same, with the reference tree walked alongside src.
+	"""
+	saved = 0
+	os.makedirs(dst, exist_ok=True)
+	with os.scandir(src) as entries:
+		for entry in entries:
+			if entry.name in skip:
+				continue
+			target = os.path.join(dst, entry.name)
+			reference = os.path.join(link_if_same_as, entry.name) if link_if_same_as else None
+			# Symlinks are followed, matching copytree(symlinks=False)
+			if entry.is_dir():
+				saved += fast_copytree(entry.path, target, link_if_same_as=reference, skip_if_same=skip_if_same)
+			elif reference or skip_if_same:
+				saved += copy_file_unless_same(entry.path, target, reference, skip_if_same)
+			else:
+				shutil.copy2(entry.path, target)
+	return saved
+
+# Wheels over sdist builds, and no pip self-version probe on each call
+PIP_INSTALL_FLAGS = ('--prefer-binary', '--disable-pip-version-check')
+UPDATE_IO_CHUNK = 1 << 20  # 1 MiB reads/writes when extracting the update archive
+UPDATE_PARALLEL_MIN_MEMBERS = 50  # smaller archives extract sequentially
+
+def _update_member_target(extract_dir: str, name: str) -> str | None:
+	"""Destination for an archive member, or None if it would land outside extract_dir."""
+	root = os.path.abspath(extract_dir)
+	target = os.path.abspath(os.path.join(root, *name.replace('\\', '/').split('/')))
+	if target != root and not target.startswith(root + os.sep):
+		return None
+	return target
+
+def _extract_update_member(zip_ref: zipfile.ZipFile, info: zipfile.ZipInfo, target: str):
+	with zip_ref.open(info) as src, open(target, 'wb', buffering=0) as raw:
+		with io.BufferedWriter(raw, buffer_size=UPDATE_IO_CHUNK) as dst:
+			shutil.copyfileobj(src, dst, UPDATE_IO_CHUNK)
+	mode = (info.external_attr >> 16) & 0o777
+	if mode and not IS_WINDOWS:
+		os.chmod(target, mode)
+
+def extract_update_archive(zip_path: str, extract_dir: str):
+	"""Extract the update zip member by member with 1 MiB buffered copies.
+
+	Replaces ZipFile.extractall's small default-buffer I/O: the archive is read through a
+	1 MiB buffered handle and members are written in 1 MiB chunks. Directories are created up
+	front; larger archives then inflate their files on a thread pool, each worker reading
+	through its own ZipFile handle. Members whose paths would escape extract_dir are
+	skipped, as extractall would sanitize them.
+	"""
+	files = []
+	with open(zip_path, 'rb', buffering=UPDATE_IO_CHUNK) as archive, zipfile.ZipFile(archive) as zip_ref:
+		for info in zip_ref.infolist():
+			target = _update_member_target(extract_dir, info.filename)
+			if target is None:
+				logging.warning(f"Skipping unsafe archive member: {info.filename}")
+				continue
+			if info.is_dir():
+				os.makedirs(target, exist_ok=True)
+				continue
+			os.makedirs(os.path.dirname(target), exist_ok=True)
+			files.append((info, target))
+		if len(files) < UPDATE_PARALLEL_MIN_MEMBERS:
+			for info, target in files:
+				_extract_update_member(zip_ref, info, target)
+			return
+
+	handles = threading.local()
+	opened = []
+	opened_lock = threading.Lock()
+
+	def _extract(info, target):
+		zip_ref = getattr(handles, "zip_ref", None)
+		if zip_ref is None:
+			archive = open(zip_path, 'rb', buffering=UPDATE_IO_CHUNK)
+			with opened_lock:
+				opened.append(archive)
+			zip_ref = zipfile.ZipFile(archive)
+			handles.zip_ref = zip_ref
+		_extract_update_member(zip_ref, info, target)
+
+	try:
+		with ThreadPoolExecutor(max_workers=os.cpu_count() or 4, thread_name_prefix="update-unzip") as pool:
+			futures = [pool.submit(_extract, info, target) for info, target in files]
+		# Leaving the pool block waits for every member; then surface the first failure
+		for future in futures:
+			future.result()
+	finally:
+		for archive in opened:
+			archive.close()
+
+def _venv_playwright_version(venv_python: str) -> str | None:
+	try:
+		result = subprocess.run(
+			[venv_python, '-c', "import importlib.metadata as m; print(m.version('playwright'))"],
+			cwd=BASE_DIR, capture_output=True, text=True, timeout=30,
+		)
+		return result.stdout.strip() if result.returncode == 0 else None
+	except Exception:
+		return None
+
+class InstallerError(subprocess.CalledProcessError):
+	"""One or more installer processes exited non-zero; `failures` holds (name, CalledProcessError) pairs."""
+
+	def __init__(self, failures: list):
+		first = failures[0][1]
+		super().__init__(first.returncode, first.cmd)
+		self.failures = failures
+
+	def __str__(self):
+		return "; ".join(f"{name}: {error}" for name, error in self.failures)
+
+def _wait_for_installers(commands: dict, timeout: float):
+	"""Wait for every named Popen, then raise one InstallerError listing all that failed.
+
+	On a timeout the remaining processes are killed and TimeoutExpired is raised.
+	"""
+	deadline = time.monotonic() + timeout
+	failures = []
+	for name, (args, process) in commands.items():
+		try:
+			returncode = process.wait(timeout=max(0.0, deadline - time.monotonic()))
+		except subprocess.TimeoutExpired:
+			for _, other in commands.values():
+				other.kill()
+			raise
+		if returncode != 0:
+			failures.append((name, subprocess.CalledProcessError(returncode, args)))
+		logging.info(f"{name} finished with exit code {returncode}")
+	if failures:
+		raise InstallerError(failures)
+
+def _requirements_keep_playwright(requirements_path: str, installed: str | None) -> bool:
+	"""True if `pip install -r requirements_path` is known to leave the installed Playwright alone."""
+	if not installed:
+		return False
+	try:
+		from packaging.requirements import Requirement
+		from packaging.utils import canonicalize_name
+		with open(requirements_path, encoding='utf-8') as f:
+			for line in f:
+				line = line.split('#', 1)[0].strip()
+				if not line:
+					continue
+				if line.startswith('-'):
+					# Nested files and pip options can't be read from here
+					return False
+				requirement = Requirement(line)
+				if canonicalize_name(requirement.name) != 'playwright':
+					continue
+				if requirement.marker is not None and not requirement.marker.evaluate():
+					continue
+				return requirement.specifier.contains(installed, prereleases=True)
+	except Exception:
+		pass
+	return False
+
+def _pip_environment() -> dict:
+	# pip ignores option variables it doesn't know, so this only takes effect where supported
+	return {**os.environ, 'PIP_PARALLEL_DOWNLOADS': '8'}
+
+def install_requirements_and_browsers(venv_python: str, venv_pip: str, requirements_path: str, timeout: float = 300):
+	"""Run `pip install -r` and `playwright install` in the app venv.
+
+	They write to different places (site-packages vs the browser cache), so when the installed
+	Playwright already satisfies requirements.txt the two run side by side. Otherwise pip may
+	replace Playwright and its driver under a running `playwright install` (and Windows keeps
+	those files locked), so the browsers are installed once pip has finished.
+	"""
+	deadline = time.monotonic() + timeout
+	requirements = ("Installing requirements", [venv_pip, 'install', *PIP_INSTALL_FLAGS, '-r', requirements_path])
+	browsers = ("Installing Playwright browsers", [venv_python, '-m', 'playwright', 'install'])
+	if _requirements_keep_playwright(requirements_path, _venv_playwright_version(venv_python)):
+		stages = [(requirements, browsers)]
+	else:
+		stages = [(requirements,), (browsers,)]
+	for stage in stages:
+		commands = {}
+		for name, args in stage:
+			logging.info(f"{name}...")
+			commands[name] = (args, subprocess.Popen(args, cwd=BASE_DIR, env=_pip_environment()))
+		_wait_for_installers(commands, max(0.0, deadline - time.monotonic()))
+
+def _remove_stale_entries(src: str, dst: str):
+	"""Delete what dst has that src doesn't (or has as the other kind of entry), recursively."""
+	with os.scandir(src) as entries:
+		src_dirs = {entry.name: entry.is_dir() for entry in entries}
+	with os.scandir(dst) as entries:
+		for entry in entries:
+			dst_is_dir = entry.is_dir(follow_symlinks=False)
+			src_is_dir = src_dirs.get(entry.name)
+			if src_is_dir is None or src_is_dir != dst_is_dir:
+				if dst_is_dir:
+					shutil.rmtree(entry.path)
+				else:
+					os.unlink(entry.path)
+			elif dst_is_dir:
+				_remove_stale_entries(os.path.join(src, entry.name), entry.path)
+
+def _copy_update_item(src: str, dst: str, replace: bool = False, link_if_same_as: str | None = None) -> int:
+	if os.path.isdir(src):
+		if replace and os.path.lexists(dst):
+			# Merge in place: only files gone from the new tree are deleted, changed files are overwritten
+			if os.path.isdir(dst) and not os.path.islink(dst):
+				_remove_stale_entries(src, dst)
+			else:
+				os.unlink(dst)
+		return fast_copytree(src, dst, link_if_same_as=link_if_same_as, skip_if_same=replace)
+	return copy_file_unless_same(src, dst, link_if_same_as, skip_if_same=replace)
+
+def copy_update_items(items, label: str, replace: bool = False, max_workers: int = 8, link_unchanged_from: str | None = None):
+	"""Copy (name, src, dst) top-level items concurrently so their file I/O overlaps.
+
+	Every copy runs to completion; if any failed, an OSError naming them is raised afterwards.
+	With `replace`, existing destination directories are merged into rather than recreated,
+	entries deleted upstream are removed so they don't linger, and files whose content is
+	unchanged are not rewritten. With `link_unchanged_from` (the new release's tree), files
+	identical to their counterpart there are hardlinked instead of copied; that is safe
+	because the replace pass never writes to an unchanged file.
+	"""
+	failed = []
+	saved = 0
+	with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="update-copy") as pool:
+		futures = {
+			pool.submit(
+				_copy_update_item, src, dst, replace,
+				os.path.join(link_unchanged_from, name) if link_unchanged_from else None,
+			): name
+			for name, src, dst in items
+		}
+		for future in as_completed(futures):
+			name = futures[future]
+			try:
+				saved += future.result()
+				logging.info(f"{label}: {name}")
+			except Exception as e:
+				logging.error(f"Failed to copy {name}: {e}")
+				failed.append(name)
+	if saved:
+		logging.info(f"{label}: {saved / (1 << 20):.1f} MiB unchanged, not copied")
+	if failed:
+		raise OSError(f"Could not copy: {', '.join(sorted(failed))}")
+
+UPDATE_STAGING_PREFIX = '.update-staging-'  # extraction dir inside BASE_DIR so installs are renames
+UPDATE_RETIRED_MARKER = '.update-old-'  # suffix for entries swapped out by an update
+
+def _remove_update_leftovers(paths):
+	for path in paths:
+		try:
+			if os.path.isdir(path) and not os.path.islink(path):
+				shutil.rmtree(path)
+			else:
+				os.unlink(path)
+		except OSError as e:
+			logging.debug(f"Could not remove update leftover {path}: {e}")
+
+def clean_update_leftovers(base_dir: str = BASE_DIR):
+	"""Delete swapped-out entries and staging dirs a previous update didn't get to, in the background."""
+	try:
+		leftovers = [
+			os.path.join(base_dir, name) for name in os.listdir(base_dir)
+			if UPDATE_RETIRED_MARKER in name or name.startswith(UPDATE_STAGING_PREFIX)
+		]
+	except OSError:
+		return
+	if leftovers:
+		threading.Thread(target=_remove_update_leftovers, args=(leftovers,), name="update-cleanup", daemon=True).start()
+
+def swap_in_update_items(items, label: str):
+	"""Install (name, src, dst) items by renaming each staged src into place.
+
+	src must be on the same volume as dst. An existing dst is first renamed aside to
+	`<dst>.update-old-<ts>`, so every top-level entry is wholly old or wholly new, even if
+	the process dies mid-update. Items that can't be renamed (e.g. a file held open on
+	Windows) fall back to copy_update_items' in-place merge. Swapped-out entries are
+	deleted on a background thread.
+	"""
+	stamp = datetime.now().strftime('%Y%m%d%H%M%S')
+	retired = []
+	fallback = []
+	for name, src, dst in items:
+		aside = None
+		try:
+			if os.path.lexists(dst):
+				aside = f"{dst}{UPDATE_RETIRED_MARKER}{stamp}"
+				os.replace(dst, aside)
+			try:
+				os.replace(src, dst)
+			except OSError:
+				if aside:
+					os.replace(aside, dst)
+				raise
+		except OSError as e:
+			logging.warning(f"Could not swap in {name} ({e}); copying instead")
+			fallback.append((name, src, dst))
+			continue
+		if aside:
+			retired.append(aside)
+		logging.info(f"{label}: {name}")
+	if fallback:
+		copy_update_items(fallback, label, replace=True)
+	if retired:
+		threading.Thread(target=_remove_update_leftovers, args=(retired,), name="update-cleanup", daemon=True).start()
+
+@functools.lru_cache(maxsize=1)
 def get_current_version():
-	"""Get the current version of the application."""
+	"""Get the current version of the application (cached for the process lifetime)."""
 	try:
 		# Try to read version from a version file first
 		version_file = os.path.join(BASE_DIR, 'version.txt')
@@ -472,7 +1432,6 @@ def get_current_version():
 		
 		# Fallback: try to extract from git or use a default
 		try:
-			import subprocess
 			result = subprocess.run(['git', 'describe', '--tags', '--always'], 
 								  capture_output=True, text=True, cwd=BASE_DIR, timeout=5)
 			if result.returncode == 0:
@@ -485,21 +1444,11 @@ def get_current_version():
 	except Exception:
 		return "1.0.0"
 
+@functools.lru_cache(maxsize=1)
 def get_current_commit_hash():
-	"""Get the current git commit hash."""
+	"""Get the current short git commit hash (cached for the process lifetime)."""
 	try:
-		import subprocess
-		result = subprocess.run(['git', 'rev-parse', 'HEAD'], 
-							  capture_output=True, text=True, cwd=BASE_DIR, timeout=5)
-		if result.returncode == 0:
-			return result.stdout.strip()[:8]  # Return short hash
-	except Exception:
-		pass
-	
-	# Fallback: try to get from git log
-	try:
-		import subprocess
-		result = subprocess.run(['git', 'log', '-1', '--format=%H'], 
+		result = subprocess.run(['git', 'rev-parse', '--short=8', 'HEAD'], 
 							  capture_output=True, text=True, cwd=BASE_DIR, timeout=5)
 		if result.returncode == 0:
 			return result.stdout.strip()[:8]
@@ -549,21 +1498,25 @@ def update_current_working_item(item_info):
 		current_working_item = item_info
 		logging.debug(f"Updated current working item: {item_info}")
 
+# Inventory titles and streamer names repeat across every streamer and poll cycle, so the
+# normalized forms are memoized rather than re-run through the regexes for each comparison
+@functools.lru_cache(maxsize=4096)
 def _normalize_match_text(value: str) -> str:
 	text = (value or "").strip().lower()
 	if not text:
 		return ""
 	text = text.replace("_", " ").replace("-", " ")
-	text = re.sub(r"https?://(www\.)?twitch\.tv/", "", text)
-	text = re.sub(r"[^a-z0-9\s]", " ", text)
-	text = re.sub(r"\s+", " ", text).strip()
+	text = _TWITCH_URL_PREFIX_RE.sub("", text)
+	text = _NON_ALNUM_SPACE_RE.sub(" ", text)
+	text = _WHITESPACE_RE.sub(" ", text).strip()
 	return text
 
 def _compact_match_text(value: str) -> str:
 	return _normalize_match_text(value).replace(" ", "")
 
-def _tokenize_match_text(value: str) -> set[str]:
-	return {tok for tok in _normalize_match_text(value).split(" ") if len(tok) >= 3}
+@functools.lru_cache(maxsize=4096)
+def _tokenize_match_text(value: str) -> frozenset[str]:
+	return frozenset(tok for tok in _normalize_match_text(value).split(" ") if len(tok) >= 3)
 
 def _extract_channel_login(url: str | None) -> str | None:
 	return twitch_channel_login_from_url(url)
@@ -636,6 +1589,10 @@ def match_streamer_drop_progress(drop: dict, inventory_progress: dict, used_titl
 	if channel_login:
 		streamer_variations.append(channel_login)
 	item_variations = generate_search_variations(item_name)
+	streamer_tokens = set()
+	for variation in streamer_variations:
+		streamer_tokens.update(_tokenize_match_text(variation))
+	item_tokens = _tokenize_match_text(item_name)
 	title_scores: list[tuple[int, str, int]] = []
 	used = used_titles or set()
 	for title, percent in (inventory_progress or {}).items():
@@ -652,17 +1609,15 @@ def match_streamer_drop_progress(drop: dict, inventory_progress: dict, used_titl
 			if _contains_variation(title_norm, title_compact, variation):
 				score += 42
 				break
-		streamer_tokens = set()
-		for variation in streamer_variations:
-			streamer_tokens.update(_tokenize_match_text(variation))
-		streamer_overlap = len(streamer_tokens & _tokenize_match_text(title))
+		title_tokens = _tokenize_match_text(title)
+		streamer_overlap = len(streamer_tokens & title_tokens)
 		score += min(24, streamer_overlap * 8)
 		# Item text matching helps disambiguate multiple drops for one streamer
 		for variation in item_variations:
 			if _contains_variation(title_norm, title_compact, variation):
 				score += 40
 				break
-		item_overlap = len(_tokenize_match_text(item_name) & _tokenize_match_text(title))
+		item_overlap = len(item_tokens & title_tokens)
 		score += min(24, item_overlap * 8)
 		if title in used:
 			score -= 20
@@ -677,48 +1632,63 @@ def match_streamer_drop_progress(drop: dict, inventory_progress: dict, used_titl
 	return best_percent, best_title, best_score
 
 
-def intelligent_item_matching(item_name, inventory_progress):
+# Keyword mappings for common item types whose Facepunch and inventory names differ
+_ITEM_KEYWORD_MAPPINGS = {
+	'chestplate': ['chestplate', 'chest'],
+	'facemask': ['facemask', 'mask'],
+	'kilt': ['kilt'],
+	'fridge': ['fridge'],
+	'locker': ['locker'],
+	'bag': ['bag'],
+	'helmet': ['helmet'],
+	'pants': ['pants'],
+	'shirt': ['shirt'],
+	'jacket': ['jacket'],
+	'gloves': ['gloves'],
+	'boots': ['boots'],
+	'shoes': ['shoes']
+}
+_ITEM_KEYWORDS = frozenset(v for variations in _ITEM_KEYWORD_MAPPINGS.values() for v in variations)
+
+def build_item_keyword_index(inventory_progress) -> dict[str, tuple[int, str, int]]:
+	"""Map each item keyword to the first inventory title containing it, as (position, title, percent).
+
+	Built with one scan of the inventory so every unmatched drop is a few dict lookups.
+	"""
+	index = {}
+	for position, (title, percent) in enumerate(inventory_progress.items()):
+		title_lower = title.lower()
+		for keyword in _ITEM_KEYWORDS:
+			if keyword not in index and keyword in title_lower:
+				index[keyword] = (position, title, percent)
+	return index
+
+def intelligent_item_matching(item_name, inventory_progress, keyword_index=None):
 	"""
 	Intelligent matching for items where facepunch names differ from inventory names.
 	Uses keyword matching to find similar items.
 	"""
-	# Define keyword mappings for common item types
-	keyword_mappings = {
-		'chestplate': ['chestplate', 'chest'],
-		'facemask': ['facemask', 'mask'],
-		'kilt': ['kilt'],
-		'fridge': ['fridge'],
-		'locker': ['locker'],
-		'bag': ['bag'],
-		'helmet': ['helmet'],
-		'pants': ['pants'],
-		'shirt': ['shirt'],
-		'jacket': ['jacket'],
-		'gloves': ['gloves'],
-		'boots': ['boots'],
-		'shoes': ['shoes']
-	}
-	
 	item_lower = item_name.lower()
 	
 	# Find matching keywords
 	matching_keywords = []
-	for keyword, variations in keyword_mappings.items():
+	for keyword, variations in _ITEM_KEYWORD_MAPPINGS.items():
 		for variation in variations:
 			if variation in item_lower:
 				matching_keywords.extend(variations)
 				break
+	if not matching_keywords:
+		return None, None
 	
-	# If we found keywords, try to match against inventory titles
-	if matching_keywords:
-		for title, percent in inventory_progress.items():
-			title_lower = title.lower()
-			for keyword in matching_keywords:
-				if keyword in title_lower:
-					logging.info(f"Intelligent match: '{item_name}' -> '{title}' (keyword: '{keyword}')")
-					return percent, title
-	
-	return None, None
+	# The earliest inventory title holding any of the keywords wins
+	if keyword_index is None:
+		keyword_index = build_item_keyword_index(inventory_progress)
+	hits = [(keyword_index[keyword], keyword) for keyword in matching_keywords if keyword in keyword_index]
+	if not hits:
+		return None, None
+	(_, title, percent), keyword = min(hits, key=lambda hit: hit[0][0])
+	logging.info(f"Intelligent match: '{item_name}' -> '{title}' (keyword: '{keyword}')")
+	return percent, title
 
 
 def intelligent_streamer_matching(streamer_name, inventory_progress):
@@ -733,212 +1703,241 @@ def intelligent_streamer_matching(streamer_name, inventory_progress):
 	return progress, title
 
 
-def update_cached_drops_data(facepunch_data, inventory_progress, recently_claimed_streamers=None, general_progress_map=None):
-	"""Update the cached drops data for the web interface."""
-	global cached_drops_data
+@functools.lru_cache(maxsize=512)
+def _word_pattern(term: str) -> re.Pattern:
+	"""Compiled case-folded whole-word matcher for a drop search term."""
+	return re.compile(r'\b' + re.escape(term.lower()) + r'\b')
+
+def _build_word_index(texts) -> dict[str, set[int]]:
+	"""Map each lowercase word to the positions of the texts containing it."""
+	index: dict[str, set[int]] = {}
+	for idx, text in enumerate(texts):
+		for word in _WORD_RE.findall(text):
+			index.setdefault(word, set()).add(idx)
+	return index
+
+def _word_index_candidates(index: dict[str, set[int]], term: str, total: int) -> set[int]:
+	"""Positions that contain every word of term (all positions when term has no words)."""
+	words = _WORD_RE.findall(term.lower())
+	if not words:
+		return set(range(total))
+	found = set(index.get(words[0], ()))
+	for word in words[1:]:
+		found &= index.get(word, set())
+	return found
+
+def _build_drops_data(facepunch_data, inventory_progress, recently_claimed_streamers, general_progress_map, updated_at: str) -> dict:
+	"""Build a fresh drops cache from Facepunch data and inventory progress (no locks held)."""
+	drops_data = {
+		"in_progress": [],
+		"not_started": [],
+		"completed": [],
+		"last_updated": updated_at
+	}
 	
-	with drops_data_lock:
-		# If this is a partial update (only progress data), merge with existing cache
-		if facepunch_data is None and inventory_progress:
-			# Update existing cache with new progress data
-			if cached_drops_data and cached_drops_data.get("in_progress"):
-				for drop in cached_drops_data["in_progress"]:
-					if drop.get("type") == "streamer":
-						match_progress, match_title, _ = match_streamer_drop_progress(drop, inventory_progress)
-						if match_progress is not None:
-							drop["progress"] = match_progress
-							drop["progress_title"] = match_title
-						continue
-					# Update progress for matching general items
-					for title, percent in inventory_progress.items():
-						if drop.get("type") == "general" and drop.get("item"):
-							item_lower = drop["item"].lower()
-							title_lower = title.lower()
-							if re.search(r'\b' + re.escape(item_lower) + r'\b', title_lower):
-								drop["progress"] = percent
-								drop["progress_title"] = title
-								break
-			
-			cached_drops_data["last_updated"] = datetime.now().isoformat()
-			
-			# Add current working item to the data
-			with current_working_lock:
-				cached_drops_data["current_working"] = current_working_item
-			
-			# Emit update via WebSocket if available
-			if socketio:
-				try:
-					socketio.emit('drops_update', cached_drops_data)
-					logging.debug("Emitted partial drops update via WebSocket")
-				except Exception as e:
-					logging.debug(f"Failed to emit partial drops update via WebSocket: {e}")
-			return
+	# Include recently-claimed (<=21 days) list for the web UI to mark as complete
+	drops_data["recently_claimed_streamers"] = recently_claimed_streamers or []
+
+	# Process streamer-specific drops
+	streamer_drops = facepunch_data.get('streamer', []) if facepunch_data else []
+	used_progress_titles = set()
+	for drop in streamer_drops:
+		streamer_name = drop.get('streamer', '')
+		item_name = drop.get('item', '')
+		hours = drop.get('hours', 0)
+		is_live = drop.get('is_live', False)
+		url = drop.get('url', '')
 		
-		# Full update with Facepunch data
-		drops_data = {
-			"in_progress": [],
-			"not_started": [],
-			"completed": [],
-			"last_updated": datetime.now().isoformat()
+		progress, progress_title, match_score = match_streamer_drop_progress(
+			drop,
+			inventory_progress,
+			used_titles=used_progress_titles
+		)
+		if progress_title:
+			used_progress_titles.add(progress_title)
+			logging.info(
+				f"[STREAMER-MATCH] '{streamer_name}' / '{item_name}' -> '{progress_title}' "
+				f"({progress}%, score={match_score})"
+			)
+		else:
+			logging.info(f"[STREAMER-MATCH] No progress title matched for '{streamer_name}' / '{item_name}'")
+		
+		drop_info = {
+			"type": "streamer",
+			"streamer": streamer_name,
+			"item": item_name,
+			"hours": hours,
+			"is_live": is_live,
+			"url": url,
+			"progress": progress,
+			"progress_title": progress_title,  # The actual title from Twitch inventory
+			"video": drop.get('video'),
+			"streamer_avatar": drop.get('streamer_avatar')
 		}
 		
-		# Include recently-claimed (<=21 days) list for the web UI to mark as complete
-		drops_data["recently_claimed_streamers"] = recently_claimed_streamers or []
-
-		# Process streamer-specific drops
-		streamer_drops = facepunch_data.get('streamer', []) if facepunch_data else []
-		used_progress_titles = set()
-		for drop in streamer_drops:
-			streamer_name = drop.get('streamer', '')
-			item_name = drop.get('item', '')
-			hours = drop.get('hours', 0)
-			is_live = drop.get('is_live', False)
-			url = drop.get('url', '')
-			
-			progress, progress_title, match_score = match_streamer_drop_progress(
-				drop,
-				inventory_progress,
-				used_titles=used_progress_titles
-			)
-			if progress_title:
-				used_progress_titles.add(progress_title)
+		if progress is None:
+			# Check if this streamer was recently claimed before marking as not_started
+			claimed_match = find_recently_claimed_match(streamer_name, recently_claimed_streamers, streamer_url=url)
+			streamer_claimed = bool(claimed_match)
+			if streamer_claimed:
 				logging.info(
-					f"[STREAMER-MATCH] '{streamer_name}' / '{item_name}' -> '{progress_title}' "
-					f"({progress}%, score={match_score})"
+					f"[DROPS-CATEGORIZATION] '{streamer_name}' treated as completed from claimed history "
+					f"('{claimed_match.get('name')}', {claimed_match.get('days')} day(s) ago)"
 				)
-			else:
-				logging.info(f"[STREAMER-MATCH] No progress title matched for '{streamer_name}' / '{item_name}'")
 			
-			drop_info = {
-				"type": "streamer",
-				"streamer": streamer_name,
-				"item": item_name,
-				"hours": hours,
-				"is_live": is_live,
-				"url": url,
-				"progress": progress,
-				"progress_title": progress_title,  # The actual title from Twitch inventory
-				"video": drop.get('video'),
-				"streamer_avatar": drop.get('streamer_avatar')
-			}
-			
-			if progress is None:
-				# Check if this streamer was recently claimed before marking as not_started
-				claimed_match = find_recently_claimed_match(streamer_name, recently_claimed_streamers, streamer_url=url)
-				streamer_claimed = bool(claimed_match)
-				if streamer_claimed:
-					logging.info(
-						f"[DROPS-CATEGORIZATION] '{streamer_name}' treated as completed from claimed history "
-						f"('{claimed_match.get('name')}', {claimed_match.get('days')} day(s) ago)"
-					)
-				
-				if streamer_claimed:
-					# Mark as completed since it was recently claimed
-					drop_info["ready_to_claim"] = False  # Already claimed
-					drops_data["completed"].append(drop_info)
-					logging.info(f"[DROPS-CATEGORIZATION] Added '{streamer_name}' to completed section")
-				else:
-					drops_data["not_started"].append(drop_info)
-					logging.info(f"[DROPS-CATEGORIZATION] Added '{streamer_name}' to not_started section")
-			elif progress >= 100:
-				# Mark as completed but require manual claim
-				drop_info["ready_to_claim"] = True
+			if streamer_claimed:
+				# Mark as completed since it was recently claimed
+				drop_info["ready_to_claim"] = False  # Already claimed
 				drops_data["completed"].append(drop_info)
+				logging.info(f"[DROPS-CATEGORIZATION] Added '{streamer_name}' to completed section")
 			else:
-				drops_data["in_progress"].append(drop_info)
+				drops_data["not_started"].append(drop_info)
+				logging.info(f"[DROPS-CATEGORIZATION] Added '{streamer_name}' to not_started section")
+		elif progress >= 100:
+			# Mark as completed but require manual claim
+			drop_info["ready_to_claim"] = True
+			drops_data["completed"].append(drop_info)
+		else:
+			drops_data["in_progress"].append(drop_info)
+	
+	# Process general drops - use general drops area only
+	general_drops = facepunch_data.get('general', []) if facepunch_data else []
+	
+	# Use the provided general progress map, or fall back to empty dict
+	general_progress_map = general_progress_map or {}
+	if general_drops and general_progress_map:
+		logging.info(f"[GENERAL-DROPS-PROCESSING] Using general drops progress map with {len(general_progress_map)} items")
+	# Lowercase each title once and index its words for every drop's search below
+	general_titles = [(title, title.lower(), percent) for title, percent in general_progress_map.items()]
+	general_title_words = _build_word_index(title_lower for _, title_lower, _ in general_titles)
+	# Keyword -> first title table for intelligent matching, built on the first drop that needs it
+	general_keyword_index = None
+	
+	for drop in general_drops:
+		item_name = drop.get('item', '')
+		hours = drop.get('hours', 0)
+		alias = drop.get('alias', '')
 		
-		# Process general drops - use general drops area only
-		general_drops = facepunch_data.get('general', []) if facepunch_data else []
+		# Find matching inventory progress (only in general drops area)
+		progress = None
+		progress_title = None
+		search_terms = [item_name]
+		if alias:
+			search_terms.append(alias)
 		
-		# Use the provided general progress map, or fall back to empty dict
-		general_progress_map = general_progress_map or {}
-		if general_drops and general_progress_map:
-			logging.info(f"[GENERAL-DROPS-PROCESSING] Using general drops progress map with {len(general_progress_map)} items")
+		# Use word boundaries to avoid partial matches (e.g., "fridge" shouldn't match "Abe Fridge").
+		# Only titles holding every word of some term can match, so the regex runs on those alone.
+		term_patterns = [_word_pattern(term) for term in search_terms]
+		candidates = set()
+		for term in search_terms:
+			candidates |= _word_index_candidates(general_title_words, term, len(general_titles))
+		for idx in sorted(candidates):
+			title, title_lower, percent = general_titles[idx]
+			if any(pattern.search(title_lower) for pattern in term_patterns):
+				progress = percent
+				progress_title = title
+				break
 		
-		for drop in general_drops:
-			item_name = drop.get('item', '')
-			hours = drop.get('hours', 0)
-			alias = drop.get('alias', '')
-			
-			# Find matching inventory progress (only in general drops area)
-			progress = None
-			progress_title = None
-			search_terms = [item_name]
-			if alias:
-				search_terms.append(alias)
-			
-			for title, percent in general_progress_map.items():
-				for term in search_terms:
-					# Use word boundaries to avoid partial matches (e.g., "fridge" shouldn't match "Abe Fridge")
-					if re.search(r'\b' + re.escape(term.lower()) + r'\b', title.lower()):
+		# If no exact match found, try a more flexible search
+		if progress is None:
+			terms_lower = [term.lower() for term in search_terms if len(term) > 3]
+			for title, title_lower, percent in general_titles:
+				for term_lower in terms_lower:
+					# Try partial matching for common words like "Chestplate", "Kilt", etc.
+					if term_lower in title_lower:
 						progress = percent
 						progress_title = title
 						break
 				if progress is not None:
 					break
-			
-			# If no exact match found, try a more flexible search
-			if progress is None:
-				for title, percent in general_progress_map.items():
-					for term in search_terms:
-						# Try partial matching for common words like "Chestplate", "Kilt", etc.
-						if term.lower() in title.lower() and len(term) > 3:
-							progress = percent
-							progress_title = title
-							break
-					if progress is not None:
-						break
-			
-			# If still no match, try intelligent keyword matching
-			if progress is None:
-				progress, progress_title = intelligent_item_matching(item_name, general_progress_map)
-				if progress is not None:
-					logging.info(f"Successfully matched '{item_name}' to '{progress_title}' with {progress}% progress")
-			
-			# Debug logging for unmatched items
-			if progress is None and item_name:
-				logging.info(f"Could not find progress for general drop: '{item_name}' (alias: '{alias}')")
-				logging.info(f"Available general drops titles: {list(general_progress_map.keys())}")
-				logging.info(f"Searched terms: {search_terms}")
-			
-			drop_info = {
-				"type": "general",
-				"item": item_name,
-				"hours": hours,
-				"alias": alias,
-				"progress": progress,
-				"progress_title": progress_title,  # The actual title from Twitch inventory
-				"video": drop.get('video'),
-				"streamer_avatar": None  # General drops don't have streamer avatars
-			}
-			
-			if progress is None:
-				# For general drops, no progress bar means completed (not not_started)
-				# General drops should always show a progress bar when active
-				drops_data["completed"].append(drop_info)
-			elif progress >= 100:
-				# Mark as completed but require manual claim
-				drop_info["ready_to_claim"] = True
-				drops_data["completed"].append(drop_info)
-			else:
-				drops_data["in_progress"].append(drop_info)
 		
-		cached_drops_data = drops_data
+		# If still no match, try intelligent keyword matching
+		if progress is None:
+			if general_keyword_index is None:
+				general_keyword_index = build_item_keyword_index(general_progress_map)
+			progress, progress_title = intelligent_item_matching(item_name, general_progress_map, general_keyword_index)
+			if progress is not None:
+				logging.info(f"Successfully matched '{item_name}' to '{progress_title}' with {progress}% progress")
 		
-		# Add current working item to the data
-		with current_working_lock:
-			drops_data["current_working"] = current_working_item
+		# Debug logging for unmatched items
+		if progress is None and item_name:
+			logging.info(f"Could not find progress for general drop: '{item_name}' (alias: '{alias}')")
+			logging.info(f"Available general drops titles: {list(general_progress_map.keys())}")
+			logging.info(f"Searched terms: {search_terms}")
 		
-		# Log the update for debugging
-		logging.info(f"Updated drops cache: {len(drops_data['in_progress'])} in progress, {len(drops_data['not_started'])} not started, {len(drops_data['completed'])} completed")
+		drop_info = {
+			"type": "general",
+			"item": item_name,
+			"hours": hours,
+			"alias": alias,
+			"progress": progress,
+			"progress_title": progress_title,  # The actual title from Twitch inventory
+			"video": drop.get('video'),
+			"streamer_avatar": None  # General drops don't have streamer avatars
+		}
+		
+		if progress is None:
+			# For general drops, no progress bar means completed (not not_started)
+			# General drops should always show a progress bar when active
+			drops_data["completed"].append(drop_info)
+		elif progress >= 100:
+			# Mark as completed but require manual claim
+			drop_info["ready_to_claim"] = True
+			drops_data["completed"].append(drop_info)
+		else:
+			drops_data["in_progress"].append(drop_info)
+	
+	return drops_data
+
+def update_cached_drops_data(facepunch_data, inventory_progress, recently_claimed_streamers=None, general_progress_map=None):
+	"""Update the cached drops data for the web interface."""
+	global cached_drops_data, _CACHED_DROPS_RESPONSE
+	
+	updated_at = datetime.now().isoformat()
+	# A single reference read; update_current_working_item swaps the whole object
+	working_item = current_working_item
+	
+	# If this is a partial update (only progress data), merge with existing cache
+	if facepunch_data is None and inventory_progress:
+		with drops_data_lock:
+			_CACHED_DROPS_RESPONSE = None
+			# Update existing cache with new progress data
+			if cached_drops_data and cached_drops_data.get("in_progress"):
+				for drop in cached_drops_data["in_progress"]:
+					if drop.get("type") == "streamer":
+						match_progress, match_title, _ = match_streamer_drop_progress(drop, inventory_progress)
+						if match_progress is not None:
+							drop["progress"] = match_progress
+							drop["progress_title"] = match_title
+						continue
+					# Update progress for matching general items
+					if drop.get("type") == "general" and drop.get("item"):
+						item_pattern = _word_pattern(drop["item"])
+						for title, percent in inventory_progress.items():
+							if item_pattern.search(title.lower()):
+								drop["progress"] = percent
+								drop["progress_title"] = title
+								break
+			
+			cached_drops_data["last_updated"] = updated_at
+			cached_drops_data["current_working"] = working_item
 		
 		# Emit update via WebSocket if available
-		if socketio:
-			try:
-				socketio.emit('drops_update', drops_data)
-				logging.debug("Emitted drops update via WebSocket")
-			except Exception as e:
-				logging.debug(f"Failed to emit drops update via WebSocket: {e}")
+		emit_in_background('drops_update', get_cached_drops_data_snapshot, DROPS_EMIT_COALESCE_SECONDS)
+		return
+	
+	# Full update with Facepunch data; matching runs outside the lock so API readers aren't held up
+	drops_data = _build_drops_data(facepunch_data, inventory_progress, recently_claimed_streamers, general_progress_map, updated_at)
+	drops_data["current_working"] = working_item
+	with drops_data_lock:
+		cached_drops_data = drops_data
+		_CACHED_DROPS_RESPONSE = None
+	
+	# Log the update for debugging
+	logging.info(f"Updated drops cache: {len(drops_data['in_progress'])} in progress, {len(drops_data['not_started'])} not started, {len(drops_data['completed'])} completed")
+	
+	# Emit update via WebSocket if available
+	emit_in_background('drops_update', get_cached_drops_data_snapshot, DROPS_EMIT_COALESCE_SECONDS)
 
 
 def load_preferences():
@@ -952,8 +1951,9 @@ def load_preferences():
 	}
 	try:
 		if os.path.exists(CONFIG_PATH):
-			with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
-				data = json.load(f)
+			with open(CONFIG_PATH, 'rb') as f:
+				raw = f.read()
+				data = _orjson.loads(raw) if _orjson is not None else json.loads(raw)
 				if isinstance(data, dict):
 					default_prefs.update(data)
 					default_prefs["watch_preferences"] = _sanitize_watch_preferences(default_prefs.get("watch_preferences"))
@@ -962,24 +1962,56 @@ def load_preferences():
 	return default_prefs
 
 
+_STREAMER_MAPPINGS_CACHE = None  # (path, mtime_ns, mappings)
+
 def load_streamer_mappings():
-	"""Load streamer name mappings from the separate mappings file."""
+	"""Load streamer name mappings from the separate mappings file.
+
+	The parsed file is reused until its modification time changes, so per-name lookups cost a stat.
+	"""
+	global _STREAMER_MAPPINGS_CACHE
 	try:
-		if os.path.exists(STREAMER_MAPPINGS_PATH):
-			with open(STREAMER_MAPPINGS_PATH, 'r', encoding='utf-8') as f:
-				data = json.load(f)
-				if isinstance(data, dict):
-					return data
+		mtime = os.stat(STREAMER_MAPPINGS_PATH).st_mtime_ns
+	except OSError:
+		return {}
+	cached = _STREAMER_MAPPINGS_CACHE
+	if cached is not None and cached[0] == STREAMER_MAPPINGS_PATH and cached[1] == mtime:
+		return cached[2]
+	data = {}
+	try:
+		with open(STREAMER_MAPPINGS_PATH, 'rb') as f:
+			raw = f.read()
+			loaded = _orjson.loads(raw) if _orjson is not None else json.loads(raw)
+			if isinstance(loaded, dict):
+				data = loaded
 	except Exception as e:
 		logging.debug(f"Could not load streamer mappings: {e}")
-	return {}
+	_STREAMER_MAPPINGS_CACHE = (STREAMER_MAPPINGS_PATH, mtime, data)
+	return data
 
 
+def _encode_preferences(prefs) -> bytes:
+	if _orjson is not None:
+		try:
+			return _orjson.dumps(prefs, option=_orjson.OPT_INDENT_2)
+		except TypeError:
+			# orjson rejects non-str keys; the stdlib encoder coerces them
+			pass
+	return json.dumps(prefs, indent=2).encode('utf-8')
+
 def save_preferences(prefs):
+	global _LAST_PREFS_JSON
 	try:
 		with CONFIG_LOCK:
-			with open(CONFIG_PATH, 'w', encoding='utf-8') as f:
-				json.dump(prefs, f, indent=2)
+			payload = _encode_preferences(prefs)
+			# Skip the write when nothing changed since the last save to this path
+			if _LAST_PREFS_JSON == (CONFIG_PATH, payload) and os.path.exists(CONFIG_PATH):
+				return
+			tmp_path = f"{CONFIG_PATH}.tmp"
+			with open(tmp_path, 'wb') as f:
+				f.write(payload)
+			os.replace(tmp_path, CONFIG_PATH)
+			_LAST_PREFS_JSON = (CONFIG_PATH, payload)
 	except Exception as e:
 		logging.warning(f"Could not save preferences: {e}")
 
@@ -990,10 +2022,28 @@ def get_headless_preference() -> bool:
 	except Exception:
 		return DEFAULT_HEADLESS
 
-def ensure_icon_file(image) -> str | None:
+def get_screenshot_quality() -> int:
+	"""JPEG quality (1-100) for dashboard preview frames."""
 	try:
-		base = os.path.abspath(os.path.dirname(__file__)) if '__file__' in globals() else os.getcwd()
-		path = os.path.join(base, 'tray.ico')
+		return max(1, min(100, int(PREFERENCES.get("screenshot_quality", SCREENSHOT_JPEG_QUALITY))))
+	except Exception:
+		return SCREENSHOT_JPEG_QUALITY
+
+def get_screenshot_clip(page) -> dict:
+	"""Viewport-sized clip rectangle for preview screenshots."""
+	try:
+		size = page.viewport_size or SCREENSHOT_CLIP_SIZE
+	except Exception:
+		size = SCREENSHOT_CLIP_SIZE
+	return {"x": 0, "y": 0, "width": size["width"], "height": size["height"]}
+
+def ensure_icon_file(image=None) -> str | None:
+	try:
+		path = TRAY_ICON_FILE
+		if os.path.exists(path):
+			return path
+		if image is None:
+			image = _generate_tray_icon_image()
 		if image is None:
 			return None
 		# Save ICO once if not present
@@ -1006,15 +2056,49 @@ def ensure_icon_file(image) -> str | None:
 		logging.debug(f"Could not create tray icon file: {e}")
 		return None
 
+def _get_notification_icon_path() -> str | None:
+	"""Return the toast icon path, creating the .ico the first time a notification needs it."""
+	global ICON_PATH, _ICON_PATH_RESOLVED
+	if not _ICON_PATH_RESOLVED or (ICON_PATH and not os.path.exists(ICON_PATH)):
+		ICON_PATH = ensure_icon_file()
+		_ICON_PATH_RESOLVED = True
+		logging.info(f"Notification icon: {ICON_PATH}")
+	return ICON_PATH
 
-def send_notification(title: str, message: str):
-	global NOTIFICATIONS_ENABLED
+_OSASCRIPT_NOTIFY = 'on run argv\ndisplay notification (item 1 of argv) with title (item 2 of argv)\nend run'
+
+def send_notification(title: str, message: str, wait: bool = False):
+	"""Show a desktop notification without blocking the caller.
+
+	Notifications are handed to a single worker thread, since a win10toast toast blocks for
+	its whole duration. Pass `wait=True` when the toast must be shown before the caller
+	continues (e.g. right before a restart replaces the process).
+	"""
+	global _NOTIFICATION_WORKER
 	if not NOTIFICATIONS_ENABLED:
 		return
+	if wait:
+		_deliver_notification(title, message)
+		return
+	with _NOTIFICATION_WORKER_LOCK:
+		if _NOTIFICATION_WORKER is None or not _NOTIFICATION_WORKER.is_alive():
+			_NOTIFICATION_WORKER = threading.Thread(target=_notification_worker, name="notifications", daemon=True)
+			_NOTIFICATION_WORKER.start()
+	_NOTIFICATION_QUEUE.put((title, message))
+
+def _notification_worker():
+	while True:
+		title, message = _NOTIFICATION_QUEUE.get()
+		_deliver_notification(title, message)
+
+def _deliver_notification(title: str, message: str):
+	global _TOASTER
 	try:
-		if IS_WINDOWS and ToastNotifier:
-			icon_path = ICON_PATH if ICON_PATH and os.path.exists(ICON_PATH) else None
-			toaster = ToastNotifier()
+		if IS_WINDOWS and _load_toast_notifier():
+			icon_path = _get_notification_icon_path()
+			if _TOASTER is None:
+				_TOASTER = ToastNotifier()
+			toaster = _TOASTER
 			try:
 				if icon_path:
 					toaster.show_toast(title, message, icon_path=icon_path, duration=3, threaded=False)
@@ -1022,15 +2106,17 @@ def send_notification(title: str, message: str):
 					toaster.show_toast(title, message, duration=3, threaded=False)
 			except TypeError:
 				toaster.show_toast(title, message, duration=3, threaded=False)
-			logging.info("Notification queued via win10toast")
+			logging.info("Notification shown via win10toast")
 			return
 		if IS_MAC:
 			# Use AppleScript for native notifications without extra deps
 			try:
-				def _escape_applescript(s: str) -> str:
-					return (s or "").replace("\\", "\\\\").replace("\"", "\\\"")
-				script = f'display notification "{_escape_applescript(message)}" with title "{_escape_applescript(title)}"'
-				subprocess.run(["osascript", "-e", script], check=False)
+				# Title and message go in as argv, so nothing needs escaping into the script
+				subprocess.Popen(
+					["osascript", "-e", _OSASCRIPT_NOTIFY, message or "", title or ""],
+					stdout=subprocess.DEVNULL,
+					stderr=subprocess.DEVNULL,
+				)
 				logging.info("Notification sent via osascript")
 				return
 			except Exception as _:
@@ -1040,13 +2126,69 @@ def send_notification(title: str, message: str):
 		logging.warning(f"Notification failed: {e}")
 
 
-def restart_program():
+def _schedule_forced_exit(delay: float):
+	"""Arm a single daemon watchdog that hard-exits after delay seconds; later calls are no-ops.
+
+	request_exit() has already woken the async loop, so run_flow normally closes the browser
+	context and returns before this fires.
+	"""
+	global _SHUTDOWN_TIMER
+	with _SHUTDOWN_TIMER_LOCK:
+		if _SHUTDOWN_TIMER is not None:
+			return
+		timer = threading.Timer(delay, lambda: os._exit(0))
+		timer.daemon = True
+		_SHUTDOWN_TIMER = timer
+	timer.start()
+
+def _stop_tray_for_exit(timeout: float = 1.5):
+	"""Stop the tray icon before the process exits or is replaced, waiting at most timeout seconds."""
+	if not TRAY_ICON:
+		return
+	try:
+		if getattr(_TRAY_WORKER, "active", False):
+			# Already on the tray worker (e.g. a tray-triggered restart); waiting on it would stall
+			TRAY_ICON.stop()
+		else:
+			TRAY_EXECUTOR.submit(TRAY_ICON.stop).result(timeout=timeout)
+	except Exception:
+		pass
+
+def _current_run_args() -> list[str]:
+	"""Command-line flags that reproduce the current run mode after a restart."""
+	args = []
+	if PREFERENCES.get('test_mode', False):
+		args.append('--test')
+	if not PREFERENCES.get('enable_web_interface', True):
+		args.append('--no-web')
+	if not PREFERENCES.get('show_tray', True):
+		args.append('--no-tray')
+	return args
+
+RESTART_AFTER_RESPONSE_DELAY = 0.1  # seconds between the response closing and the restart
+
+def restart_after_response(response, extra_args: list[str] | None = None, label: str = "Restarting application..."):
+	"""Restart once `response` has been sent, via the WSGI close hook instead of a fixed sleep."""
+	def _restart():
+		time.sleep(RESTART_AFTER_RESPONSE_DELAY)
+		logging.info(label)
+		try:
+			restart_program(extra_args)
+		except Exception as e:
+			logging.error(f"Failed to restart: {e}")
+			os._exit(1)
+
+	response.call_on_close(lambda: threading.Thread(target=_restart, name="restart", daemon=True).start())
+	return response
+
+def restart_program(extra_args: list[str] | None = None):
+	interpreter = None
+	script_path = None
+	creationflags = 0
 	try:
 		with CONFIG_LOCK:
 			hide = bool(PREFERENCES.get("hide_console", True))
 		script_path = os.path.join(BASE_DIR, os.path.basename(__file__) if '__file__' in globals() else 'twitch_drop_automator.py')
-		interpreter = None
-		creationflags = 0
 		if IS_WINDOWS:
 			venv_py = os.path.join(BASE_DIR, 'venv', 'Scripts', 'python.exe')
 			venv_pyw = os.path.join(BASE_DIR, 'venv', 'Scripts', 'pythonw.exe')
@@ -1062,31 +2204,89 @@ def restart_program():
 			# POSIX: prefer venv/bin/python if present; no hidden-console concept
 			venv_py = os.path.join(BASE_DIR, 'venv', 'bin', 'python')
 			interpreter = venv_py if os.path.exists(venv_py) else sys.executable
-		subprocess.Popen([interpreter, script_path], cwd=BASE_DIR, creationflags=creationflags)
 	except Exception as e:
 		logging.warning(f"Restart spawn failed: {e}")
+	# Toggles save on a separate worker; make sure the new process sees the change
+	save_preferences(PREFERENCES)
+	request_exit()
+	_stop_tray_for_exit()
+	_replace_process(interpreter, [script_path, *(extra_args or [])], creationflags)
+
+def _replace_process(interpreter: str | None, args: list[str], creationflags: int = 0):
+	"""Hand off to `interpreter args` and end this process; never returns.
+
+	POSIX replaces the process image in place (os.execv), so two interpreters never overlap
+	during the handoff. Windows keeps Popen so CREATE_NO_WINDOW/pythonw can hide the console.
+	"""
+	if interpreter and not IS_WINDOWS:
+		try:
+			for handler in logging.getLogger().handlers:
+				handler.flush()
+			os.chdir(BASE_DIR)
+			os.execv(interpreter, [interpreter, *args])
+		except Exception as e:
+			logging.warning(f"Restart exec failed ({e}); spawning a new process instead.")
+	if interpreter:
+		try:
+			subprocess.Popen([interpreter, *args], cwd=BASE_DIR, creationflags=creationflags)
+		except Exception as e:
+			logging.warning(f"Restart spawn failed: {e}")
+	os._exit(0)
+
+def _get_async_exit() -> asyncio.Event:
+	"""Return the running loop's asyncio.Event that mirrors EXIT_EVENT."""
+	loop = asyncio.get_running_loop()
+	with _ASYNC_EXIT_LOCK:
+		event = _ASYNC_EXIT_EVENTS.get(loop)
+		if event is None:
+			event = asyncio.Event()
+			_ASYNC_EXIT_EVENTS[loop] = event
+	if EXIT_EVENT.is_set():
+		event.set()
+	else:
+		event.clear()
+	return event
+
+def request_exit():
+	"""Signal shutdown from any thread and wake coroutines blocked in wait_with_exit on every loop."""
+	EXIT_EVENT.set()
+	with _ASYNC_EXIT_LOCK:
+		mirrors = list(_ASYNC_EXIT_EVENTS.items())
+	for loop, event in mirrors:
+		if loop.is_closed():
+			continue
+		try:
+			loop.call_soon_threadsafe(event.set)
+		except RuntimeError:
+			# Loop closed in the meantime
+			pass
+
+async def wait_with_exit(task: asyncio.Task):
+	exit_event = _get_async_exit()
+	if not exit_event.is_set():
+		exit_waiter = asyncio.create_task(exit_event.wait())
+		try:
+			await asyncio.wait({task, exit_waiter}, return_when=asyncio.FIRST_COMPLETED)
+		finally:
+			exit_waiter.cancel()
+	if task.done():
+		return await task
 	try:
-		EXIT_EVENT.set()
-		if TRAY_ICON:
-			try:
-				threading.Thread(target=TRAY_ICON.stop, daemon=True).start()
-			except Exception:
-				pass
-		threading.Timer(1.5, lambda: os._exit(0)).start()
+		task.cancel()
 	except Exception:
-		os._exit(0)
+		pass
+	raise asyncio.CancelledError("Exit requested")
 
-async def wait_with_exit(task: asyncio.Task):
-	while True:
-		done, _ = await asyncio.wait({task}, timeout=0.3)
-		if task in done:
-			return await task
-		if EXIT_EVENT.is_set():
-			try:
-				task.cancel()
-			except Exception:
-				pass
-			raise asyncio.CancelledError("Exit requested")
+async def sleep_or_exit(seconds: float) -> bool:
+	"""Sleep up to `seconds`, waking immediately on an exit request. Returns True if exiting."""
+	exit_event = _get_async_exit()
+	if exit_event.is_set():
+		return True
+	try:
+		await asyncio.wait_for(exit_event.wait(), timeout=seconds)
+		return True
+	except asyncio.TimeoutError:
+		return False
 
 async def goto_with_exit(page, url: str, timeout: int = 120000, wait_until: str = "domcontentloaded"):
 	t = asyncio.create_task(page.goto(url, timeout=timeout, wait_until=wait_until))
@@ -1094,52 +2294,49 @@ async def goto_with_exit(page, url: str, timeout: int = 120000, wait_until: str
 
 
 def _generate_tray_icon_image():
+	if not _load_tray_modules():
+		return None
 	try:
+		# tray.ico ships with the app; drawing and persisting one is only a fallback if it is missing
+		if os.path.exists(TRAY_ICON_FILE):
+			try:
+				return Image.open(TRAY_ICON_FILE).convert("RGBA")
+			except Exception as e:
+				logging.debug(f"Cached tray icon unreadable, regenerating: {e}")
 		img = Image.new("RGBA", (64, 64), (40, 44, 52, 255))
 		d = ImageDraw.Draw(img)
 		d.ellipse((6, 6, 58, 58), fill=(113, 89, 193, 255))
 		d.rectangle((28, 18, 36, 46), fill=(255, 255, 255, 255))
 		d.rectangle((22, 18, 42, 26), fill=(255, 255, 255, 255))
+		try:
+			img.save(TRAY_ICON_FILE, format='ICO')
+		except Exception as e:
+			logging.debug(f"Could not persist tray icon: {e}")
 		return img
 	except Exception:
 		return None
 # --- Time helpers ---
 
+@functools.lru_cache(maxsize=1024)
+def _format_uk_time_label(epoch_minute: int) -> str:
+    """Format a UTC epoch minute as UK local time (Europe/London via zoneinfo/tzdata)."""
+    dt_local = datetime.fromtimestamp(epoch_minute * 60, tz=timezone.utc).astimezone(ZoneInfo("Europe/London"))
+    return dt_local.strftime("%d %B %Y at %H:%M %Z")
+
 def _format_start_time_uk(epoch_ms: int) -> tuple[str, int, int]:
     """Return (formatted_time_str, days_until, hours_until) in UK time.
-    - Formats using Europe/London; if unavailable, computes GMT/BST manually.
+    - The label is cached per epoch minute; the countdown is recomputed on every call.
     - hours_until is ceil of remaining hours.
     """
     try:
-        dt_utc = datetime.fromtimestamp(max(0, (epoch_ms or 0)) / 1000.0, tz=timezone.utc)
-
-        def _uk_is_bst(dt_utc_in: datetime) -> bool:
-            y = dt_utc_in.year
-            # Last Sunday of March
-            march_last = datetime(y, 3, 31, 1, 0, tzinfo=timezone.utc)
-            while march_last.weekday() != 6:
-                march_last -= timedelta(days=1)
-            # Last Sunday of October
-            oct_last = datetime(y, 10, 31, 1, 0, tzinfo=timezone.utc)
-            while oct_last.weekday() != 6:
-                oct_last -= timedelta(days=1)
-            return march_last <= dt_utc_in < oct_last
-
-        label = "unknown"
+        epoch_ms = max(0, (epoch_ms or 0))
         try:
-            from zoneinfo import ZoneInfo  # type: ignore
-            uk_tz = ZoneInfo("Europe/London")
-            dt_local = dt_utc.astimezone(uk_tz)
-            label = dt_local.strftime("%d %B %Y at %H:%M %Z")
+            label = _format_uk_time_label(epoch_ms // 60000)
         except Exception:
-            is_bst = _uk_is_bst(dt_utc)
-            dt_local = dt_utc + (timedelta(hours=1) if is_bst else timedelta(0))
-            tz_abbr = "BST" if is_bst else "GMT"
-            label = dt_local.strftime(f"%d %B %Y at %H:%M {tz_abbr}")
-
-        now_utc = datetime.now(timezone.utc)
-        delta = dt_utc - now_utc
-        total_seconds = max(0, int(delta.total_seconds()))
+            label = "unknown"
+
+        now_ms = time.time() * 1000.0
+        total_seconds = max(0, int((epoch_ms - now_ms) / 1000.0))
         hours_until = (total_seconds + 3599) // 3600
         days_until = total_seconds // 86400
         return (label, days_until, hours_until)
@@ -1149,7 +2346,7 @@ def _format_start_time_uk(epoch_ms: int) -> tuple[str, int, int]:
 
 
 def start_system_tray(block: bool = False):
-	if pystray is None:
+	if not _load_tray_modules():
 		logging.info("pystray/Pillow not available; tray icon disabled.")
 		return None
 
@@ -1158,13 +2355,13 @@ def start_system_tray(block: bool = False):
 			with CONFIG_LOCK:
 				PREFERENCES["headless"] = not bool(PREFERENCES.get("headless", DEFAULT_HEADLESS))
 				new_val = PREFERENCES["headless"]
-			threading.Thread(target=lambda: save_preferences(PREFERENCES), daemon=True).start()
+			TRAY_EXECUTOR.submit(save_preferences, PREFERENCES)
 			logging.info(f"Tray: headless set to {new_val}. Restarting to apply…")
 			try:
 				icon.update_menu()
 			except Exception as menu_err:
 				logging.debug(f"Menu update failed: {menu_err}")
-			threading.Thread(target=lambda: (send_notification("Twitch Drops", "Applying headless change…"), restart_program()), daemon=True).start()
+			TRAY_EXECUTOR.submit(lambda: (send_notification("Twitch Drops", "Applying headless change…", wait=True), restart_program()))
 		except Exception as e:
 			logging.warning(f"Tray toggle failed: {e}")
 
@@ -1180,13 +2377,13 @@ def start_system_tray(block: bool = False):
 			with CONFIG_LOCK:
 				PREFERENCES["hide_console"] = not bool(PREFERENCES.get("hide_console", True))
 				new_val = PREFERENCES["hide_console"]
-			threading.Thread(target=lambda: save_preferences(PREFERENCES), daemon=True).start()
+			TRAY_EXECUTOR.submit(save_preferences, PREFERENCES)
 			logging.info(f"Tray: hide_console set to {new_val}. Restarting to apply…")
 			try:
 				icon.update_menu()
 			except Exception:
 				pass
-			threading.Thread(target=lambda: (send_notification("Twitch Drops", "Applying console visibility change…"), restart_program()), daemon=True).start()
+			TRAY_EXECUTOR.submit(lambda: (send_notification("Twitch Drops", "Applying console visibility change…", wait=True), restart_program()))
 		except Exception as e:
 			logging.warning(f"Tray toggle failed: {e}")
 
@@ -1198,19 +2395,19 @@ def start_system_tray(block: bool = False):
 			return True
 
 	def on_quit(icon, item):
-		# Send toast in background to avoid blocking tray thread
+		# Queued for the notification worker, so the tray thread isn't blocked
 		try:
-			threading.Thread(target=lambda: send_notification("Twitch Drops", "Exiting…"), daemon=True).start()
+			send_notification("Twitch Drops", "Exiting…")
 		except Exception:
 			pass
-		EXIT_EVENT.set()
+		request_exit()
 		# Stop icon from a different thread to avoid potential deadlock
 		try:
-			threading.Thread(target=icon.stop, daemon=True).start()
+			TRAY_EXECUTOR.submit(icon.stop)
 		except Exception:
 			pass
 		# Fallback: force terminate if graceful exit hangs
-		threading.Timer(5.0, lambda: os._exit(0)).start()
+		_schedule_forced_exit(5.0)
 
 	image = _generate_tray_icon_image()
 	menu = pystray.Menu(
@@ -1292,6 +2489,7 @@ def create_web_app():
 				'enable_web_interface': PREFERENCES.get('enable_web_interface', True) if PREFERENCES else True,
 				'integrity_auto_renew': PREFERENCES.get('integrity_auto_renew', True) if PREFERENCES else True,
 				'integrity_ttl_hours': PREFERENCES.get('integrity_ttl_hours', 6) if PREFERENCES else 6,
+				'screenshot_quality': get_screenshot_quality(),
 			})
 		elif request.method == 'POST':
 			try:
@@ -1311,6 +2509,8 @@ def create_web_app():
 						PREFERENCES['integrity_auto_renew'] = bool(data['integrity_auto_renew'])
 					if 'integrity_ttl_hours' in data:
 						PREFERENCES['integrity_ttl_hours'] = int(data['integrity_ttl_hours'])
+					if 'screenshot_quality' in data:
+						PREFERENCES['screenshot_quality'] = max(1, min(100, int(data['screenshot_quality'])))
 					
 					# Save preferences
 					save_preferences(PREFERENCES)
@@ -1333,7 +2533,6 @@ def create_web_app():
 	@app.route('/api/integrity/renew', methods=['POST'])
 	def api_integrity_renew():
 		try:
-			from playwright.async_api import async_playwright
 			async def _renew():
 				async with async_playwright() as p:
 					captured = await fetch_integrity_headers_with_headed(p)
@@ -1352,9 +2551,11 @@ def create_web_app():
 	def api_drops():
 		"""Get all drops data from cache."""
 		try:
-			with drops_data_lock:
-				logging.info(f"API request for drops data: {len(cached_drops_data.get('in_progress', []))} in progress, {len(cached_drops_data.get('not_started', []))} not started, {len(cached_drops_data.get('completed', []))} completed")
-				return jsonify(cached_drops_data)
+			body, etag = get_cached_drops_response()
+			logging.debug(f"API request for drops data (etag {etag})")
+			if etag in request.if_none_match:
+				return Response(status=304, headers={'ETag': f'"{etag}"'})
+			return Response(body, mimetype='application/json', headers={'ETag': f'"{etag}"'})
 		except Exception as e:
 			logging.error(f"Error fetching drops data: {e}")
 			return jsonify({'error': str(e)}), 500
@@ -1378,13 +2579,10 @@ def create_web_app():
 		except ValueError as exc:
 			return jsonify({'success': False, 'message': str(exc)}), 400
 		try:
-			async def _refresh():
-				return await fetch_game_streamers_public(game_url, limit=100)
-			loop = asyncio.new_event_loop()
-			try:
-				streamers = loop.run_until_complete(_refresh())
-			finally:
-				loop.close()
+			streamers = run_dashboard_scrape(
+				lambda page: _extract_live_drops_streamers_from_game_page(page, game_url=game_url, limit=100, use_exit_guard=False),
+				lambda: fetch_game_streamers_public(game_url, limit=100),
+			)
 			return jsonify({
 				"success": True,
 				"game_url": game_url,
@@ -1398,13 +2596,10 @@ def create_web_app():
 	def api_games_refresh():
 		"""Refresh drop-enabled games immediately."""
 		try:
-			async def _refresh():
-				return await fetch_drops_enabled_games_public(limit=160)
-			loop = asyncio.new_event_loop()
-			try:
-				games = loop.run_until_complete(_refresh())
-			finally:
-				loop.close()
+			games = run_dashboard_scrape(
+				lambda page: _extract_drop_games_from_directory_page(page, limit=160),
+				lambda: fetch_drops_enabled_games_public(limit=160),
+			)
 			update_cached_games_data(games=games, source="twitch_directory", error=None)
 			# Also ask the workflow loop to refresh with the signed-in context later.
 			GAMES_REFRESH_REQUESTED.set()
@@ -1482,31 +2677,8 @@ def create_web_app():
 	def api_restart():
 		"""API endpoint to restart the application"""
 		try:
-			import subprocess
-			import sys
-			import os
-			
-			# Get the current script path
-			script_path = os.path.abspath(__file__)
-			
-			# Get current arguments (preserve test mode, etc.)
-			args = [sys.executable, script_path]
-			if PREFERENCES.get('test_mode', False):
-				args.append('--test')
-			if not PREFERENCES.get('enable_web_interface', True):
-				args.append('--no-web')
-			if not PREFERENCES.get('show_tray', True):
-				args.append('--no-tray')
-			
-			# Start the new process
-			subprocess.Popen(args, cwd=os.path.dirname(script_path))
-			
-			# Give it a moment to start
-			import time
-			time.sleep(1)
-			
-			# Exit current process
-			os._exit(0)
+			# Let the response reach the browser before the process image is replaced
+			return restart_after_response(jsonify({'success': True, 'message': 'Restarting...'}), _current_run_args())
 			
 		except Exception as e:
 			return jsonify({'success': False, 'message': f'Error initiating restart: {str(e)}'}), 500
@@ -1515,8 +2687,6 @@ def create_web_app():
 	def api_check_updates():
 		"""API endpoint to check for updates"""
 		try:
-			import requests
-			
 			# Get current version from the script
 			current_version = get_current_version()
 			logging.info(f"Checking for updates. Current version: {current_version}")
@@ -1573,37 +2743,28 @@ def create_web_app():
 	def api_update():
 		"""API endpoint to perform the update"""
 		try:
-			import requests
-			import zipfile
-			import shutil
-			import tempfile
-			import threading
-			import time
-			
 			# Use the same approach as the installer - download from main branch archive
 			repo = "Davidbkr03/twitch-drops"
 			branch = "main"
 			download_url = f"https://github.com/{repo}/archive/refs/heads/{branch}.zip"
 			
 			logging.info(f"Downloading update from {download_url}")
-			download_response = requests.get(download_url, timeout=60)
-			
-			if download_response.status_code != 200:
-				return jsonify({'success': False, 'message': f'Failed to download update. Status: {download_response.status_code}'}), 500
-			
-			# Create temporary directory for extraction
-			temp_dir = tempfile.mkdtemp()
+			# Stage the download next to the install so new items can be renamed into place
+			temp_dir = tempfile.mkdtemp(prefix=UPDATE_STAGING_PREFIX, dir=BASE_DIR)
 			try:
 				zip_path = os.path.join(temp_dir, 'update.zip')
 				
-				# Save zip file
-				with open(zip_path, 'wb') as f:
-					f.write(download_response.content)
+				# Stream the zip file straight to disk instead of buffering it in memory
+				with requests.get(download_url, stream=True, timeout=60, headers={'Accept-Encoding': 'identity'}) as download_response:
+					if download_response.status_code != 200:
+						return jsonify({'success': False, 'message': f'Failed to download update. Status: {download_response.status_code}'}), 500
+					download_response.raw.decode_content = True
+					with open(zip_path, 'wb') as f:
+						shutil.copyfileobj(download_response.raw, f, length=1 << 20)
 				
 				# Extract zip file
 				extract_dir = os.path.join(temp_dir, 'extracted')
-				with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-					zip_ref.extractall(extract_dir)
+				extract_update_archive(zip_path, extract_dir)
 				
 				# Find the extracted folder (usually has the repo name with branch suffix)
 				extracted_folders = [f for f in os.listdir(extract_dir) if os.path.isdir(os.path.join(extract_dir, f))]
@@ -1628,41 +2789,31 @@ def create_web_app():
 					'version.txt'
 				]
 				
-				for item in files_to_backup:
-					src = os.path.join(BASE_DIR, item)
-					if os.path.exists(src):
-						dst = os.path.join(backup_dir, item)
-						if os.path.isdir(src):
-							shutil.copytree(src, dst)
-						else:
-							shutil.copy2(src, dst)
-						logging.info(f"Backed up: {item}")
+				copy_update_items(
+					[
+						(item, os.path.join(BASE_DIR, item), os.path.join(backup_dir, item))
+						for item in files_to_backup
+						if os.path.exists(os.path.join(BASE_DIR, item))
+					],
+					"Backed up",
+					link_unchanged_from=source_dir,
+				)
 				
 				# Copy new files
+				new_items = []
 				for item in os.listdir(source_dir):
-					src = os.path.join(source_dir, item)
-					dst = os.path.join(BASE_DIR, item)
-					
 					# Skip user data and config files
 					if item in ['user_data_stealth', 'config.json', 'drops_log.txt', 'venv', '__pycache__', '.git']:
 						logging.info(f"Skipping: {item}")
 						continue
-					
-					if os.path.isdir(src):
-						if os.path.exists(dst):
-							shutil.rmtree(dst)
-						shutil.copytree(src, dst)
-					else:
-						shutil.copy2(src, dst)
-					
-					logging.info(f"Updated: {item}")
+					new_items.append((item, os.path.join(source_dir, item), os.path.join(BASE_DIR, item)))
+				swap_in_update_items(new_items, "Updated")
 				
 				# Install/update dependencies if requirements.txt was updated
 				requirements_path = os.path.join(BASE_DIR, 'requirements.txt')
 				if os.path.exists(requirements_path):
 					logging.info("Installing/updating dependencies...")
 					try:
-						import subprocess
 						venv_python = os.path.join(BASE_DIR, 'venv', 'Scripts', 'python.exe')
 						venv_pip = os.path.join(BASE_DIR, 'venv', 'Scripts', 'pip.exe')
 						
@@ -1670,18 +2821,11 @@ def create_web_app():
 						if os.path.exists(venv_python) and os.path.exists(venv_pip):
 							# Upgrade pip first
 							logging.info("Upgrading pip...")
-							subprocess.run([venv_python, '-m', 'pip', 'install', '--upgrade', 'pip'], 
-										  cwd=BASE_DIR, timeout=60, check=True)
-							
-							# Install/update requirements
-							logging.info("Installing requirements...")
-							subprocess.run([venv_pip, 'install', '-r', requirements_path], 
-										  cwd=BASE_DIR, timeout=300, check=True)
+							subprocess.run([venv_python, '-m', 'pip', 'install', *PIP_INSTALL_FLAGS, '--upgrade', 'pip'], 
+										  cwd=BASE_DIR, timeout=60, check=True, env=_pip_environment())
 							
-							# Install Playwright browsers if needed
-							logging.info("Installing Playwright browsers...")
-							subprocess.run([venv_python, '-m', 'playwright', 'install'], 
-										  cwd=BASE_DIR, timeout=300, check=True)
+							# Install/update requirements and Playwright browsers (side by side when pip keeps Playwright)
+							install_requirements_and_browsers(venv_python, venv_pip, requirements_path)
 							
 							logging.info("Dependencies updated successfully")
 						else:
@@ -1703,43 +2847,12 @@ def create_web_app():
 				except Exception as e:
 					logging.warning(f"Failed to clean up temporary directory: {e}")
 			
-			# Return success first, then restart properly like settings do
-			# This ensures the HTTP response is sent before restarting
-			def delayed_restart():
-				time.sleep(2)  # Give time for HTTP response to be sent
-				logging.info("Restarting application after update...")
-				try:
-					import subprocess
-					import sys
-					
-					# Get the current script path
-					script_path = os.path.abspath(__file__)
-					
-					# Get current arguments (preserve test mode, etc.)
-					args = [sys.executable, script_path]
-					if PREFERENCES.get('test_mode', False):
-						args.append('--test')
-					if not PREFERENCES.get('enable_web_interface', True):
-						args.append('--no-web')
-					if not PREFERENCES.get('show_tray', True):
-						args.append('--no-tray')
-					
-					# Start the new process
-					subprocess.Popen(args, cwd=os.path.dirname(script_path))
-					
-					# Give it a moment to start
-					time.sleep(1)
-					
-					# Exit current process
-					os._exit(0)
-				except Exception as e:
-					logging.error(f"Failed to restart after update: {e}")
-					os._exit(1)
-			
-			restart_thread = threading.Thread(target=delayed_restart, daemon=True)
-			restart_thread.start()
-			
-			return jsonify({'success': True, 'message': 'Update completed successfully. Restarting...', 'restart': True})
+			# Return success first; the restart starts once the response has been sent
+			return restart_after_response(
+				jsonify({'success': True, 'message': 'Update completed successfully. Restarting...', 'restart': True}),
+				_current_run_args(),
+				"Restarting application after update...",
+			)
 			
 		except Exception as e:
 			logging.error(f"Update failed: {e}")
@@ -1784,6 +2897,120 @@ def start_web_server():
 	web_server_thread.start()
 	return web_server_thread
 
+def _select_screenshot_page():
+	"""Pick the page the dashboard preview should show: the tracked working page, else the best open tab."""
+	global current_working_page
+	if current_browser_context is None:
+		return None
+	# Get all pages from the context
+	pages = current_browser_context.pages
+	if not pages:
+		logging.debug("Screenshot capture skipped: no pages available")
+		return None
+	
+	# First, try to use the tracked working page if it's still valid
+	active_page = None
+	if current_working_page is not None and not current_working_page.is_closed():
+		try:
+			# Verify the page is still accessible
+			url = current_working_page.url
+			if url and url != 'about:blank':
+				active_page = current_working_page
+				logging.debug(f"Using tracked working page: {url}")
+		except Exception:
+			# Page is no longer valid, reset it
+			current_working_page = None
+	
+	# If no tracked page, reuse the previous scan result while it is still open
+	if active_page is None:
+		cached = _SCREENSHOT_PAGE_CACHE["page"]
+		if _SCREENSHOT_PAGE_CACHE["context"] is current_browser_context and cached is not None and not cached.is_closed():
+			return cached
+	
+	# Otherwise find the best available page
+	if active_page is None:
+		best_page = None
+		
+		for page in pages:
+			if not page.is_closed():
+				try:
+					url = page.url
+					if url and url != 'about:blank':
+						# Prefer pages that are likely to be the main working page
+						# Priority: Twitch streams > Facepunch > other pages
+						if 'twitch.tv' in url and ('/streams/' in url or '/videos/' in url):
+							active_page = page
+							break  # This is definitely the active stream page
+						elif 'facepunch.com' in url:
+							best_page = page  # Good fallback
+						elif best_page is None:
+							best_page = page  # Any valid page as last resort
+				except Exception:
+					continue
+		
+		# Use the best page we found
+		if active_page is None:
+			active_page = best_page
+		
+		# If still no page found, use the first available page
+		if active_page is None and pages:
+			active_page = pages[0]
+			if active_page.is_closed():
+				logging.debug("Screenshot capture skipped: all pages are closed")
+				return None
+		
+		_cache_screenshot_page(active_page)
+	
+	return active_page
+
+async def _get_screenshot_cdp_session(page):
+	"""CDP session used for fallback screenshots of `page`, opened once and dropped when the page closes."""
+	session = _SCREENSHOT_CDP_SESSIONS.get(page)
+	if session is None:
+		session = await page.context.new_cdp_session(page)
+		_SCREENSHOT_CDP_SESSIONS[page] = session
+		try:
+			page.once("close", lambda *_: _SCREENSHOT_CDP_SESSIONS.pop(page, None))
+		except Exception:
+			pass
+	return session
+
+def _invalidate_screenshot_page(*_args):
+	_SCREENSHOT_PAGE_CACHE["page"] = None
+
+def _invalidate_screenshot_page_on_navigation(frame):
+	# A tab that opened on about:blank only becomes a preview candidate once it navigates
+	if frame.parent_frame is None:
+		_invalidate_screenshot_page()
+
+def _watch_screenshot_page(page):
+	try:
+		page.on("framenavigated", _invalidate_screenshot_page_on_navigation)
+	except Exception:
+		pass
+
+def _on_screenshot_context_page(page):
+	_invalidate_screenshot_page()
+	_watch_screenshot_page(page)
+
+def _cache_screenshot_page(page):
+	"""Remember the scanned preview page, hooking the events that invalidate it."""
+	if _SCREENSHOT_PAGE_CACHE["context"] is not current_browser_context:
+		_SCREENSHOT_PAGE_CACHE["context"] = current_browser_context
+		try:
+			current_browser_context.on("page", _on_screenshot_context_page)
+			for open_page in current_browser_context.pages:
+				_watch_screenshot_page(open_page)
+		except Exception:
+			pass
+	if page is None or page is _SCREENSHOT_PAGE_CACHE["page"]:
+		return
+	_SCREENSHOT_PAGE_CACHE["page"] = page
+	try:
+		page.once("close", _invalidate_screenshot_page)
+	except Exception:
+		pass
+
 async def capture_screenshot_async():
 	"""Async version of screenshot capture for use in async context"""
 	global current_browser_context, current_working_page, socketio
@@ -1793,56 +3020,9 @@ async def capture_screenshot_async():
 		return False
 	
 	try:
-		# Get all pages from the context
-		pages = current_browser_context.pages
-		if not pages:
-			logging.debug("Screenshot capture skipped: no pages available")
-			return False
-		
-		# First, try to use the tracked working page if it's still valid
-		active_page = None
-		if current_working_page is not None and not current_working_page.is_closed():
-			try:
-				# Verify the page is still accessible
-				url = current_working_page.url
-				if url and url != 'about:blank':
-					active_page = current_working_page
-					logging.debug(f"Using tracked working page: {url}")
-			except Exception:
-				# Page is no longer valid, reset it
-				current_working_page = None
-		
-		# If no tracked page, find the best available page
+		active_page = _select_screenshot_page()
 		if active_page is None:
-			best_page = None
-			
-			for page in pages:
-				if not page.is_closed():
-					try:
-						url = page.url
-						if url and url != 'about:blank':
-							# Prefer pages that are likely to be the main working page
-							# Priority: Twitch streams > Facepunch > other pages
-							if 'twitch.tv' in url and ('/streams/' in url or '/videos/' in url):
-								active_page = page
-								break  # This is definitely the active stream page
-							elif 'facepunch.com' in url:
-								best_page = page  # Good fallback
-							elif best_page is None:
-								best_page = page  # Any valid page as last resort
-					except Exception:
-						continue
-			
-			# Use the best page we found
-			if active_page is None:
-				active_page = best_page
-			
-			# If still no page found, use the first available page
-			if active_page is None and pages:
-				active_page = pages[0]
-				if active_page.is_closed():
-					logging.debug("Screenshot capture skipped: all pages are closed")
-					return False
+			return False
 		
 		# Check if page is still valid
 		if active_page.is_closed():
@@ -1865,83 +3045,54 @@ async def capture_screenshot_async():
 		except Exception as e:
 			logging.debug(f"Page load wait failed: {e}")
 		
-		# Check if we're in headless mode
-		is_headless = get_headless_preference()
+		quality = get_screenshot_quality()
+		full_page = bool(PREFERENCES.get("screenshot_full_page", False)) if PREFERENCES else False
 		
-		# Take screenshot with different options based on mode and timeout handling
-		if is_headless:
-			# In headless mode, take a full page screenshot with timeout
-			try:
+		payload = {
+			'mime': 'image/jpeg',
+			'timestamp': datetime.now().isoformat(),
+			'url': current_url
+		}
+		try:
+			if full_page:
+				# Debug-only: full-page capture through Playwright's screenshot API
 				screenshot_bytes = await asyncio.wait_for(
-					active_page.screenshot(
-						type='png', 
-						full_page=True,  # Full page in headless
-						animations='disabled'  # Disable animations for cleaner screenshots
-					),
+					active_page.screenshot(type='jpeg', quality=quality, full_page=True, animations='disabled'),
 					timeout=10.0  # 10 second timeout
 				)
-			except asyncio.TimeoutError:
-				logging.debug("Screenshot timeout in headless mode")
-				return False
-		else:
-			# In non-headless mode, try to take viewport screenshot with timeout
-			try:
-				screenshot_bytes = await asyncio.wait_for(
-					active_page.screenshot(
-						type='png', 
-						full_page=False,  # Just the visible viewport
-						animations='disabled'
-					),
+				# Check if screenshot is mostly white/blank
+				if not screenshot_bytes or len(screenshot_bytes) < 500:  # Very small file might be blank
+					logging.debug("Screenshot appears to be blank (very small file)")
+					return False
+				# Raw JPEG goes out as a binary Socket.IO attachment
+				payload['frame'] = screenshot_bytes
+			else:
+				# Viewport capture over the page's persistent CDP session; CDP already returns base64
+				session = await _get_screenshot_cdp_session(active_page)
+				result = await asyncio.wait_for(
+					session.send("Page.captureScreenshot", {
+						"format": "jpeg",
+						"quality": quality,
+						"clip": {**get_screenshot_clip(active_page), "scale": 1},
+						"captureBeyondViewport": False,
+					}),
 					timeout=10.0  # 10 second timeout
 				)
-			except asyncio.TimeoutError:
-				logging.debug("Viewport screenshot timeout, trying full page")
-				try:
-					screenshot_bytes = await asyncio.wait_for(
-						active_page.screenshot(
-							type='png', 
-							full_page=True,
-							animations='disabled'
-						),
-						timeout=10.0  # 10 second timeout
-					)
-				except asyncio.TimeoutError:
-					logging.debug("Full page screenshot timeout")
+				data = (result or {}).get("data") or ""
+				if len(data) < 700:  # ~500 bytes of JPEG; very small frames are blank
+					logging.debug("Screenshot appears to be blank (very small file)")
 					return False
-			except Exception as e:
-				logging.debug(f"Viewport screenshot failed, trying full page: {e}")
-				# Fallback to full page if viewport fails
-				try:
-					screenshot_bytes = await asyncio.wait_for(
-						active_page.screenshot(
-							type='png', 
-							full_page=True,
-							animations='disabled'
-						),
-						timeout=10.0  # 10 second timeout
-					)
-				except asyncio.TimeoutError:
-					logging.debug("Fallback screenshot timeout")
-					return False
-		
-		if not screenshot_bytes:
-			logging.debug("Screenshot capture failed: no data returned")
-			return False
-		
-		# Check if screenshot is mostly white/blank
-		if len(screenshot_bytes) < 1000:  # Very small file might be blank
-			logging.debug("Screenshot appears to be blank (very small file)")
+				payload['image_b64'] = data
+		except asyncio.TimeoutError:
+			logging.debug("Screenshot timeout")
 			return False
+		except Exception:
+			# A detached session is reopened on the next frame
+			_SCREENSHOT_CDP_SESSIONS.pop(active_page, None)
+			raise
 		
-		# Convert to base64
-		screenshot_b64 = base64.b64encode(screenshot_bytes).decode('utf-8')
-		
-		# Send via WebSocket
-		socketio.emit('screenshot', {
-			'image': f'data:image/png;base64,{screenshot_b64}',
-			'timestamp': datetime.now().isoformat(),
-			'url': current_url
-		})
+		# Packet encoding and socket writes happen on the sender task, not this loop
+		publish_screenshot(payload)
 		
 		logging.debug("Screenshot captured and sent successfully")
 		return True
@@ -1950,6 +3101,54 @@ async def capture_screenshot_async():
 		logging.debug(f"Screenshot capture failed: {e}")
 		return False
 
+async def _start_page_screencast(page):
+	"""Stream compositor JPEG frames of `page` to web clients over a CDP session.
+
+	Frames arrive pre-encoded as base64, so they are forwarded without a Python-side encode.
+	Each frame's ack is held for SCREENSHOT_INTERVAL, which paces Chromium to one frame per
+	interval instead of encoding every repaint.
+	"""
+	session = await page.context.new_cdp_session(page)
+	loop = asyncio.get_running_loop()
+
+	async def _ack(session_id):
+		try:
+			await session.send("Page.screencastFrameAck", {"sessionId": session_id})
+		except Exception:
+			pass
+
+	def _on_frame(params):
+		data = params.get("data") or ""
+		# Very small frames are blank pages; skip them like the screenshot path does
+		if len(data) > 700:
+			try:
+				url = page.url
+			except Exception:
+				url = "unknown"
+			# The client builds the data URL, so the frame string is forwarded without a copy
+			payload = {
+				'image_b64': data,
+				'mime': 'image/jpeg',
+				'timestamp': datetime.now().isoformat(),
+				'url': url
+			}
+			publish_screenshot(payload)
+		loop.call_later(SCREENSHOT_INTERVAL, lambda: asyncio.ensure_future(_ack(params.get("sessionId"))))
+
+	session.on("Page.screencastFrame", _on_frame)
+	await session.send("Page.startScreencast", {**SCREENCAST_OPTIONS, "quality": get_screenshot_quality()})
+	return session
+
+async def _stop_page_screencast(session):
+	try:
+		await session.send("Page.stopScreencast")
+	except Exception:
+		pass
+	try:
+		await session.detach()
+	except Exception:
+		pass
+
 async def start_screenshot_capture_async(test_mode=False):
 	"""Start async screenshot capture task"""
 	global current_browser_context, socketio
@@ -1962,51 +3161,74 @@ async def start_screenshot_capture_async(test_mode=False):
 	screenshot_count = 0
 	consecutive_failures = 0
 	max_failures = 5
+	# Prefer a CDP screencast of the active page; periodic screenshots are the fallback
+	screencast = None
+	screencast_page = None
+	screencast_supported = True
 	
 	# In test mode, run indefinitely until Ctrl+C. In normal mode, respect EXIT_EVENT
-	while True:
-		if not test_mode and EXIT_EVENT.is_set():
-			break
-		
-		try:
-			success = await capture_screenshot_async()
-			if success:
-				screenshot_count += 1
-				consecutive_failures = 0
-				if screenshot_count % 10 == 0:  # Log every 10 screenshots
-					logging.info(f"Captured {screenshot_count} screenshots")
-			else:
-				consecutive_failures += 1
-				if consecutive_failures >= max_failures:
-					logging.warning(f"Screenshot capture failed {consecutive_failures} times in a row")
-					# Emit a special event to trigger page reload
-					if socketio:
-						socketio.emit('screenshot_failed', {
-							'message': 'Screenshot capture failed multiple times. Page may be frozen.',
-							'consecutive_failures': consecutive_failures
-						})
-					# Reset failure counter to avoid spam
-					consecutive_failures = 0
-		except Exception as e:
-			logging.debug(f"Screenshot error: {e}")
-			consecutive_failures += 1
-		
-		# In test mode, check for Ctrl+C more frequently
-		if test_mode:
-			try:
-				await asyncio.sleep(SCREENSHOT_INTERVAL)
-			except asyncio.CancelledError:
-				logging.info("Screenshot capture cancelled by user")
+	try:
+		while True:
+			if not test_mode and EXIT_EVENT.is_set():
 				break
-		else:
-			await asyncio.sleep(SCREENSHOT_INTERVAL)
+			
+			if screencast_supported:
+				# Follow the active page; frames are pushed by the screencast between checks
+				page = _select_screenshot_page()
+				if page is not screencast_page:
+					if screencast is not None:
+						await _stop_page_screencast(screencast)
+					screencast, screencast_page = None, None
+					if page is not None:
+						try:
+							screencast = await _start_page_screencast(page)
+							screencast_page = page
+						except Exception as e:
+							logging.info(f"Screencast unavailable ({e}); falling back to periodic screenshots.")
+							screencast_supported = False
+			
+			if not screencast_supported:
+				try:
+					success = await capture_screenshot_async()
+					if success:
+						screenshot_count += 1
+						consecutive_failures = 0
+						if screenshot_count % 10 == 0:  # Log every 10 screenshots
+							logging.info(f"Captured {screenshot_count} screenshots")
+					else:
+						consecutive_failures += 1
+						if consecutive_failures >= max_failures:
+							logging.warning(f"Screenshot capture failed {consecutive_failures} times in a row")
+							# Emit a special event to trigger page reload
+							if socketio:
+								socketio.emit('screenshot_failed', {
+									'message': 'Screenshot capture failed multiple times. Page may be frozen.',
+									'consecutive_failures': consecutive_failures
+								})
+							# Reset failure counter to avoid spam
+							consecutive_failures = 0
+				except Exception as e:
+					logging.debug(f"Screenshot error: {e}")
+					consecutive_failures += 1
+			
+			# In test mode, check for Ctrl+C more frequently
+			if test_mode:
+				try:
+					await asyncio.sleep(SCREENSHOT_INTERVAL)
+				except asyncio.CancelledError:
+					logging.info("Screenshot capture cancelled by user")
+					break
+			elif await sleep_or_exit(SCREENSHOT_INTERVAL):
+				break
+	finally:
+		if screencast is not None:
+			await _stop_page_screencast(screencast)
 	
 	logging.info("Async screenshot capture stopped")
 
 def open_web_interface():
 	"""Open the web interface in the default browser"""
 	try:
-		import webbrowser
 		webbrowser.open(f'http://{WEB_HOST}:{WEB_PORT}')
 		logging.info(f"Opened web interface: http://{WEB_HOST}:{WEB_PORT}")
 	except Exception as e:
@@ -2040,16 +3262,23 @@ logging.info(f"User data dir: {USER_DATA_DIR}")
 # Initialize preferences once logging is configured
 PREFERENCES = load_preferences()
 
+# Resolved once; SIGBREAK only exists on Windows
+_EXIT_SIGNALS = tuple(
+	sig for sig in (getattr(signal, name, None) for name in ("SIGINT", "SIGTERM", "SIGBREAK"))
+	if sig is not None
+)
+
 def _install_signal_handlers():
-	def _handler(signum, frame):
-		EXIT_EVENT.set()
-	for sig_name in ("SIGINT", "SIGTERM", "SIGBREAK"):
-		sig = getattr(signal, sig_name, None)
-		if sig is not None:
-			try:
-				signal.signal(sig, _handler)
-			except Exception:
-				pass
+	def _handler(signum, frame):
+		request_exit()
+	# signal.signal only works from the main thread; skip instead of raising per signal
+	if threading.current_thread() is not threading.main_thread():
+		return
+	for sig in _EXIT_SIGNALS:
+		try:
+			signal.signal(sig, _handler)
+		except Exception:
+			pass
 
 async def apply_stealth_to_context(context, profile: str):
 	if profile == "off":
@@ -2075,8 +3304,29 @@ async def apply_additional_stealth(context):
 	except Exception:
 		pass
 
+async def seed_low_quality_playback(context):
+	"""Pre-set the Twitch player's persisted quality so streams start at the lowest rendition.
+
+	Runs before Twitch's scripts on every page of the context, including stream popups, so the
+	player reads it on mount; set_low_quality only falls back to the settings menu without it.
+	"""
+	try:
+		await context.add_init_script(script=_SEED_LOW_QUALITY_JS)
+	except Exception as e:
+		logging.debug(f"Could not seed low playback quality: {e}")
+
 async def maybe_accept_cookies(page):
+	# Consent persists in the profile, so once a context has it every later banner check is moot
+	try:
+		context = page.context
+		if context in _COOKIE_CONSENT_CONTEXTS:
+			return
+	except Exception:
+		context = None
 	try:
+		if context is not None and await _has_cookie_consent(context):
+			_COOKIE_CONSENT_CONTEXTS.add(context)
+			return
 		btn = await page.query_selector('#onetrust-accept-btn-handler')
 		if btn:
 			await click_ui_element(
@@ -2087,9 +3337,19 @@ async def maybe_accept_cookies(page):
 				wait_after_click=0.5
 			)
 			logging.info("Accepted OneTrust cookies banner")
+			if context is not None:
+				_COOKIE_CONSENT_CONTEXTS.add(context)
 	except Exception:
 		pass
 
+async def _has_cookie_consent(context) -> bool:
+	"""True when the profile already holds OneTrust's banner-dismissed cookie for Twitch."""
+	try:
+		cookies = await context.cookies("https://www.twitch.tv")
+	except Exception:
+		return False
+	return any(c.get("name") == "OptanonAlertBoxClosed" for c in cookies or [])
+
 
 def _cleanup_stale_browser_profile_locks(user_data_dir: str) -> list[str]:
 	"""Best-effort cleanup of Chrome profile locks left by an unclean exit.
@@ -2120,6 +3380,8 @@ def _cleanup_stale_browser_profile_locks(user_data_dir: str) -> list[str]:
 
 async def launch_context(p, compat_mode: bool):
 	headless_pref = get_headless_preference()
+	# slow_mo only helps when someone is watching the window; headless polling just pays the delay
+	slow_mo = 0 if headless_pref else INTERACTIVE_SLOW_MO_MS
 	_cleanup_stale_browser_profile_locks(USER_DATA_DIR)
     # Integrity capture removed per user request
 	args = [
@@ -2165,9 +3427,8 @@ async def launch_context(p, compat_mode: bool):
 			ua_saved = PREFERENCES.get("forced_user_agent")
 	except Exception:
 		ua_saved = None
-	# In headless, enable GPU/WebGL related features and remove conflicting disables
+	# In headless, enable GPU/WebGL related features (the base args never disable the GPU compositor)
 	if headless_pref:
-		args = [a for a in args if a not in ("--disable-gpu-sandbox", "--disable-features=VizDisplayCompositor")]
 		args.extend([
 			"--enable-webgl",
 			"--ignore-gpu-blocklist",
@@ -2201,7 +3462,7 @@ async def launch_context(p, compat_mode: bool):
 			USER_DATA_DIR,
 			headless=headless_pref,
 			executable_path=chrome_exec,
-			slow_mo=50,
+			slow_mo=slow_mo,
 			ignore_default_args=ignore_default_args,
 			args=args,
 			user_agent=(FORCE_USER_AGENT or ua_saved) if (FORCE_USER_AGENT or ua_saved) else None,
@@ -2215,7 +3476,7 @@ async def launch_context(p, compat_mode: bool):
 				USER_DATA_DIR,
 				headless=headless_pref,
 				channel=BROWSER_CHANNEL,
-				slow_mo=50,
+				slow_mo=slow_mo,
 				ignore_default_args=ignore_default_args,
 				args=args,
 				user_agent=(FORCE_USER_AGENT or ua_saved) if (FORCE_USER_AGENT or ua_saved) else None,
@@ -2227,7 +3488,7 @@ async def launch_context(p, compat_mode: bool):
 			context = await p.chromium.launch_persistent_context(
 				USER_DATA_DIR,
 				headless=headless_pref,
-				slow_mo=50,
+				slow_mo=slow_mo,
 				ignore_default_args=ignore_default_args,
 				args=args,
 				user_agent=(FORCE_USER_AGENT or ua_saved) if (FORCE_USER_AGENT or ua_saved) else None,
@@ -2235,11 +3496,13 @@ async def launch_context(p, compat_mode: bool):
 				locale="en-US",
 			)
 
+	track_context_close(context)
 	await apply_stealth_to_context(context, profile=("off" if compat_mode else STEALTH_PROFILE))
 	try:
 		await apply_additional_stealth(context)
 	except Exception:
 		pass
+	await seed_low_quality_playback(context)
     # Integrity header application disabled per user request
 
 	page = await context.new_page()
@@ -2252,17 +3515,26 @@ async def launch_context(p, compat_mode: bool):
 	logging.info(f"Browser launched. Mode: {'COMPAT' if compat_mode else 'NORMAL'}")
 
 	try:
-		ua = await page.evaluate("navigator.userAgent")
-		webdriver = await page.evaluate("'webdriver' in navigator ? navigator.webdriver : undefined")
-		langs = await page.evaluate("navigator.languages")
-		logging.info(f"UA: {ua}")
-		logging.info(f"navigator.webdriver: {webdriver}")
-		logging.info(f"navigator.languages: {langs}")
+		info = await page.evaluate(
+			"() => ({ua: navigator.userAgent, webdriver: 'webdriver' in navigator ? navigator.webdriver : undefined, langs: navigator.languages})"
+		)
+		logging.info(f"UA: {info.get('ua')}")
+		logging.info(f"navigator.webdriver: {info.get('webdriver')}")
+		logging.info(f"navigator.languages: {info.get('langs')}")
 	except Exception:
 		pass
 
 	return context, page
 
+async def _has_twitch_auth_cookie(context) -> bool:
+	"""True when the browser profile holds a Twitch auth-token cookie (login completed in any tab)."""
+	try:
+		cookies = await context.cookies("https://www.twitch.tv")
+	except Exception:
+		# Can't tell; let the caller fall back to navigating
+		return True
+	return any(c.get("name") == "auth-token" and c.get("value") for c in cookies or [])
+
 async def wait_until_logged_in(context, page) -> None:
 	"""Keep the app open and poll Twitch inventory until the user is logged in (avatar present).
 
@@ -2279,25 +3551,37 @@ async def wait_until_logged_in(context, page) -> None:
 		# Open a separate tab for polling login status
 		try:
 			poll_page = await context.new_page()
+			await block_heavy_resources(poll_page)
 		except Exception:
 			poll_page = None
+		# Only re-navigate when the auth cookie shows up (login finished in another tab) or the
+		# fallback interval elapses; in between, polling is a cheap cookie lookup.
+		last_load = None
 		while not EXIT_EVENT.is_set():
 			try:
 				if poll_page is None:
 					poll_page = await context.new_page()
-				await goto_with_exit(poll_page, TWITCH_INVENTORY_URL, timeout=120000, wait_until="domcontentloaded")
-				await maybe_accept_cookies(poll_page)
-				await poll_page.wait_for_timeout(500)
-				avatar = await poll_page.query_selector('img[alt="User Avatar"]')
-				if avatar:
-					logging.info("Detected user avatar; login complete.")
-					set_login_status("logged_in", True, "Logged in to Twitch", {"url": poll_page.url})
-					return
-				logging.info("Not logged in yet; still waiting…")
-				set_login_status("awaiting_login", False, "Not logged in yet", {"url": poll_page.url})
+				due = last_load is None or (time.monotonic() - last_load) >= LOGIN_RELOAD_INTERVAL_SECONDS
+				if due or await _has_twitch_auth_cookie(context):
+					await goto_with_exit(poll_page, TWITCH_INVENTORY_URL, timeout=120000, wait_until="commit")
+					last_load = time.monotonic()
+					try:
+						await wait_with_exit(asyncio.create_task(
+							poll_page.wait_for_selector('img[alt="User Avatar"]', timeout=15000)
+						))
+						logging.info("Detected user avatar; login complete.")
+						set_login_status("logged_in", True, "Logged in to Twitch", {"url": poll_page.url})
+						return
+					except asyncio.CancelledError:
+						raise
+					except Exception:
+						pass
+					await maybe_accept_cookies(poll_page)
+					logging.info("Not logged in yet; still waiting…")
+					set_login_status("awaiting_login", False, "Not logged in yet", {"url": poll_page.url})
 			except Exception:
 				pass
-			await asyncio.sleep(5)
+			await sleep_or_exit(5)
 	finally:
 		try:
 			if poll_page:
@@ -2367,16 +3651,17 @@ async def run_flow(p):
 					'[aria-label*="avatar"]',
 					'[alt*="avatar"]'
 				]
+				# One selector group: a single wait resolves on whichever avatar renders first,
+				# instead of up to one timeout per selector
+				avatar_selector_group = ', '.join(avatar_selectors)
 				
 				avatar_found = False
-				for selector in avatar_selectors:
-					try:
-						await wait_with_exit(asyncio.create_task(page.wait_for_selector(selector, timeout=10000)))
-						logging.info(f"User appears to be logged in (found selector: {selector}).")
-						avatar_found = True
-						break
-					except Exception:
-						continue
+				try:
+					await wait_with_exit(asyncio.create_task(page.wait_for_selector(avatar_selector_group, timeout=10000)))
+					logging.info("User appears to be logged in (found user avatar).")
+					avatar_found = True
+				except Exception:
+					pass
 				
 				if avatar_found:
 					success = True
@@ -2392,14 +3677,12 @@ async def run_flow(p):
 				await wait_until_logged_in(context, page)
 				# After wait, verify again with multiple selectors
 				avatar_found = False
-				for selector in avatar_selectors:
-					try:
-						await page.wait_for_selector(selector, timeout=5000)
-						logging.info(f"Login detected after waiting (found selector: {selector}).")
-						avatar_found = True
-						break
-					except Exception:
-						continue
+				try:
+					await page.wait_for_selector(avatar_selector_group, timeout=5000)
+					logging.info("Login detected after waiting (found user avatar).")
+					avatar_found = True
+				except Exception:
+					pass
 				
 				if avatar_found:
 					success = True
@@ -2416,7 +3699,7 @@ async def run_flow(p):
 					if context:
 						await context.close()
 				finally:
-					await asyncio.sleep(5)
+					await sleep_or_exit(5)
 				continue
 			else:
 				logging.error(f"Flow failed: {e}")
@@ -2435,192 +3718,169 @@ def _safe_int(val):
 	except Exception:
 		return None
 
-async def fetch_facepunch_drops(context):
+async def block_heavy_resources(page):
+	"""Abort image/media/font requests on a scrape-only page; we only read DOM text and attributes."""
+	async def _route(route):
+		try:
+			if route.request.resource_type in SCRAPE_BLOCKED_RESOURCE_TYPES:
+				await route.abort()
+			else:
+				await route.continue_()
+		except Exception:
+			pass
+	try:
+		await page.route("**/*", _route)
+	except Exception as e:
+		logging.debug(f"Could not install resource blocking: {e}")
+
+async def install_scrapers(page):
+	"""Register the _SCRAPERS bundle on page for this and every later document it loads."""
+	try:
+		await page.add_init_script(script=_SCRAPER_BUNDLE_JS)
+	except Exception as e:
+		logging.debug(f"Could not install page scrapers: {e}")
+
+async def evaluate_scraper(page, name: str, arg=None):
+	"""Run a named scraper, via the copy installed by install_scrapers when the page has one."""
+	result = await page.evaluate(
+		"([name, arg]) => { const s = window.__tdaScrapers; return s && s[name] ? {hit: true, value: s[name](arg)} : {hit: false}; }",
+		[name, arg],
+	)
+	if result and result.get("hit"):
+		return result.get("value")
+	return await page.evaluate(_SCRAPERS[name], arg)
+
+async def get_facepunch_page(context):
+	"""Return a reusable Facepunch polling page for this context, creating it on first use."""
+	global FACEPUNCH_PAGE
+	page = FACEPUNCH_PAGE
+	try:
+		if page is not None and page.context is context and not page.is_closed():
+			return page
+	except Exception:
+		pass
 	page = await context.new_page()
+	await block_heavy_resources(page)
+	await install_scrapers(page)
+	# Cache-busting headers for every Facepunch load on this tab
 	try:
-		# Add cache-busting headers specifically for Facepunch
 		await page.set_extra_http_headers({
 			'Cache-Control': 'no-cache, no-store, must-revalidate',
 			'Pragma': 'no-cache',
 			'Expires': '0'
 		})
-		
-		# Add timestamp to URL to prevent caching
-		import time
-		cache_bust_url = f"{FACEPUNCH_DROPS_URL}?t={int(time.time() * 1000)}"
+	except Exception:
+		pass
+	FACEPUNCH_PAGE = page
+	return page
+
+def _get_facepunch_fetch_lock() -> asyncio.Lock:
+	"""Return the single-flight lock for Facepunch fetches on the running loop."""
+	global _FACEPUNCH_FETCH_LOCK, _FACEPUNCH_FETCH_LOCK_LOOP
+	loop = asyncio.get_running_loop()
+	if _FACEPUNCH_FETCH_LOCK is None or _FACEPUNCH_FETCH_LOCK_LOOP is not loop:
+		_FACEPUNCH_FETCH_LOCK = asyncio.Lock()
+		_FACEPUNCH_FETCH_LOCK_LOOP = loop
+	return _FACEPUNCH_FETCH_LOCK
+
+def _cached_facepunch_drops(context, max_age: float):
+	cached = _FACEPUNCH_CACHE
+	if cached is not None and cached[0] is context and time.monotonic() - cached[1] < max_age:
+		return cached[2]
+	return None
+
+async def fetch_facepunch_drops(context, max_age: float = FACEPUNCH_CACHE_SECONDS):
+	"""Return Facepunch drops, reusing a scrape younger than max_age seconds.
+
+	Concurrent callers share one in-flight fetch; failed fetches are not cached.
+	"""
+	global _FACEPUNCH_CACHE
+	cached = _cached_facepunch_drops(context, max_age)
+	if cached is not None:
+		return cached
+	async with _get_facepunch_fetch_lock():
+		# Another caller may have refreshed it while we waited
+		cached = _cached_facepunch_drops(context, max_age)
+		if cached is not None:
+			return cached
+		result = await _fetch_facepunch_drops_uncached(context)
+		if not result.get("fetch_failed"):
+			_FACEPUNCH_CACHE = (context, time.monotonic(), result)
+		return result
+
+async def _fetch_facepunch_drops_uncached(context):
+	page = await get_facepunch_page(context)
+	try:
+		# Timestamp query (ahead of the #drops fragment) so every fetch is a real document load
+		base_url, _, fragment = FACEPUNCH_DROPS_URL.partition('#')
+		cache_bust_url = f"{base_url}?t={int(time.time() * 1000)}" + (f"#{fragment}" if fragment else "")
 		
 		await goto_with_exit(page, cache_bust_url, timeout=120000, wait_until="domcontentloaded")
 		
-		# Clear Facepunch-specific cache storage
-		try:
-			await page.evaluate("""
-				// Clear only Facepunch-related cache
-				if (caches && caches.keys) {
-					caches.keys().then(keys => {
-						keys.forEach(key => {
-							if (key.includes('facepunch') || key.includes('twitch.facepunch')) {
-								caches.delete(key);
-							}
-						});
-					});
-				}
-			""")
-		except Exception:
-			pass
-		try:
-			await page.reload(ignore_http_errors=True, timeout=120000)
-			await page.wait_for_load_state("domcontentloaded")
-		except Exception:
-			# Fallback: navigate again if reload fails
-			await goto_with_exit(page, FACEPUNCH_DROPS_URL, timeout=120000, wait_until="domcontentloaded")
-		await asyncio.sleep(1)
+		# One navigation per poll: the tab's no-store headers skip the HTTP cache and the unique query misses
+		# any URL-keyed cached copy (and stops a reused tab treating it as a same-document hash jump)
 		# Detect campaign not-started state and event start time
 		not_started = False
 		start_epoch_ms = None
 		try:
-			not_started = await page.evaluate(
-				r"""
-				() => !!document.querySelector('.campaign.not-started, .drops.not-started, .streamer-drops.not-started')
-				"""
-			)
-			start_epoch_ms = await page.evaluate(
+			# One round-trip for both campaign-state probes
+			state = await page.evaluate(
 				r"""
 				() => {
-				  const scripts = Array.from(document.querySelectorAll('script'));
-				  for (const s of scripts) {
-				    const txt = s.textContent || '';
-				    let m = txt.match(/setupCountdown\([^,]*,[^,]*,\s*(\d{10,})\s*\)/);
-				    if (m) return parseInt(m[1], 10);
-				    m = txt.match(/new\s+Date\(\s*(\d{10,})\s*\)/);
-				    if (m) return parseInt(m[1], 10);
-				  }
-				  const dateEl = document.querySelector('.event-date .date[data-date-id]');
-				  if (dateEl) {
-				    const id = dateEl.getAttribute('data-date-id') || '';
-				    const seg = id.split('-').pop();
-				    if (seg && /\d+/.test(seg)) {
-				      const n = parseInt(seg, 10);
-				      return n < 2e12 ? n * 1000 : n;
+				  const notStarted = !!document.querySelector('.campaign.not-started, .drops.not-started, .streamer-drops.not-started');
+				  const startEpochMs = (() => {
+				    const scripts = Array.from(document.querySelectorAll('script'));
+				    for (const s of scripts) {
+				      const txt = s.textContent || '';
+				      let m = txt.match(/setupCountdown\([^,]*,[^,]*,\s*(\d{10,})\s*\)/);
+				      if (m) return parseInt(m[1], 10);
+				      m = txt.match(/new\s+Date\(\s*(\d{10,})\s*\)/);
+				      if (m) return parseInt(m[1], 10);
 				    }
-				  }
-				  return null;
+				    const dateEl = document.querySelector('.event-date .date[data-date-id]');
+				    if (dateEl) {
+				      const id = dateEl.getAttribute('data-date-id') || '';
+				      const seg = id.split('-').pop();
+				      if (seg && /\d+/.test(seg)) {
+				        const n = parseInt(seg, 10);
+				        return n < 2e12 ? n * 1000 : n;
+				      }
+				    }
+				    return null;
+				  })();
+				  return { notStarted, startEpochMs };
 				}
 				"""
-			)
+			) or {}
+			not_started = bool(state.get('notStarted'))
+			start_epoch_ms = state.get('startEpochMs')
 		except Exception:
 			pass
 		# Prefer DOM parsing for streamer drops
 		streamer_specific = []
 		try:
 			await page.wait_for_selector('.streamer-drops .drop-box', timeout=5000)
-			boxes = await page.query_selector_all('.streamer-drops .drop-box')
-			for box in boxes:
+			rows = await evaluate_scraper(page, "facepunchStreamerDrops")
+			for row in rows or []:
 				try:
-					online_node = await box.query_selector('.online-status, div.online-status')
-					is_live = bool(online_node)
-					streamer_el = await box.query_selector('.streamer-name')
-					streamer = (await streamer_el.inner_text()).strip() if streamer_el else None
-					url_el = await box.query_selector('.drop-box-header a.streamer-info')
-					twitch_url = await url_el.get_attribute('href') if url_el else None
-					item_el = await box.query_selector('.drop-box-footer .drop-type')
-					item = (await item_el.inner_text()).strip() if item_el else None
-					hours_el = await box.query_selector('.drop-box-footer .drop-time span')
-					hours_text = (await hours_el.inner_text()).strip() if hours_el else ''
-					hours_m = re.search(r'(\d+)', hours_text)
+					streamer = row.get('streamer')
+					item = row.get('item')
+					if not (streamer and item):
+						continue
+					hours_m = _HOURS_RE.search(row.get('hoursText') or '')
 					hours = _safe_int(hours_m.group(1)) if hours_m else None
-					if streamer and item:
-						# Try to get item video/image and streamer profile picture
-						video_url = None
-						streamer_avatar = None
-						try:
-							# Try multiple selectors for item media
-							media_selectors = [
-								'.drop-box-body video',
-								'.drop-box video', 
-								'video',
-								'.drop-box-body img[src*="item"]',
-								'.drop-box-body img[src*="drop"]',
-								'.drop-box img[src*="item"]',
-								'.drop-box img[src*="drop"]',
-								'.drop-box-body img',
-								'.drop-box img',
-								'img'
-							]
-							
-							for selector in media_selectors:
-								media_el = await box.query_selector(selector)
-								if media_el:
-									# Check if it's a video element
-									tag_name = await media_el.evaluate('el => el.tagName.toLowerCase()')
-									if selector.startswith('video') or tag_name == 'video':
-										# Try to get video source from <source> tag
-										source_el = await media_el.query_selector('source')
-										if source_el:
-											media_src = await source_el.get_attribute('src')
-											if media_src:
-												# Convert relative URLs to absolute
-												if media_src.startswith('/'):
-													media_src = f"https://twitch.facepunch.com{media_src}"
-												video_url = media_src
-												logging.debug(f"Found video source for {streamer} - {item}: {video_url}")
-												break
-										else:
-											# Fallback to video element's src attribute
-											media_src = await media_el.get_attribute('src')
-											if media_src:
-												if media_src.startswith('/'):
-													media_src = f"https://twitch.facepunch.com{media_src}"
-												video_url = media_src
-												logging.debug(f"Found video src for {streamer} - {item}: {video_url}")
-												break
-									else:
-										# It's an image element
-										media_src = await media_el.get_attribute('src')
-										if media_src:
-											# Convert relative URLs to absolute
-											if media_src.startswith('/'):
-												media_src = f"https://twitch.facepunch.com{media_src}"
-											video_url = media_src
-											logging.debug(f"Found image for {streamer} - {item}: {video_url}")
-											break
-							
-							# Try to get streamer profile picture
-							avatar_selectors = [
-								'.streamer-avatar img',
-								'.streamer-info img',
-								'.drop-box-header img[src*="profile"]',
-								'.drop-box-header img[src*="avatar"]',
-								'.streamer-name + img',
-								'.drop-box-header img'
-							]
-							
-							for selector in avatar_selectors:
-								avatar_el = await box.query_selector(selector)
-								if avatar_el:
-									avatar_src = await avatar_el.get_attribute('src')
-									if avatar_src:
-										# Convert relative URLs to absolute
-										if avatar_src.startswith('/'):
-											avatar_src = f"https://twitch.facepunch.com{avatar_src}"
-										streamer_avatar = avatar_src
-										logging.debug(f"Found streamer avatar for {streamer}: {streamer_avatar}")
-										break
-							
-							if not video_url:
-								logging.debug(f"No media found for {streamer} - {item}")
-								
-						except Exception as e:
-							logging.debug(f"Error getting media for {streamer} - {item}: {e}")
-						
-						streamer_specific.append({
-							"streamer": streamer,
-							"item": item,
-							"hours": hours,
-							"url": twitch_url,
-							"is_live": is_live,
-							"video": video_url,
-							"streamer_avatar": streamer_avatar,
-						})
+					video_url = row.get('video')
+					if not video_url:
+						logging.debug(f"No media found for {streamer} - {item}")
+					streamer_specific.append({
+						"streamer": streamer,
+						"item": item,
+						"hours": hours,
+						"url": row.get('url'),
+						"is_live": bool(row.get('isLive')),
+						"video": video_url,
+						"streamer_avatar": row.get('avatar'),
+					})
 				except Exception:
 					continue
 		except Exception:
@@ -2634,90 +3894,20 @@ async def fetch_facepunch_drops(context):
 				await page.wait_for_selector('#drops .drops-container', timeout=6000)
 			except Exception:
 				pass
-			data = await page.evaluate(
-				r"""
-				() => {
-				  const res = [];
-				  const boxes = Array.from(document.querySelectorAll('#drops .drops-container .drop-box'));
-				  const allBoxes = boxes.length ? boxes : Array.from(document.querySelectorAll('.drop-box'));
-				  for (const box of allBoxes) {
-				    const headerEl = box.querySelector('.drop-box-header');
-				    let headerText = '';
-				    if (headerEl) {
-				      headerText = (headerEl.innerText || headerEl.textContent || '').trim();
-				    }
-				    const inGeneralSection = !!box.closest('#drops');
-				    const isGeneral = inGeneralSection || /\bgeneral\s+drop\b/i.test(headerText);
-				    let alias = null;
-				    try {
-				      const m = headerText.match(/([A-Za-z0-9]+)\s+GENERAL\s+DROP/i);
-				      if (m) alias = m[1];
-				    } catch (e) {}
-				    const itemEl = box.querySelector('.drop-box-footer .drop-type');
-				    const item = itemEl && itemEl.textContent ? itemEl.textContent.trim() : null;
-				    const timeEl = box.querySelector('.drop-box-footer .drop-time span');
-				    let hours = null;
-				    if (timeEl && timeEl.textContent) {
-				      const m = timeEl.textContent.match(/(\d+)/);
-				      if (m) hours = parseInt(m[1], 10);
-				    }
-				    const isLocked = !!box.querySelector('.drop-lock');
-				    
-				    // Try to get item video
-				    let video = null;
-				    try {
-				      // First try to get video element
-				      const videoEl = box.querySelector('.drop-box-body video, .drop-box video, video');
-				      if (videoEl && videoEl.src) {
-				        video = videoEl.src;
-				        // Convert relative URLs to absolute
-				        if (video.startsWith('/')) {
-				          video = 'https://twitch.facepunch.com' + video;
-				        }
-				        console.log('Found general drop video:', video);
-				      } else {
-				        // Fallback to image if no video
-				        const imgEl = box.querySelector('.drop-box-body img, .drop-box img, img');
-				        if (imgEl && imgEl.src) {
-				          video = imgEl.src;
-				          // Convert relative URLs to absolute
-				          if (video.startsWith('/')) {
-				            video = 'https://twitch.facepunch.com' + video;
-				          }
-				          console.log('Found general drop image (fallback):', video);
-				        } else {
-				          console.log('No video or image found for general drop');
-				        }
-				      }
-				    } catch (e) {
-				      console.log('Error getting general drop video:', e);
-				    }
-				    
-				    res.push({ headerText, isGeneral, item, hours, alias, isLocked, video });
-				  }
-				  return res;
+			# The scraper only returns general drops that have an item name
+			general = [
+				{
+					"item": d.get('item'),
+					"hours": d.get('hours'),
+					"alias": d.get('alias'),
+					"header": d.get('headerText'),
+					"is_locked": d.get('isLocked'),
+					"video": d.get('video'),
 				}
-				"""
-			)
-			try:
-				gen_candidates = [d for d in (data or []) if d and d.get('isGeneral')]
-				headers_preview = ', '.join([(d.get('headerText') or '') for d in (data or [])][:5])
-				logging.debug(f"General scan: boxes={len(data or [])}, general_candidates={len(gen_candidates)}, sample_headers=[{headers_preview}]")
-			except Exception:
-				pass
-			for d in data or []:
-				try:
-					if d.get('isGeneral') and d.get('item'):
-						general.append({
-							"item": d.get('item'), 
-							"hours": d.get('hours'), 
-							"alias": d.get('alias'), 
-							"header": d.get('headerText'), 
-							"is_locked": d.get('isLocked'),
-							"video": d.get('video')  # Will be populated by the evaluate function
-						})
-				except Exception:
-					continue
+				for d in await evaluate_scraper(page, "facepunchGeneralDrops") or []
+				if d
+			]
+			logging.debug(f"General scan: general_drops={len(general)}, sample_headers=[{', '.join((g['header'] or '') for g in general[:5])}]")
 		except Exception:
 			pass
 
@@ -2725,10 +3915,10 @@ async def fetch_facepunch_drops(context):
 		if not general:
 			try:
 				body = await page.inner_text('body')
-				m = re.search(r"General Drops(.*?)(Streamer Drops|Drops Metrics|FAQ|Frequently Asked Questions|$)", body, flags=re.S)
+				m = _GENERAL_SECTION_RE.search(body)
 				if m:
 					general_section = m.group(1)
-					for gm in re.finditer(r"General Drop\s+([A-Za-z0-9 \-]+?)\s+(\d+)\s+Hour", general_section):
+					for gm in _GENERAL_ITEM_RE.finditer(general_section):
 						item = gm.group(1).strip()
 						hours = _safe_int(gm.group(2))
 						general.append({"item": item, "hours": hours})
@@ -2770,11 +3960,6 @@ async def fetch_facepunch_drops(context):
 			"fetch_failed": True,
 			"fetch_error": str(e),
 		}
-	finally:
-		try:
-			await page.close()
-		except Exception:
-			pass
 
 async def _extract_drop_games_from_directory_page(page, limit: int = 120) -> list[dict]:
 	await goto_with_exit(page, TWITCH_DROPS_ENABLED_DIRECTORY_URL, timeout=120000, wait_until="domcontentloaded")
@@ -2861,7 +4046,7 @@ def _viewer_count_score(viewers_text: str) -> int:
 	if not text:
 		return 0
 	try:
-		m = re.search(r"(\d+(?:\.\d+)?)\s*([km]?)", text)
+		m = _VIEWER_COUNT_RE.search(text)
 		if not m:
 			return 0
 		value = float(m.group(1))
@@ -2977,6 +4162,39 @@ async def fetch_drops_enabled_games(context, limit: int = 120) -> list[dict]:
 		except Exception:
 			pass
 
+async def _scrape_in_new_tab(context, extract):
+	page = await context.new_page()
+	await block_heavy_resources(page)
+	try:
+		return await extract(page)
+	finally:
+		try:
+			await page.close()
+		except Exception:
+			pass
+
+def run_dashboard_scrape(extract, fallback, timeout: float = 180):
+	"""Run a dashboard scrape from a Flask worker thread.
+
+	While the automator's browser is up, `extract(page)` runs in a new tab of that context on
+	its own loop, skipping a Chromium launch per request. Otherwise, or if that scrape doesn't
+	finish within `timeout` (it is then cancelled, closing its tab), `fallback()` (a one-off
+	headless browser) runs on a private loop.
+	"""
+	context, loop = current_browser_context, _BROWSER_LOOP
+	if context is not None and loop is not None and loop.is_running():
+		future = asyncio.run_coroutine_threadsafe(_scrape_in_new_tab(context, extract), loop)
+		try:
+			return future.result(timeout)
+		except FuturesTimeoutError:
+			future.cancel()
+			logging.warning(f"Dashboard scrape in the automator browser took over {timeout}s; retrying in a one-off browser")
+	loop = asyncio.new_event_loop()
+	try:
+		return loop.run_until_complete(fallback())
+	finally:
+		loop.close()
+
 async def fetch_drops_enabled_games_public(limit: int = 120) -> list[dict]:
 	"""One-off scrape for the dashboard refresh button."""
 	async with async_playwright() as p:
@@ -3013,42 +4231,230 @@ async def fetch_game_streamers_public(game_url: str, limit: int = 80) -> list[di
 
 # ---- Drops workflow helpers ----
 
+async def _load_inventory_page(inv_page, ready_selector: str = INVENTORY_READY_SELECTOR, ready_timeout: int = 8000):
+	"""Navigate inv_page to the inventory for a scrape.
+
+	Returns once the response commits and the elements we read have rendered, rather than
+	waiting for Twitch's script bundle to finish parsing (domcontentloaded). Back-to-back scrapes
+	within INVENTORY_REUSE_SECONDS reuse the already-loaded page; an older inventory page is
+	reloaded in place instead of navigated to again.
+	"""
+	try:
+		on_inventory = urlparse(inv_page.url).path.rstrip('/').endswith('/drops/inventory')
+		loaded_at = _INVENTORY_LOADED_AT.get(inv_page)
+	except Exception:
+		on_inventory, loaded_at = False, None
+	if on_inventory and loaded_at is not None and (time.monotonic() - loaded_at) < INVENTORY_REUSE_SECONDS:
+		return
+	if on_inventory:
+		await wait_with_exit(asyncio.create_task(inv_page.reload(timeout=120000, wait_until="commit")))
+	else:
+		await goto_with_exit(inv_page, TWITCH_INVENTORY_URL, timeout=120000, wait_until="commit")
+	try:
+		# Attached is enough for the scrapers, which read attributes/text rather than layout
+		await inv_page.locator(ready_selector).first.wait_for(state="attached", timeout=ready_timeout)
+	except Exception:
+		# Nothing to match (e.g. empty inventory); at least let the DOM finish parsing
+		try:
+			await inv_page.wait_for_load_state("domcontentloaded")
+		except Exception:
+			pass
+	await maybe_accept_cookies(inv_page)
+	try:
+		_INVENTORY_LOADED_AT[inv_page] = time.monotonic()
+	except TypeError:
+		pass
+
+async def wait_for_inventory_change(inv_page, timeout_seconds: float) -> float:
+	"""Wait until an inventory progressbar's aria-valuenow changes, or timeout_seconds pass.
+
+	Installs a MutationObserver on the already-loaded page so a live progress update wakes the
+	caller without a reload; when it fires, the page is marked fresh so the next scrape skips
+	navigation. Falls back to a plain sleep if the observer can't be installed. Returns the
+	number of seconds actually waited.
+	"""
+	started = time.monotonic()
+	try:
+		await evaluate_scraper(inv_page, "watchProgress")
+	except Exception:
+		await sleep_or_exit(timeout_seconds)
+		return timeout_seconds
+	try:
+		await wait_with_exit(asyncio.create_task(inv_page.wait_for_function(
+			"() => window.__tdaDropEvents && window.__tdaDropEvents.length > 0",
+			timeout=int(timeout_seconds * 1000),
+		)))
+		changes = await inv_page.evaluate("() => window.__tdaDropEvents.splice(0).length")
+		logging.info(f"[INVENTORY-WATCH] {changes} live progress update(s) detected")
+		try:
+			_INVENTORY_LOADED_AT[inv_page] = time.monotonic()
+		except TypeError:
+			pass
+	except asyncio.CancelledError:
+		raise
+	except Exception:
+		# Timed out (or page navigated away); caller reloads on its next scrape
+		pass
+	return time.monotonic() - started
+
+async def _cached_inventory_scrape(inv_page, scraper: str):
+	"""Run an inventory scraper once per page load; later callers get the same result."""
+	try:
+		loaded_at = _INVENTORY_LOADED_AT.get(inv_page)
+		cached = _INVENTORY_SCRAPE_CACHE.get(inv_page)
+	except Exception:
+		loaded_at, cached = None, None
+	if cached is not None and loaded_at is not None and cached[0] == loaded_at and scraper in cached[1]:
+		return cached[1][scraper]
+	result = await evaluate_scraper(inv_page, scraper) or []
+	if loaded_at is not None:
+		results = cached[1] if cached is not None and cached[0] == loaded_at else {}
+		results[scraper] = result
+		_INVENTORY_SCRAPE_CACHE[inv_page] = (loaded_at, results)
+	return result
+
+def invalidate_inventory_page(inv_page):
+	"""Forget the loaded inventory and its scrapes, so the next scrape reloads (e.g. after a claim)."""
+	_store_inventory_gql_snapshot(None)
+	try:
+		_INVENTORY_LOADED_AT.pop(inv_page, None)
+		_INVENTORY_SCRAPE_CACHE.pop(inv_page, None)
+	except TypeError:
+		pass
+
+async def scrape_inventory(inv_page) -> list[dict]:
+	"""Return [{title, percent, hours}] for every inventory progress bar.
+
+	Shared by get_inventory_progress_map and get_incomplete_rust_rewards; the scrape is reused
+	until _load_inventory_page next reloads the page.
+	"""
+	await _load_inventory_page(inv_page)
+	return await _cached_inventory_scrape(inv_page, "inventoryItems")
+
+def capture_inventory_gql(page):
+	"""Remember the Inventory GQL request the inventory tab sends while it renders.
+
+	Twitch's persisted-query hash and integrity token are only discoverable from a real page
+	load, so the first DOM scrape doubles as the capture for later replays.
+	"""
+	def _on_request(request):
+		global _INVENTORY_GQL_TEMPLATE
+		op = _inventory_gql_operation(request)
+		if op is not None:
+			headers = {k: v for k, v in request.headers.items() if k.lower() in _GQL_REPLAY_HEADERS}
+			_INVENTORY_GQL_TEMPLATE = {"headers": headers, "payload": op}
+
+	async def _on_response(response):
+		# The tab's own Inventory responses are as good as a replay; keep them so the next
+		# progress check doesn't have to re-query
+		if _inventory_gql_operation(response.request) is None:
+			return
+		try:
+			progress = parse_inventory_gql_progress(await response.json())
+		except Exception:
+			return
+		if progress is not None:
+			_store_inventory_gql_snapshot(progress)
+
+	try:
+		page.on("request", _on_request)
+		page.on("response", _on_response)
+	except Exception as e:
+		logging.debug(f"Could not watch inventory GQL requests: {e}")
+
+def _inventory_gql_operation(request) -> dict | None:
+	"""The Inventory operation in a GQL POST request (bodies may be batched), else None."""
+	try:
+		if not request.url.startswith(TWITCH_GQL_URL) or request.method != "POST":
+			return None
+		body = json.loads(request.post_data or "null")
+	except Exception:
+		return None
+	for op in (body if isinstance(body, list) else [body]):
+		if isinstance(op, dict) and op.get("operationName") == "Inventory":
+			return op
+	return None
+
+def _store_inventory_gql_snapshot(progress: dict | None):
+	global _INVENTORY_GQL_SNAPSHOT
+	_INVENTORY_GQL_SNAPSHOT = (time.monotonic(), progress) if progress is not None else None
+
+def parse_inventory_gql_progress(data) -> dict | None:
+	"""Turn an Inventory GQL response into {title: percent}, keyed by drop and reward names.
+
+	Claimed drops are left out, matching the DOM scrape (which only sees unclaimed progress
+	bars): callers read 100% as "earned, not yet claimed". Returns None when the response
+	carries no inventory (errors, expired integrity token).
+	"""
+	progress = {}
+	found = False
+	for entry in (data if isinstance(data, list) else [data]):
+		if not isinstance(entry, dict) or entry.get("errors"):
+			return None
+		inventory = ((entry.get("data") or {}).get("currentUser") or {}).get("inventory")
+		if inventory is None:
+			continue
+		found = True
+		for campaign in inventory.get("dropCampaignsInProgress") or []:
+			for drop in campaign.get("timeBasedDrops") or []:
+				state = drop.get("self") or {}
+				if state.get("isClaimed"):
+					continue
+				required = drop.get("requiredMinutesWatched") or 0
+				if required:
+					percent = min(100, int((state.get("currentMinutesWatched") or 0) * 100 / required))
+				else:
+					percent = 0
+				names = [drop.get("name")] + [(edge.get("benefit") or {}).get("name") for edge in drop.get("benefitEdges") or []]
+				for name in names:
+					if name and name.strip():
+						progress[name.strip()] = max(percent, progress.get(name.strip(), 0))
+	return progress if found else None
+
+async def get_inventory_progress_via_gql(context) -> dict | None:
+	"""Replay the captured Inventory GQL query; None means use the DOM scrape instead.
+
+	A response seen within INVENTORY_REUSE_SECONDS (the tab's own or a previous replay) is
+	returned as is.
+	"""
+	global _INVENTORY_GQL_TEMPLATE
+	snapshot = _INVENTORY_GQL_SNAPSHOT
+	if snapshot is not None and time.monotonic() - snapshot[0] < INVENTORY_REUSE_SECONDS:
+		return dict(snapshot[1])
+	template = _INVENTORY_GQL_TEMPLATE
+	if template is None:
+		return None
+	try:
+		response = await context.request.post(
+			TWITCH_GQL_URL, data=json.dumps(template["payload"]), headers=template["headers"], timeout=15000
+		)
+		if response.status in (401, 403):
+			# Token or integrity expired; the next page load captures a fresh request
+			_INVENTORY_GQL_TEMPLATE = None
+			return None
+		if not response.ok:
+			return None
+		progress = parse_inventory_gql_progress(await response.json())
+		if progress is None:
+			_INVENTORY_GQL_TEMPLATE = None
+		_store_inventory_gql_snapshot(progress)
+		return progress
+	except Exception as e:
+		logging.debug(f"[INVENTORY-SCAN] GQL inventory query failed: {e}")
+		return None
+
 async def get_inventory_progress_map(inv_page):
 	progress = {}
+	try:
+		gql_progress = await get_inventory_progress_via_gql(inv_page.context)
+		if gql_progress is not None:
+			logging.info(f"[INVENTORY-SCAN] GQL inventory query returned {len(gql_progress)} items")
+			return gql_progress
+	except Exception:
+		pass
 	try:
 		logging.info("[INVENTORY-SCAN] Starting inventory scan...")
-		await goto_with_exit(inv_page, TWITCH_INVENTORY_URL, timeout=120000, wait_until="domcontentloaded")
-		await maybe_accept_cookies(inv_page)
-		await inv_page.wait_for_timeout(600)
-		items = await inv_page.evaluate(
-			r"""
-			() => {
-			  const out = [];
-			  const findTitleFrom = (container) => {
-				let node = container;
-				while (node) {
-				  let prev = node.previousElementSibling;
-				  while (prev) {
-					const titleEl = prev.querySelector('p.CoreText-sc-1txzju1-0, p');
-					if (titleEl && titleEl.textContent && titleEl.textContent.trim()) {
-					  return titleEl.textContent.trim();
-					}
-					prev = prev.previousElementSibling;
-				  }
-				  node = node.parentElement;
-				}
-				return null;
-			  };
-			  document.querySelectorAll('[role="progressbar"][aria-valuenow]').forEach(pb => {
-				const percent = parseInt(pb.getAttribute('aria-valuenow') || '0', 10);
-				const container = pb.parentElement;
-				const title = findTitleFrom(container);
-				if (title) out.push({ title, percent });
-			  });
-			  return out;
-			}
-			"""
-		)
+		items = await scrape_inventory(inv_page)
 		logging.info(f"[INVENTORY-SCAN] Found {len(items)} progress bars on inventory page")
 		for it in items:
 			title = it.get('title')
@@ -3063,89 +4469,17 @@ async def get_inventory_progress_map(inv_page):
 		logging.warning(f"[INVENTORY-SCAN] Progress map issue: {e}")
 	return progress
 
+def ready_to_claim_titles(progress_map: dict | None) -> list[str]:
+	"""Return inventory titles whose progress has reached 100%."""
+	return [title for title, percent in (progress_map or {}).items() if isinstance(percent, int) and percent >= 100]
+
 async def get_general_drops_progress_map(inv_page):
 	"""Get progress map for general drops only, excluding streamer-specific drops."""
 	progress = {}
 	try:
 		logging.info("[GENERAL-DROPS-SCAN] Starting general drops area scan...")
-		await goto_with_exit(inv_page, TWITCH_INVENTORY_URL, timeout=120000, wait_until="domcontentloaded")
-		await maybe_accept_cookies(inv_page)
-		await inv_page.wait_for_timeout(600)
-		items = await inv_page.evaluate(
-			r"""
-			() => {
-			  const out = [];
-			  const findTitleFrom = (container) => {
-				let node = container;
-				while (node) {
-				  let prev = node.previousElementSibling;
-				  while (prev) {
-					const titleEl = prev.querySelector('p.CoreText-sc-1txzju1-0, p');
-					if (titleEl && titleEl.textContent && titleEl.textContent.trim()) {
-					  return titleEl.textContent.trim();
-					}
-					prev = prev.previousElementSibling;
-				  }
-				  node = node.parentElement;
-				}
-				return null;
-			  };
-			  
-			  // Look for general drops section - try multiple selectors
-			  const generalSections = [
-				'[data-test-selector="drops-general-section"]',
-				'.drops-general',
-				'[aria-label*="general" i]',
-				'[aria-label*="General" i]'
-			  ];
-			  
-			  let generalContainer = null;
-			  for (const selector of generalSections) {
-				generalContainer = document.querySelector(selector);
-				if (generalContainer) {
-				  console.log('Found general drops section with selector:', selector);
-				  break;
-				}
-			  }
-			  
-			  // If no specific general section found, look for progress bars that are NOT in streamer sections
-			  const allProgressBars = document.querySelectorAll('[role="progressbar"][aria-valuenow]');
-			  allProgressBars.forEach(pb => {
-				const percent = parseInt(pb.getAttribute('aria-valuenow') || '0', 10);
-				const container = pb.parentElement;
-				
-				// Check if this progress bar is in a streamer-specific section
-				const isInStreamerSection = !!pb.closest('[data-test-selector*="streamer"], .streamer-drops, [aria-label*="streamer" i], [aria-label*="Streamer" i]');
-				
-				// If we found a general container, only include items within it
-				// Otherwise, exclude items that are clearly in streamer sections
-				let shouldInclude = false;
-				if (generalContainer) {
-				  shouldInclude = generalContainer.contains(pb);
-				} else {
-				  shouldInclude = !isInStreamerSection;
-				}
-				
-				if (shouldInclude) {
-				  const title = findTitleFrom(container);
-				  if (title) {
-					// Additional check: exclude titles that clearly contain streamer names
-					// (this is a heuristic to avoid streamer-specific items)
-					const titleLower = title.toLowerCase();
-					const hasStreamerIndicators = /\b(streamer|channel|broadcaster|twitch)\b/.test(titleLower) && 
-					  !/\b(general|campaign|event)\b/.test(titleLower);
-					
-					if (!hasStreamerIndicators) {
-					  out.push({ title, percent });
-					}
-				  }
-				}
-			  });
-			  
-			  return out;
-			}
-			"""
-		)
+		await _load_inventory_page(inv_page)
+		items = await evaluate_scraper(inv_page, "generalProgress")
 		logging.info(f"[GENERAL-DROPS-SCAN] Found {len(items)} progress bars in general drops area")
 		for it in items:
 			title = it.get('title')
@@ -3159,49 +4493,11 @@ async def get_general_drops_progress_map(inv_page):
 	except Exception as e:
 		logging.warning(f"[GENERAL-DROPS-SCAN] General drops progress map issue: {e}")
 	return progress
-
-async def get_incomplete_rust_rewards(inv_page):
-	rewards = []
-	try:
-		await goto_with_exit(inv_page, TWITCH_INVENTORY_URL, timeout=120000, wait_until="domcontentloaded")
-		await maybe_accept_cookies(inv_page)
-		await inv_page.wait_for_timeout(800)
-		items = await inv_page.evaluate(
-			r"""
-			() => {
-			  const out = [];
-			  const findTitleFrom = (container) => {
-				let node = container;
-				while (node) {
-				  let prev = node.previousElementSibling;
-				  while (prev) {
-					const p = prev.querySelector('p');
-					if (p && p.textContent && p.textContent.trim()) {
-					  return p.textContent.trim();
-					}
-					prev = prev.previousElementSibling;
-				  }
-				  node = node.parentElement;
-				}
-				return null;
-			  };
-			  
-			  document.querySelectorAll('[role="progressbar"][aria-valuenow]').forEach(pb => {
-				const percent = parseInt(pb.getAttribute('aria-valuenow') || '0', 10);
-				const container = pb.parentElement; // wraps progressbar and text
-				let title = findTitleFrom(container);
-				let hours = null;
-				const textEl = container ? container.querySelector('div p') : null;
-				const text = textEl ? textEl.textContent : '';
-				const m = text.match(/of\s+(\d+)\s+hours?/i);
-				if (m) hours = parseInt(m[1], 10);
-				if (title) out.push({ title, percent, hours });
-			  });
-			  
-			  return out;
-			}
-			"""
-		)
+
+async def get_incomplete_rust_rewards(inv_page):
+	rewards = []
+	try:
+		items = await scrape_inventory(inv_page)
 		seen = set()
 		for it in items:
 			if not it or not it.get('title'):
@@ -3225,6 +4521,8 @@ def emit_debug(message: str, level: str = "info"):
 	# Debug emitter disabled per request; keep as no-op to avoid refactor churn.
 	return
 
+_NAME_SEPARATORS = (' - ', ' + ', ' & ', ' and ')
+
 def generate_search_variations(base_name: str) -> list[str]:
 	"""Generate lowercase search variations for a given name.
 	Examples: "FOOLISH - VAGABOND JACKET" -> ["foolish - vagabond jacket", "foolish", "vagabond jacket"].
@@ -3233,25 +4531,31 @@ def generate_search_variations(base_name: str) -> list[str]:
 	name = (base_name or "").strip().lower()
 	if not name:
 		return []
-	variations = [name, _normalize_match_text(name)]
+	mapped_name = None
 	
 	# Add custom name mappings from separate mappings file
 	try:
 		mappings = load_streamer_mappings()
 		if name in mappings:
 			mapped_name = mappings[name].lower()
-			if mapped_name not in variations:
-				variations.append(mapped_name)
-				variations.append(_normalize_match_text(mapped_name))
-				logging.info(f"[NAME-MAPPING] Added mapping for '{name}' -> '{mapped_name}'")
 	except Exception as e:
 		logging.warning(f"[NAME-MAPPING] Error accessing name mappings: {e}")
+	return list(_search_variations(name, mapped_name))
+
+# Variations depend only on the name and its mapping, so each pair is expanded once
+@functools.lru_cache(maxsize=1024)
+def _search_variations(name: str, mapped_name: str | None) -> tuple[str, ...]:
+	variations = [name, _normalize_match_text(name)]
+	if mapped_name and mapped_name not in variations:
+		variations.append(mapped_name)
+		variations.append(_normalize_match_text(mapped_name))
+		logging.info(f"[NAME-MAPPING] Added mapping for '{name}' -> '{mapped_name}'")
 	
 	if ' ' in name:
 		first_word = name.split()[0]
 		if len(first_word) > 3:
 			variations.append(first_word)
-	for sep in [' - ', ' + ', ' & ', ' and ']:
+	for sep in _NAME_SEPARATORS:
 		if sep in name:
 			for part in name.split(sep):
 				p = part.strip()
@@ -3273,7 +4577,7 @@ def generate_search_variations(base_name: str) -> list[str]:
 		if key and key not in seen:
 			seen.add(key)
 			out.append(key)
-	return out
+	return tuple(out)
 
 async def get_claimed_days_for_streamer(inv_page, streamer_name: str) -> int | None:
 	"""Return approximate days since this streamer's drop was claimed, or None if not found.
@@ -3302,90 +4606,9 @@ async def scrape_recent_claimed_items(inv_page):
 	"""
 	try:
 		# Ensure page is loaded
-		await goto_with_exit(inv_page, TWITCH_INVENTORY_URL, timeout=120000, wait_until="domcontentloaded")
-		await maybe_accept_cookies(inv_page)
-		await inv_page.wait_for_timeout(400)
+		await _load_inventory_page(inv_page, ready_selector=INVENTORY_CLAIMED_READY_SELECTOR)
 		emit_debug("[claimed-sweep] Navigating inventory for sweep")
-		items = await inv_page.evaluate(
-			r"""
-			() => {
-			  const isTimeText = (s) => {
-				if (!s) return false;
-				const t = s.trim().toLowerCase();
-				return t.includes('yesterday') || t.includes('ago') || t.includes('last month') || t.includes('months ago') || t.includes('month ago') || t.includes('today');
-			  };
-			  const toDays = (s) => {
-				if (!s) return null;
-				const t = s.trim().toLowerCase();
-				if (t.includes('today')) return 0;
-				if (t.includes('yesterday')) return 1;
-				let m;
-				if ((m = t.match(/(\d+)\s*minutes?/))) return 0;
-				if ((m = t.match(/(\d+)\s*hours?/))) return 0;
-				if ((m = t.match(/(\d+)\s*days?/))) return parseInt(m[1], 10);
-				if (t.includes('last month')) return 30;
-				if ((m = t.match(/(\d+)\s*months?/))) return parseInt(m[1], 10) * 30;
-				if ((m = t.match(/(\d+)\s*years?/))) return parseInt(m[1], 10) * 365;
-				return null;
-			  };
-
-			  // Find Claimed section container
-			  const claimedHeader = Array.from(document.querySelectorAll('h5')).find(h5 => (h5.textContent || '').trim().toLowerCase() === 'claimed');
-			  let claimedSection = null;
-			  if (claimedHeader) {
-				claimedSection = claimedHeader.closest('div')?.querySelector('.ScTower-sc-1sjzzes-0, .tw-tower') || null;
-			  }
-			  if (!claimedSection) {
-				claimedSection = Array.from(document.querySelectorAll('div, section')).find(el => {
-				  const text = (el.textContent || '').toLowerCase();
-				  return text.includes('claimed') && text.length < 100;
-				}) || null;
-			  }
-
-			  const searchScopes = [];
-			  if (claimedSection) searchScopes.push(claimedSection);
-			  searchScopes.push(document);
-
-			  const results = [];
-			  const seenKeys = new Set();
-			  const isCheckmarkPath = (d) => {
-				if (!d) return false;
-				return d.includes('m4 10 5 5 8-8-1.5-1.5L9 12 5.5 8.5 4 10z') || d.includes('m4 10 5 5 8-8') || (d.includes('4 10') && d.includes('5 5') && d.includes('8-8'));
-			  };
-
-			  for (const scope of searchScopes) {
-				const cards = Array.from(scope.querySelectorAll('div.Layout-sc-1xcs6mc-0.fHdBNk'));
-				for (const card of cards) {
-				  // Identify name and time within the card
-				  const nameEl = card.querySelector('p.CoreText-sc-1txzju1-0.kGfRxP, p[class*="kGfRxP"]');
-				  const timeEl = card.querySelector('p.CoreText-sc-1txzju1-0.jPfhdt, p[class*="jPfhdt"]');
-				  const name = (nameEl?.textContent || '').trim();
-				  const timeText = (timeEl?.textContent || '').trim();
-				  if (!name) continue;
-				  // Treat as claimed if inside Claimed section OR contains a checkmark icon
-				  const inClaimed = !!claimedSection && claimedSection.contains(card);
-				  let hasTick = false;
-				  const path = card.querySelector('svg path');
-				  if (path) {
-					const d = path.getAttribute('d') || '';
-					hasTick = isCheckmarkPath(d);
-				  }
-				  if (!inClaimed && !hasTick) continue;
-
-				  if (!isTimeText(timeText)) continue;
-				  const days = toDays(timeText);
-				  if (days === null || days === undefined) continue;
-				  if (days > 21) continue;
-				  const key = name.toLowerCase();
-				  if (seenKeys.has(key)) continue;
-				  seenKeys.add(key);
-				  results.push({ name, days });
-				}
-			  }
-			  return results;
-			}
-			"""
-		)
+		items = await _cached_inventory_scrape(inv_page, "claimedItems")
 		emit_debug(f"[claimed-sweep] Found {len(items or [])} claimed candidates (<=21d)")
 		return items or []
 	except Exception as e:
@@ -3400,132 +4623,65 @@ async def _get_claimed_days_for_streamer_impl(inv_page, streamer_name: str, targ
 	
 	try:
 		# Ensure page is loaded
-		await goto_with_exit(inv_page, TWITCH_INVENTORY_URL, timeout=120000, wait_until="domcontentloaded")
-		await maybe_accept_cookies(inv_page)
-		await inv_page.wait_for_timeout(400)
+		await _load_inventory_page(inv_page, ready_selector=INVENTORY_CLAIMED_READY_SELECTOR)
 		emit_debug(f"[claimed-check] Navigating inventory for '{streamer_name}'")
-		days = await inv_page.evaluate(
-			r"""
-			(args) => {
-			  const searchVariations = (args && args.searchVariations) || [];
-			  const isTimeText = (s) => {
-				if (!s) return false;
-				const t = s.trim().toLowerCase();
-				return t.includes('yesterday') || t.includes('ago') || t.includes('last month') || t.includes('months ago') || t.includes('month ago');
-			  };
-			  const toDays = (s) => {
-				if (!s) return null;
-				const t = s.trim().toLowerCase();
-				if (t.includes('yesterday')) return 1;
-				let m;
-				if ((m = t.match(/(\d+)\s*minutes?/))) return 0;
-				if ((m = t.match(/(\d+)\s*hours?/))) return 0;
-				if ((m = t.match(/(\d+)\s*days?/))) return parseInt(m[1], 10);
-				if (t.includes('last month')) return 30;
-				if ((m = t.match(/(\d+)\s*months?/))) return parseInt(m[1], 10) * 30;
-				if ((m = t.match(/(\d+)\s*years?/))) return parseInt(m[1], 10) * 365;
-				return null;
-			  };
-			  
-			  // Find the claimed section by looking for the "Claimed" header and its container
-			  const claimedHeader = Array.from(document.querySelectorAll('h5')).find(h5 => 
-				(h5.textContent || '').trim().toLowerCase() === 'claimed'
-			  );
-			  
-			  let claimedSection = null;
-			  if (claimedHeader) {
-				// Find the tower container that comes after the header
-				claimedSection = claimedHeader.closest('div').querySelector('.ScTower-sc-1sjzzes-0, .tw-tower');
-			  }
-			  
-			  // Fallback: try to find any element containing "claimed" text
-			  if (!claimedSection) {
-				claimedSection = Array.from(document.querySelectorAll('div, section')).find(el => {
-					const text = (el.textContent || '').toLowerCase();
-					return text.includes('claimed') && text.length < 100;
-				});
-			  }
-			  
-			  // Define search scope - prefer claimed section if found, otherwise search entire page
-			  const searchScope = claimedSection || document;
-			  
-			  // Look for checkmark/tick icons in the claimed section
-			  // The checkmark SVG has a specific path: "m4 10 5 5 8-8-1.5-1.5L9 12 5.5 8.5 4 10z"
-			  const checkmarkSvgs = Array.from(searchScope.querySelectorAll('svg path')).filter(svg => {
-				const path = svg.getAttribute('d') || '';
-				return path.includes('m4 10 5 5 8-8-1.5-1.5L9 12 5.5 8.5 4 10z') || 
-					   path.includes('m4 10 5 5 8-8') || // Partial match for the checkmark path
-					   (path.includes('4 10') && path.includes('5 5') && path.includes('8-8')); // Key parts of checkmark
-			  });
-			  
-			  // For each checkmark found, try to match it with our search variations
-			  for (const checkmarkSvg of checkmarkSvgs) {
-				// Find the drop container that contains this checkmark
-				const dropContainer = checkmarkSvg.closest('div.Layout-sc-1xcs6mc-0.fHdBNk');
-				if (dropContainer) {
-				  // Look for the drop name in this container
-				  const nameEl = dropContainer.querySelector('p.CoreText-sc-1txzju1-0.kGfRxP, p[class*="kGfRxP"]');
-				  if (nameEl) {
-					const dropName = (nameEl.textContent || '').toLowerCase();
-					
-					// Check if this drop name matches any of our search variations
-					for (const targetLower of searchVariations) {
-					  if (dropName.includes(targetLower)) {
-						// Found a match! Now get the timestamp
-						const timeEl = dropContainer.querySelector('p.CoreText-sc-1txzju1-0.jPfhdt, p[class*="jPfhdt"]');
-						if (timeEl && isTimeText(timeEl.textContent || '')) {
-						  const days = toDays(timeEl.textContent || '');
-						  if (days !== null && days !== undefined) {
-							// Only return if the drop is not older than 3 weeks (21 days)
-							if (days <= 21) {
-							  return days;
-							}
-						  }
-						}
-					  }
-					}
-				  }
-				}
-			  }
-			  
-			  return null;
-			}
-			""",
-			{"searchVariations": search_variations}
-		)
+		days = await evaluate_scraper(inv_page, "claimedDays", {"searchVariations": search_variations})
 		return days
 	except Exception as e:
 		emit_debug(f"[claimed-check] Failed for '{streamer_name}': {e}", 'warning')
 		return None
 
+DIRECTORY_CARD_SELECTOR = 'article a[data-a-target="preview-card-title-link"]'
+
+async def wait_for_directory_cards(page, timeout_ms: int = 3000, settle_ms: int = 250):
+	"""Wait for the first directory card to render (bounded), then briefly let the grid fill in."""
+	try:
+		await page.wait_for_selector(DIRECTORY_CARD_SELECTOR, timeout=timeout_ms)
+	except Exception:
+		return
+	await page.wait_for_timeout(settle_ms)
+
 async def pick_live_rust_stream_with_drops(context, preferred_streamers=None):
 	preferred_streamers = [s.lower() for s in (preferred_streamers or [])]
 	page = await context.new_page()
 	try:
 		await goto_with_exit(page, TWITCH_RUST_DIRECTORY_URL, timeout=120000, wait_until="domcontentloaded")
 		await maybe_accept_cookies(page)
-		await page.wait_for_timeout(1000)
-		cards = await page.query_selector_all('article')
+		await wait_for_directory_cards(page)
+		# Read every card's title link and tag nodes in one round-trip
+		cards = await page.evaluate(
+			r"""
+			() => Array.from(document.querySelectorAll('article')).slice(0, 60).map(card => {
+			  const link = card.querySelector('a[data-a-target="preview-card-title-link"]');
+			  const tagNodes = Array.from(
+				card.querySelectorAll('[aria-label^="Tag, "], [data-a-target="tag"], a[href*="/directory/all/tags/"]')
+			  ).slice(0, 20);
+			  return {
+				href: link ? link.getAttribute('href') : null,
+				tags: tagNodes.map(t => ({
+				  text: t.innerText || '',
+				  ariaLabel: t.getAttribute('aria-label') || '',
+				  href: t.getAttribute('href') || ''
+				}))
+			  };
+			})
+			"""
+		)
 		preferred_candidate = None
 		drops_candidates = []
-		for card in cards[:60]:
+		for card in cards or []:
 			try:
-				link = await card.query_selector('a[data-a-target="preview-card-title-link"]')
-				if not link:
-					continue
-				href = await link.get_attribute('href')
+				href = card.get('href')
 				if not href:
 					continue
 				url = 'https://www.twitch.tv' + href if href.startswith('/') else href
 				path = href.split('?')[0].strip('/') if href.startswith('/') else url.split('twitch.tv/')[-1]
 				has_drops_tag = False
-				tag_nodes = await card.query_selector_all('[aria-label^="Tag, "], [data-a-target="tag"], a[href*="/directory/all/tags/"]')
-				for t in tag_nodes[:20]:
-					txt = re.sub(r'[^a-z0-9]', '', (await t.inner_text()).lower())
-					aria_label = (await t.get_attribute('aria-label') or '')
-					aria_label = re.sub(r'^tag,\s*', '', aria_label, flags=re.IGNORECASE)
-					aria_tag = re.sub(r'[^a-z0-9]', '', aria_label.lower())
-					tag_href = (await t.get_attribute('href') or '').lower()
+				for t in card.get('tags') or []:
+					txt = _NON_ALNUM_RE.sub('', (t.get('text') or '').lower())
+					aria_label = _TAG_ARIA_PREFIX_RE.sub('', t.get('ariaLabel') or '')
+					aria_tag = _NON_ALNUM_RE.sub('', aria_label.lower())
+					tag_href = (t.get('href') or '').lower()
 					if (
 						txt == 'dropsenabled'
 						or aria_tag == 'dropsenabled'
@@ -3613,7 +4769,7 @@ async def watch_selected_games_cycle(context, inv_page, enabled_games: list[dict
 	target = await pick_live_stream_from_enabled_games(context, enabled_games)
 	if not target:
 		logging.info("No live drops-enabled stream found for selected games. Retrying shortly.")
-		await asyncio.sleep(20)
+		await sleep_or_exit(20)
 		return False
 	stream_page = await context.new_page()
 	try:
@@ -3650,7 +4806,7 @@ async def watch_selected_games_cycle(context, inv_page, enabled_games: list[dict
 					update_cached_drops_data(None, progress_map)
 			except Exception as e:
 				logging.debug(f"Selected-game progress refresh failed: {e}")
-			await asyncio.sleep(INVENTORY_POLL_INTERVAL_SECONDS)
+			await sleep_or_exit(INVENTORY_POLL_INTERVAL_SECONDS)
 		return True
 	finally:
 		try:
@@ -3677,24 +4833,9 @@ async def ensure_stream_playing(stream_page):
 	except Exception as exc:
 		logging.debug(f"Play control was unavailable: {exc}")
 	try:
-		# Ensure muted (only click if currently not muted)
-		val = await stream_page.get_attribute('[data-a-target="player-volume-slider"]', 'aria-valuenow')
-		if val is None or val != '0':
-			await click_ui_element(
-				stream_page, 
-				'button[data-a-target="player-mute-unmute-button"]', 
-				"mute button", 
-				timeout=2000, 
-				wait_after_click=0.2
-			)
-		# Nudge the slider toward zero anyway
-		try:
-			await stream_page.hover('[data-a-target="player-volume-slider"]')
-			for _ in range(3):
-				await stream_page.keyboard.press('ArrowDown')
-				await asyncio.sleep(0.05)
-		except Exception:
-			pass
+		# Mute in one round-trip: toggle the player's mute button if its slider isn't at 0, and
+		# zero the media element directly in case the toggle doesn't register
+		await stream_page.evaluate(_MUTE_STREAM_JS)
 	except Exception:
 		pass
 	try:
@@ -3754,99 +4895,104 @@ async def click_ui_element(page, selectors, description="UI element", timeout=20
     return False
 
 
+_MUTE_STREAM_JS = r"""
+() => {
+  const slider = document.querySelector('[data-a-target="player-volume-slider"]');
+  const value = slider ? slider.getAttribute('aria-valuenow') : null;
+  if (value !== '0') {
+    const mute = document.querySelector('button[data-a-target="player-mute-unmute-button"]');
+    if (mute) mute.click();
+  }
+  for (const v of document.querySelectorAll('video')) { v.muted = true; v.volume = 0; }
+}
+"""
+
+# Drives the player's settings menu in-page: each step waits (MutationObserver, bounded) for the
+# element the previous click renders instead of sleeping a fixed time between round-trips. The
+# settings button itself gets the old 15 s allowance, since a fresh stream load may not have it yet.
+_PICK_LOWEST_QUALITY_JS = r"""
+async () => {
+  const waitFor = (find, timeoutMs) => new Promise(resolve => {
+    const found = find();
+    if (found) return resolve(found);
+    const observer = new MutationObserver(() => {
+      const el = find();
+      if (el) { observer.disconnect(); clearTimeout(timer); resolve(el); }
+    });
+    const timer = setTimeout(() => { observer.disconnect(); resolve(null); }, timeoutMs);
+    observer.observe(document.body, { childList: true, subtree: true });
+  });
+  const settings = await waitFor(() => document.querySelector('button[data-a-target="player-settings-button"]'), 15000);
+  if (!settings) return 'no-settings';
+  settings.click();
+  const qualityItem = await waitFor(() => {
+    const menu = document.querySelector('div[role="menu"]');
+    if (!menu) return null;
+    return menu.querySelector('[data-a-target="player-settings-menu-item-quality"], [data-a-target="player-settings-quality"]')
+      || Array.from(menu.querySelectorAll('[role="menuitem"]')).find(el => /quality/i.test(el.innerText || ''));
+  }, 2000);
+  if (!qualityItem) { settings.click(); return 'no-quality-menu'; }
+  qualityItem.click();
+  const candidates = await waitFor(() => {
+    const menu = document.querySelector('div[role="menu"]');
+    const items = menu ? Array.from(menu.querySelectorAll('[role="menuitemradio"], input[type="radio"], label')) : [];
+    return items.length ? items : null;
+  }, 2000);
+  let picked = false;
+  if (candidates) {
+    const getQualityScore = (el) => {
+      const t = (el.innerText || el.textContent || '').toLowerCase();
+      if (t.includes('audio only')) return 0; // best for bandwidth
+      const m = t.match(/(\d+)p/);
+      if (m) return parseInt(m[1], 10);
+      // Unknown labels get a high score so they won't be chosen over known low qualities
+      return 9999;
+    };
+    let bestEl = null;
+    let best = 9999;
+    for (const el of candidates) {
+      const score = getQualityScore(el);
+      if (score < best) {
+        best = score;
+        bestEl = el;
+      }
+    }
+    if (bestEl) {
+      (bestEl.closest('[role="menuitemradio"]') || bestEl).click();
+      picked = true;
+    }
+  }
+  // Close the settings menu if the selection left it open
+  if (document.querySelector('div[role="menu"]')) settings.click();
+  return picked ? 'picked' : 'no-options';
+}
+"""
+
 async def set_low_quality(stream_page):
 	try:
-		# Click settings button using unified function
-		settings_clicked = await click_ui_element(
-			stream_page, 
-			'button[data-a-target="player-settings-button"]', 
-			"player settings button", 
-			timeout=15000, 
-			wait_after_click=0.3
-		)
-		if not settings_clicked:
-			return
-			
-		# Open Quality submenu using unified function
-		quality_selectors = [
-			'div[role="menu"] [data-a-target="player-settings-menu-item-quality"]',
-			'div[role="menu"] [data-a-target="player-settings-quality"]',
-			'div[role="menu"] [role="menuitem"]:has-text("Quality")'
-		]
-		
-		quality_opened = await click_ui_element(
-			stream_page, 
-			quality_selectors, 
-			"quality menu item", 
-			timeout=2000, 
-			wait_after_click=0.4
-		)
-		
-		if not quality_opened:
-			# Close menu and exit
-			await click_ui_element(
-				stream_page, 
-				'button[data-a-target="player-settings-button"]', 
-				"player settings button (close)", 
-				timeout=2000
-			)
+		# Normally seed_low_quality_playback already chose the quality before the player mounted
+		seeded = await stream_page.evaluate("() => { try { return localStorage.getItem('video-quality'); } catch (e) { return null; } }")
+		if isinstance(seeded, str) and LOW_PLAYBACK_QUALITY in seeded:
 			return
-
-		# Click the lowest available quality (Audio Only or lowest p)
-		await stream_page.evaluate(
-			r"""
-			() => {
-			  const menu = document.querySelector('div[role="menu"]');
-			  if (!menu) return false;
-			  const candidates = Array.from(menu.querySelectorAll('[role="menuitemradio"], input[type="radio"], label'));
-			  if (!candidates.length) return false;
-			  const getQualityScore = (el) => {
-				const t = (el.innerText || el.textContent || '').toLowerCase();
-				if (t.includes('audio only')) return 0; // best for bandwidth
-				const m = t.match(/(\d+)p/);
-				if (m) return parseInt(m[1], 10);
-				// Unknown labels get a high score so they won't be chosen over known low qualities
-				return 9999;
-			  };
-			  let bestEl = null;
-			  let best = 9999;
-			  for (const el of candidates) {
-				const score = getQualityScore(el);
-				if (score < best) {
-				  best = score;
-				  bestEl = el;
-				}
-			  }
-			  if (bestEl) {
-				const clickable = bestEl.closest('[role="menuitemradio"]') || bestEl;
-				clickable.click();
-				return true;
-			  }
-			  return false;
-			}
-			"""
-		)
-		await asyncio.sleep(0.3)
-		# Close settings menu using unified function
-		await click_ui_element(
-			stream_page, 
-			'button[data-a-target="player-settings-button"]', 
-			"player settings button (close)", 
-			timeout=2000
-		)
+	except Exception:
+		pass
+	try:
+		# Wait for the settings button, open settings, open Quality, pick the lowest option and close the menu in one evaluate
+		result = await stream_page.evaluate(_PICK_LOWEST_QUALITY_JS)
+		logging.debug(f"Low quality selection: {result}")
 	except Exception:
 		pass
 
-async def is_browser_context_valid(context) -> bool:
-	"""Check if the browser context is still valid and responsive."""
+def track_context_close(context):
+	"""Record when context closes so validity checks don't have to probe it."""
 	try:
-		if context is None:
-			return False
-		# Try to get pages to test if context is responsive
-		pages = context.pages
-		return len(pages) >= 0  # If we can get pages, context is valid
+		context.on("close", lambda *_: _CLOSED_CONTEXTS.add(context))
 	except Exception:
-		return False
+		pass
+
+async def is_browser_context_valid(context) -> bool:
+	"""Check if the browser context is still open (tracked via its close event)."""
+	return context is not None and context not in _CLOSED_CONTEXTS
 
 async def recover_browser_context(p, current_context=None):
 	"""Attempt to recover from a closed browser context by creating a new one."""
@@ -3909,30 +5055,33 @@ async def claim_available_rewards(inv_page, navigate: bool = True) -> int:
 
 	claimed = 0
 	try:
-		await goto_with_exit(inv_page, TWITCH_INVENTORY_URL, timeout=120000, wait_until="domcontentloaded")
-		await maybe_accept_cookies(inv_page)
-		await inv_page.wait_for_timeout(500)
 		if navigate:
-			await goto_with_exit(inv_page, TWITCH_INVENTORY_URL, timeout=120000, wait_until="domcontentloaded")
-			await maybe_accept_cookies(inv_page)
-			await inv_page.wait_for_timeout(500)
-		claim_buttons = await inv_page.query_selector_all('button:has-text("Claim")')
-		for btn in claim_buttons:
+			await _load_inventory_page(inv_page, ready_selector=INVENTORY_CLAIMED_READY_SELECTOR)
+		# Claimed buttons re-render, so click from the last match backwards: earlier nth()
+		# indices stay valid, which concurrent clicks couldn't guarantee
+		# One count() round-trip covers the usual no-claims poll
+		claim_locator = inv_page.locator(CLAIM_BUTTON_SELECTOR)
+		for position, index in enumerate(reversed(range(await claim_locator.count()))):
+			if position:
+				# Space consecutive claims out; nothing to wait for after the last one
+				await asyncio.sleep(CLAIM_CLICK_SPACING_SECONDS)
+			btn = claim_locator.nth(index)
 			try:
 				await btn.click(force=True)
 				claimed += 1
 				logging.info("Claimed a reward")
-				await asyncio.sleep(0.5)
 			except Exception:
 				try:
 					await btn.click()
 					claimed += 1
 					logging.info("Claimed a reward (fallback click)")
-					await asyncio.sleep(0.5)
 				except Exception:
 					continue
 	except Exception:
 		pass
+	if claimed:
+		# Claimed cards move sections; progress/claimed scrapes must not reuse the old page state
+		invalidate_inventory_page(inv_page)
 	return claimed
 
 async def watch_streamer(stream_page, inv_page, streamer_name: str):
@@ -3940,105 +5089,123 @@ async def watch_streamer(stream_page, inv_page, streamer_name: str):
 	url = stream_page.url
 	logging.info(f"Watching stream: {url}")
 
-async def poll_until_reward_complete(context, inv_page, streamer_name: str, item_name: str = "", streamer_url: str | None = None):
+def _page_is_closed(page) -> bool:
+	try:
+		return bool(page.is_closed())
+	except Exception:
+		return False
+
+async def poll_inventory(inv_page, checks, *, stopped, label: str, on_timeout=None):
+	"""Run checks once per inventory poll cycle until one of them returns a result.
+
+	Each check is a zero-argument coroutine function returning None to keep polling or the value
+	to return. Cycles are paced by wait_for_inventory_change; `stopped` is returned on exit
+	request or when MAX_WATCH_HOURS_PER_REWARD runs out.
+	"""
 	total_wait_seconds = MAX_WATCH_HOURS_PER_REWARD * 3600
 	waited = 0
-	last_percent = None
-	target_drop = {"streamer": streamer_name, "item": item_name, "url": streamer_url or ""}
-	logging.info(f"Tracking streamer '{streamer_name}' item '{item_name}' by inventory title match")
 	while waited < total_wait_seconds:
 		if EXIT_EVENT.is_set():
 			logging.info("Exit requested; stopping progress polling.")
-			return False
+			return stopped
+		if _page_is_closed(inv_page):
+			# The workflow loop reopens the tab on its next pass
+			logging.info("Inventory tab closed; stopping progress polling.")
+			return stopped
+		try:
+			for check in checks:
+				outcome = await check()
+				if outcome is not None:
+					return outcome
+			waited += await wait_for_inventory_change(inv_page, INVENTORY_POLL_INTERVAL_SECONDS)
+		except Exception as e:
+			logging.warning(f"Poll {label} issue: {e}")
+			await sleep_or_exit(INVENTORY_POLL_INTERVAL_SECONDS)
+			waited += INVENTORY_POLL_INTERVAL_SECONDS
+	if on_timeout is not None:
+		on_timeout()
+	return stopped
+
+def _general_progress_check(inv_page, target_title_substr: str, on_complete):
+	"""Build a poll_inventory check that tracks a general-area title and calls on_complete at 100%."""
+	target_lower = (target_title_substr or '').strip().lower()
+
+	async def check():
+		# get_general_drops_progress_map (re)loads the inventory only when the page is stale;
+		# progressbars may not exist when the item is claimable, which is not an error
+		general_map = await get_general_drops_progress_map(inv_page)
+		for title, percent in (general_map or {}).items():
+			if isinstance(title, str) and target_lower in title.lower():
+				if not isinstance(percent, int):
+					return None
+				logging.info(f"[General] {title} Progress: {percent}%")
+				try:
+					update_cached_drops_data(None, {title: percent})
+				except Exception as e:
+					logging.debug(f"Failed to update cache during general progress tracking: {e}")
+				return await on_complete() if percent >= 100 else None
+		return None
+
+	return check
+
+async def poll_until_reward_complete(context, inv_page, streamer_name: str, item_name: str = "", streamer_url: str | None = None):
+	target_drop = {"streamer": streamer_name, "item": item_name, "url": streamer_url or ""}
+	logging.info(f"Tracking streamer '{streamer_name}' item '{item_name}' by inventory title match")
+	state = {"last_percent": None, "last_online_check": None}
+
+	async def online_check():
 		# Check live status on Facepunch periodically (every ~2 minutes)
 		try:
-			if waited % max(1, (2 * 60)) == 0:
+			last = state["last_online_check"]
+			if last is None or time.monotonic() - last >= 2 * 60:
+				state["last_online_check"] = time.monotonic()
 				status = await is_streamer_online_on_facepunch(context, streamer_name)
 				if status is False:
 					logging.info(f"Streamer '{streamer_name}' appears offline on Facepunch. Moving on.")
 					return False
 		except Exception:
 			pass
+		return None
+
+	async def progress_check():
+		progress_map = await get_inventory_progress_map(inv_page)
+		percent, title, score = match_streamer_drop_progress(target_drop, progress_map)
+		if percent is None or not title:
+			logging.info(f"No inventory entry found for streamer '{streamer_name}' / '{item_name}'.")
+			return None
+		logging.info(f"[{title}] Progress: {percent}% (score={score})")
+		if isinstance(percent, int):
+			state["last_percent"] = percent
 		try:
-			await goto_with_exit(inv_page, TWITCH_INVENTORY_URL, timeout=120000, wait_until="domcontentloaded")
-			await maybe_accept_cookies(inv_page)
-			await inv_page.wait_for_timeout(600)
-			progress_map = await get_inventory_progress_map(inv_page)
-			percent, title, score = match_streamer_drop_progress(target_drop, progress_map)
-			if percent is not None and title:
-				logging.info(f"[{title}] Progress: {percent}% (score={score})")
-				last_percent = percent if isinstance(percent, int) else last_percent
-				try:
-					update_cached_drops_data(None, {title: percent})
-				except Exception as e:
-					logging.debug(f"Failed to update cache during progress tracking: {e}")
-				if isinstance(percent, int) and percent >= 100:
-					return True
-			else:
-				logging.info(f"No inventory entry found for streamer '{streamer_name}' / '{item_name}'.")
-			await asyncio.sleep(INVENTORY_POLL_INTERVAL_SECONDS)
-			waited += INVENTORY_POLL_INTERVAL_SECONDS
+			update_cached_drops_data(None, {title: percent})
 		except Exception as e:
-			logging.warning(f"Poll inventory issue: {e}")
-			await asyncio.sleep(INVENTORY_POLL_INTERVAL_SECONDS)
-			waited += INVENTORY_POLL_INTERVAL_SECONDS
-	logging.info(f"Max watch time reached without detecting completion (last percent={last_percent}).")
-	return False
+			logging.debug(f"Failed to update cache during progress tracking: {e}")
+		return True if isinstance(percent, int) and percent >= 100 else None
+
+	async def cycle_check():
+		# The Facepunch check and the inventory read hit different tabs, so overlap them
+		online, progress = await asyncio.gather(online_check(), progress_check(), return_exceptions=True)
+		if online is False:
+			return False
+		if isinstance(progress, BaseException):
+			raise progress
+		return progress
+
+	return await poll_inventory(
+		inv_page, (cycle_check,), stopped=False, label="inventory",
+		on_timeout=lambda: logging.info(
+			f"Max watch time reached without detecting completion (last percent={state['last_percent']})."
+		),
+	)
 
 async def poll_until_title_complete(context, inv_page, target_title_substr: str) -> bool:
 	"""Track progress for an inventory title substring until it reaches 100% or exit is requested."""
-	total_wait_seconds = MAX_WATCH_HOURS_PER_REWARD * 3600
-	waited = 0
-	target_lower = (target_title_substr or '').strip().lower()
-	while waited < total_wait_seconds:
-		if EXIT_EVENT.is_set():
-			return False
-		try:
-			await goto_with_exit(inv_page, TWITCH_INVENTORY_URL, timeout=120000, wait_until="domcontentloaded")
-			await maybe_accept_cookies(inv_page)
-			# Early claim if present
-            # Do not auto-claim; user will claim manually
-			# Progressbars may not exist when the item is claimable; do not treat as error
-			try:
-				await inv_page.wait_for_selector('[role="progressbar"][aria-valuenow]', timeout=15000)
-			except Exception:
-				await inv_page.wait_for_timeout(800)
-				try:
-					await inv_page.wait_for_selector('[role="progressbar"][aria-valuenow]', timeout=8000)
-				except Exception:
-					pass
-			await inv_page.wait_for_timeout(600)
-			# Restrict general progress search to the general drops area only
-			general_map = await get_general_drops_progress_map(inv_page)
-			# Find a matching title in the general area
-			match_title = None
-			match_percent = None
-			for title, percent in (general_map or {}).items():
-				if isinstance(title, str) and target_lower in (title or '').lower():
-					match_title = title
-					match_percent = percent if isinstance(percent, int) else None
-					break
-			if match_title is not None and isinstance(match_percent, int):
-				p = match_percent
-				logging.info(f"[General] {match_title} Progress: {p}%")
-				
-				# Update cache with current progress
-				try:
-					progress_map = {match_title: p}
-					update_cached_drops_data(None, progress_map)
-				except Exception as e:
-					logging.debug(f"Failed to update cache during general progress tracking: {e}")
-				
-				if p >= 100:
-					await claim_available_rewards(inv_page)
-					return True
-			await asyncio.sleep(INVENTORY_POLL_INTERVAL_SECONDS)
-			waited += INVENTORY_POLL_INTERVAL_SECONDS
-		except Exception as e:
-			logging.warning(f"Poll general title issue: {e}")
-			await asyncio.sleep(INVENTORY_POLL_INTERVAL_SECONDS)
-			waited += INVENTORY_POLL_INTERVAL_SECONDS
-	return False
+	async def on_complete():
+		await claim_available_rewards(inv_page)
+		return True
+
+	check = _general_progress_check(inv_page, target_title_substr, on_complete)
+	return await poll_inventory(inv_page, (check,), stopped=False, label="general title")
 
 
 async def poll_general_until_complete_or_streamer_available(context, inv_page, target_title_substr: str, completed_streamers) -> tuple[bool, bool]:
@@ -4046,97 +5213,69 @@ async def poll_general_until_complete_or_streamer_available(context, inv_page, t
 
 	Switch to streamer when any live streamer-specific drop is detected as present in inventory and < 100%.
 	"""
-	total_wait_seconds = MAX_WATCH_HOURS_PER_REWARD * 3600
-	waited = 0
-	target_lower = (target_title_substr or '').strip().lower()
-	while waited < total_wait_seconds:
-		if EXIT_EVENT.is_set():
-			return (False, False)
-		try:
-			# Check general progress
-			await goto_with_exit(inv_page, TWITCH_INVENTORY_URL, timeout=120000, wait_until="domcontentloaded")
-			await maybe_accept_cookies(inv_page)
-            # Do not auto-claim; user will claim manually
-			# Progressbars may not exist when the item is claimable; do not treat as error
-			try:
-				await inv_page.wait_for_selector('[role="progressbar"][aria-valuenow]', timeout=15000)
-			except Exception:
-				await inv_page.wait_for_timeout(800)
-				try:
-					await inv_page.wait_for_selector('[role="progressbar"][aria-valuenow]', timeout=8000)
-				except Exception:
-					pass
-			await inv_page.wait_for_timeout(600)
-			# Restrict general progress search to the general drops area only
-			general_map = await get_general_drops_progress_map(inv_page)
-			# Find a matching title in the general area
-			match_title = None
-			match_percent = None
-			for title, percent in (general_map or {}).items():
-				if isinstance(title, str) and target_lower in (title or '').lower():
-					match_title = title
-					match_percent = percent if isinstance(percent, int) else None
-					break
-			if match_title is not None and isinstance(match_percent, int):
-				p = match_percent
-				logging.info(f"[General] {match_title} Progress: {p}%")
-				
-				# Update cache with current progress
-				try:
-					progress_map = {match_title: p}
-					update_cached_drops_data(None, progress_map)
-				except Exception as e:
-					logging.debug(f"Failed to update cache during general progress tracking: {e}")
-				
-				if p >= 100:
-					# Completed; do not auto-claim
-					return (True, False)
-
-			# After logging progress, also check if any streamer-specific items need progress
-			fp = await fetch_facepunch_drops(context)
-			streamer_targets = fp.get('streamer', []) if fp else []
-			logging.info(f"[STREAMER-CHECK] Checking {len(streamer_targets)} streamer targets for completion status")
-			for st in streamer_targets:
-				name = (st.get('streamer') or '').strip()
-				if not name:
-					logging.info("[STREAMER-CHECK] Skipping streamer: empty name")
-					continue
-				# Only use Facepunch for live status
-				if not bool(st.get('is_live')):
-					logging.info(f"[STREAMER-CHECK] Skipping '{name}': not live")
-					continue
-				name_lower = name.lower()
-				if name_lower in completed_streamers:
-					logging.info(f"[STREAMER-CHECK] Skipping '{name}': already in completed_streamers set")
-					continue
-				# If we haven't already completed this streamer drop historically, switch now
-				days = await get_claimed_days_for_streamer(inv_page, name)
-				if days is not None:
-					# Already claimed previously; skip
-					logging.info(f"[STREAMER-CHECK] Skipping '{name}': claimed {days} day(s) ago")
-					completed_streamers.add(name_lower)
-					continue
+	async def on_complete():
+		# Completed; do not auto-claim
+		return (True, False)
+
+	async def streamer_check():
+		# After logging progress, also check if any streamer-specific items need progress
+		fp = await fetch_facepunch_drops(context)
+		streamer_targets = fp.get('streamer', []) if fp else []
+		logging.info(f"[STREAMER-CHECK] Checking {len(streamer_targets)} streamer targets for completion status")
+		for st in streamer_targets:
+			name = (st.get('streamer') or '').strip()
+			if not name:
+				logging.info("[STREAMER-CHECK] Skipping streamer: empty name")
+				continue
+			# Only use Facepunch for live status
+			if not bool(st.get('is_live')):
+				logging.info(f"[STREAMER-CHECK] Skipping '{name}': not live")
+				continue
+			name_lower = name.lower()
+			if name_lower in completed_streamers:
+				logging.info(f"[STREAMER-CHECK] Skipping '{name}': already in completed_streamers set")
+				continue
+			# If we haven't already completed this streamer drop historically, switch now
+			days = await get_claimed_days_for_streamer(inv_page, name)
+			if days is not None:
+				# Already claimed previously; skip
+				logging.info(f"[STREAMER-CHECK] Skipping '{name}': claimed {days} day(s) ago")
+				completed_streamers.add(name_lower)
+				continue
 
-				logging.info(f"Switching to streamer-specific drop: {name} ({st.get('item')})")
-				return (False, True)
+			logging.info(f"Switching to streamer-specific drop: {name} ({st.get('item')})")
+			return (False, True)
+		return None
 
-			await asyncio.sleep(INVENTORY_POLL_INTERVAL_SECONDS)
-			waited += INVENTORY_POLL_INTERVAL_SECONDS
-		except Exception as e:
-			logging.warning(f"Poll general/switch check issue: {e}")
-			await asyncio.sleep(INVENTORY_POLL_INTERVAL_SECONDS)
-			waited += INVENTORY_POLL_INTERVAL_SECONDS
-	return (False, False)
+	check = _general_progress_check(inv_page, target_title_substr, on_complete)
+	return await poll_inventory(
+		inv_page, (check, streamer_check), stopped=(False, False), label="general/switch check"
+	)
+
+async def open_inventory_page(context):
+	"""Create the long-lived inventory tab the workflow scrapes and polls from.
+
+	The tab stays on the inventory for the whole run; _load_inventory_page only reloads it when
+	its content is stale, so the installed scrapers and progress watcher stay warm.
+	"""
+	inv_page = await context.new_page()
+	await block_heavy_resources(inv_page)
+	await install_scrapers(inv_page)
+	capture_inventory_gql(inv_page)
+	return inv_page
 
 async def run_drops_workflow(context, test_mode=False):
 	global current_working_page
-	inv_page = await context.new_page()
+	inv_page = await open_inventory_page(context)
 	completed_streamers = set()
 	try:
 		while True:
 			if EXIT_EVENT.is_set():
 				logging.info("Exit requested; stopping workflow loop.")
 				return
+			if _page_is_closed(inv_page):
+				logging.info("Inventory tab was closed; opening a new one.")
+				inv_page = await open_inventory_page(context)
 			# Refresh drop-enabled games cache periodically for the new dashboard section.
 			try:
 				force_refresh = GAMES_REFRESH_REQUESTED.is_set()
@@ -4160,12 +5299,16 @@ async def run_drops_workflow(context, test_mode=False):
 				await watch_selected_games_cycle(context, inv_page, enabled_game_prefs)
 				continue
 
-			fp = await fetch_facepunch_drops(context)
+			# Facepunch and the inventory are scraped on separate tabs, so overlap the two loads
+			fp, progress_map = await asyncio.gather(
+				fetch_facepunch_drops(context),
+				get_inventory_progress_map(inv_page),
+			)
 			if fp.get("fetch_failed"):
 				logging.warning(
 					"Facepunch data could not be refreshed; preserving current state and retrying."
 				)
-				await asyncio.sleep(10)
+				await sleep_or_exit(10)
 				continue
 			# If the campaign hasn't started yet, notify and exit early (unless in test mode)
 			try:
@@ -4182,18 +5325,17 @@ async def run_drops_workflow(context, test_mode=False):
 					if test_mode:
 						logging.info("Test mode: Continuing despite event not started yet.")
 						# In test mode, just wait a bit and continue
-						await asyncio.sleep(10)
+						await sleep_or_exit(10)
 						continue
 					else:
 						logging.info("Cannot continue; exiting until event begins.")
-						EXIT_EVENT.set()
+						request_exit()
 						return
 			except Exception:
 				pass
 			streamer_targets = fp.get('streamer', [])
 
 			# Gather in-progress titles to prioritize watching those
-			progress_map = await get_inventory_progress_map(inv_page)
 			logging.info(f"[PROGRESS-MAP] Retrieved progress map with {len(progress_map)} items:")
 			for title, percent in progress_map.items():
 				logging.info(f"[PROGRESS-MAP] '{title}' = {percent}%")
@@ -4225,11 +5367,7 @@ async def run_drops_workflow(context, test_mode=False):
 			update_cached_drops_data(fp, progress_map, recently_claimed, general_progress_map)
 			
 			# Check for ready-to-claim items and log them
-			ready_to_claim_items = []
-			if progress_map:
-				for title, percent in progress_map.items():
-					if isinstance(percent, int) and percent >= 100:
-						ready_to_claim_items.append(title)
+			ready_to_claim_items = ready_to_claim_titles(progress_map)
 			
 			if ready_to_claim_items:
 				logging.info(f"[READY-TO-CLAIM] Found {len(ready_to_claim_items)} items ready to claim: {ready_to_claim_items}")
@@ -4255,11 +5393,7 @@ async def run_drops_workflow(context, test_mode=False):
 			# Build candidates only for streamer-specific items present in inventory (<100%)
 			candidates = []
 			live_any = []
-			inventory_entries = list((progress_map or {}).items())
-			logging.info(f"[INVENTORY-ENTRIES] Processing {len(inventory_entries)} inventory entries:")
-			for title, percent in inventory_entries:
-				logging.info(f"[INVENTORY-ENTRIES] '{(title or '').lower()}' = {percent}%")
-			
+			# Entries were already logged under [PROGRESS-MAP] above
 			# Debug lists for better visibility
 			streamer_drops_with_progress = []
 			streamer_drops_no_progress = []
@@ -4376,40 +5510,10 @@ async def run_drops_workflow(context, test_mode=False):
 				})
 				
 				# Open streamer and run per-streamer completion tracking
-				fp_page = await context.new_page()
-				stream_page = None
-				try:
-					try:
-						await goto_with_exit(fp_page, FACEPUNCH_DROPS_URL, timeout=120000, wait_until="domcontentloaded")
-						await asyncio.sleep(0.5)
-						box = await fp_page.query_selector(f'.streamer-drops .drop-box:has(.streamer-name:has-text("{target_name}"))')
-						if box:
-							try:
-								async with context.expect_page() as p_info:
-									btn = await box.query_selector('a.drop-box-body, .drop-box-body')
-									if btn:
-										await btn.click()
-									else:
-										header_link = await box.query_selector('.drop-box-header a.streamer-info')
-										if header_link:
-											await header_link.click()
-								stream_page = await p_info.value
-								# Update the current working page for screenshots
-								current_working_page = stream_page
-							except Exception:
-								stream_page = None
-					except Exception:
-						stream_page = None
-					if not stream_page and target_url:
-						stream_page = await context.new_page()
-						await goto_with_exit(stream_page, target_url, timeout=120000, wait_until="domcontentloaded")
-						# Update the current working page for screenshots
-						current_working_page = stream_page
-				finally:
-					try:
-						await fp_page.close()
-					except Exception:
-						pass
+				stream_page = await open_stream_for_streamer(context, target_name, target_url)
+				if stream_page:
+					# Update the current working page for screenshots
+					current_working_page = stream_page
 				if not stream_page:
 					logging.error("Could not open stream for chosen target. Will refresh and pick again.")
 					await asyncio.sleep(2)
@@ -4437,7 +5541,7 @@ async def run_drops_workflow(context, test_mode=False):
 					claim_result = await claim_available_rewards(inv_page)
 					if claim_result == -1:
 						logging.error("Browser context issue during claim operation, stopping workflow")
-						EXIT_EVENT.set()
+						request_exit()
 						return
 					completed_streamers.add((target_name or "").lower())
 					# Clear current working item
@@ -4455,7 +5559,7 @@ async def run_drops_workflow(context, test_mode=False):
 				claim_result = await claim_available_rewards(inv_page)
 				if claim_result == -1:
 					logging.error("Browser context issue during general drops claim operation, stopping workflow")
-					EXIT_EVENT.set()
+					request_exit()
 					return
 			except Exception:
 				pass
@@ -4463,18 +5567,14 @@ async def run_drops_workflow(context, test_mode=False):
 			if general_drops_complete:
 				# Check if there are any ready-to-claim items that need manual claiming
 				progress_map = await get_inventory_progress_map(inv_page)
-				ready_to_claim_items = []
-				if progress_map:
-					for title, percent in progress_map.items():
-						if isinstance(percent, int) and percent >= 100:
-							ready_to_claim_items.append(title)
+				ready_to_claim_items = ready_to_claim_titles(progress_map)
 				
 				if ready_to_claim_items:
 					logging.info(f"All general drops are complete, but {len(ready_to_claim_items)} items are ready to claim: {ready_to_claim_items}")
 					logging.info("Continuing to monitor for manual claiming...")
 				else:
 					logging.info("All general drops are complete and claimed. Exiting program.")
-					EXIT_EVENT.set()
+					request_exit()
 					return
 			# Additional guard: if Facepunch general list is empty but site shows not-started or locked items, handle gracefully
 			try:
@@ -4487,7 +5587,7 @@ async def run_drops_workflow(context, test_mode=False):
 						send_notification("Twitch Drops", f"Twitch drop starting in {when} ({label})")
 					except Exception:
 						pass
-					EXIT_EVENT.set()
+					request_exit()
 					return
 			except Exception:
 				pass
@@ -4505,7 +5605,7 @@ async def run_drops_workflow(context, test_mode=False):
 				# Use any live streamer while tracking the general item
 				if not live_any:
 					logging.info("No live streamers available to track general drops right now. Retrying later.")
-					await asyncio.sleep(10)
+					await sleep_or_exit(10)
 					continue
 				live_any.sort(key=lambda s: 0 if (s.get('streamer') or '').strip().lower() in in_progress_titles else 1)
 				target_name = (live_any[0].get('streamer') or '').strip()
@@ -4521,40 +5621,10 @@ async def run_drops_workflow(context, test_mode=False):
 					"status": "general drop tracking"
 				})
 				
-				fp_page = await context.new_page()
-				stream_page = None
-				try:
-					try:
-						await goto_with_exit(fp_page, FACEPUNCH_DROPS_URL, timeout=120000, wait_until="domcontentloaded")
-						await asyncio.sleep(0.5)
-						box = await fp_page.query_selector(f'.streamer-drops .drop-box:has(.streamer-name:has-text("{target_name}"))')
-						if box:
-							try:
-								async with context.expect_page() as p_info:
-									btn = await box.query_selector('a.drop-box-body, .drop-box-body')
-									if btn:
-										await btn.click()
-									else:
-										header_link = await box.query_selector('.drop-box-header a.streamer-info')
-										if header_link:
-											await header_link.click()
-								stream_page = await p_info.value
-								# Update the current working page for screenshots
-								current_working_page = stream_page
-							except Exception:
-								stream_page = None
-					except Exception:
-						stream_page = None
-					if not stream_page and target_url:
-						stream_page = await context.new_page()
-						await goto_with_exit(stream_page, target_url, timeout=120000, wait_until="domcontentloaded")
-						# Update the current working page for screenshots
-						current_working_page = stream_page
-				finally:
-					try:
-						await fp_page.close()
-					except Exception:
-						pass
+				stream_page = await open_stream_for_streamer(context, target_name, target_url)
+				if stream_page:
+					# Update the current working page for screenshots
+					current_working_page = stream_page
 				if not stream_page:
 					logging.error("Could not open stream for chosen target in general mode. Will refresh and pick again.")
 					await asyncio.sleep(2)
@@ -4602,7 +5672,7 @@ async def run_drops_workflow(context, test_mode=False):
 				await watch_selected_games_cycle(context, inv_page, non_rust_enabled_games)
 				continue
 			logging.info("No live streamer drops and no general progress to track. Retrying shortly.")
-			await asyncio.sleep(10)
+			await sleep_or_exit(10)
 			continue
 
 	finally:
@@ -4613,6 +5683,7 @@ async def run_drops_workflow(context, test_mode=False):
 
 async def main(start_tray: bool = True, test_mode: bool = False, enable_web: bool = True):
 	logging.info("--- Starting Twitch Drop Automator ---")
+	clean_update_leftovers()
 	
 	# Check if test mode is enabled in config (overrides command line)
 	config_test_mode = PREFERENCES.get('test_mode', False) if PREFERENCES else False
@@ -4632,7 +5703,7 @@ async def main(start_tray: bool = True, test_mode: bool = False, enable_web: boo
 	
 	# Start tray icon for quick toggles (optionally skipped on macOS; see __main__)
 	try:
-		global TRAY_ICON, ICON_PATH
+		global TRAY_ICON
 		if start_tray:
 			try:
 				TRAY_ICON = start_system_tray(block=False)
@@ -4641,10 +5712,7 @@ async def main(start_tray: bool = True, test_mode: bool = False, enable_web: boo
 			except Exception as tray_err:
 				logging.error(f"Failed to start system tray: {tray_err}")
 				TRAY_ICON = None
-		# Prepare .ico for notifications regardless of tray availability
-		ICON_PATH = ensure_icon_file(_generate_tray_icon_image())
-		logging.info(f"Notification icon: {ICON_PATH}")
-		# One-time startup notification to verify toasts
+		# One-time startup notification to verify toasts (creates the .ico on first use)
 		send_notification("Twitch Drops", "Automator started")
 	except Exception as e:
 		logging.debug(f"Tray start failed: {e}")
@@ -4652,9 +5720,10 @@ async def main(start_tray: bool = True, test_mode: bool = False, enable_web: boo
 	async with async_playwright() as p:
 		try:
 			context = await run_flow(p)
-			# Set global browser context for screenshot capture
-			global current_browser_context
+			# Set global browser context for screenshot capture and dashboard scrapes
+			global current_browser_context, _BROWSER_LOOP
 			current_browser_context = context
+			_BROWSER_LOOP = asyncio.get_running_loop()
 		except asyncio.CancelledError:
 			logging.info("Startup cancelled.")
 			return
@@ -4683,6 +5752,7 @@ async def main(start_tray: bool = True, test_mode: bool = False, enable_web: boo
 			if not test_mode:
 				logging.info("Closing browser.")
 				current_browser_context = None
+				_BROWSER_LOOP = None
 				await context.close()
 			else:
 				logging.info("Test mode: Browser kept open for testing")
@@ -4693,50 +5763,81 @@ async def is_streamer_online_on_facepunch(context, streamer_name: str) -> bool |
 	None if not found on page (unknown)."""
 	if not streamer_name:
 		return None
-	page = await context.new_page()
+	fp = await fetch_facepunch_drops(context, max_age=FACEPUNCH_ONLINE_CACHE_SECONDS)
+	if fp.get("fetch_failed"):
+		return None
+	target = streamer_name.strip().lower()
+	for st in fp.get("streamer") or []:
+		if target in (st.get("streamer") or "").lower():
+			return bool(st.get("is_live"))
+	return None
+
+async def _open_stream_via_facepunch(context, target_name: str):
+	await fetch_facepunch_drops(context)
+	fp_page = await get_facepunch_page(context)
+	box = await fp_page.query_selector(f'.streamer-drops .drop-box:has(.streamer-name:has-text("{target_name}"))')
+	if not box:
+		return None
+	# Listen for fp_page's own popup, not any new context page: the direct path's
+	# new_page() can land in the same window and must not be mistaken for the click's tab.
+	async with fp_page.expect_popup() as p_info:
+		btn = await box.query_selector('a.drop-box-body, .drop-box-body')
+		if btn:
+			await btn.click()
+		else:
+			header_link = await box.query_selector('.drop-box-header a.streamer-info')
+			if header_link:
+				await header_link.click()
+	return await p_info.value
+
+async def _open_stream_via_url(context, target_url: str):
+	stream_page = await context.new_page()
 	try:
-		# Add cache-busting headers specifically for Facepunch
-		await page.set_extra_http_headers({
-			'Cache-Control': 'no-cache, no-store, must-revalidate',
-			'Pragma': 'no-cache',
-			'Expires': '0'
-		})
-		
-		# Add timestamp to URL to prevent caching
-		import time
-		cache_bust_url = f"{FACEPUNCH_DROPS_URL}?t={int(time.time() * 1000)}"
-		
-		await goto_with_exit(page, cache_bust_url, timeout=120000, wait_until="domcontentloaded")
-		
-		# Clear Facepunch-specific cache storage
+		await goto_with_exit(stream_page, target_url, timeout=120000, wait_until="domcontentloaded")
+	except BaseException:
 		try:
-			await page.evaluate("""
-				// Clear only Facepunch-related cache
-				if (caches && caches.keys) {
-					caches.keys().then(keys => {
-						keys.forEach(key => {
-							if (key.includes('facepunch') || key.includes('twitch.facepunch')) {
-								caches.delete(key);
-							}
-						});
-					});
-				}
-			""")
+			await stream_page.close()
 		except Exception:
 			pass
-		await asyncio.sleep(0.5)
-		box = await page.query_selector(f'.streamer-drops .drop-box:has(.streamer-name:has-text("{streamer_name}"))')
-		if not box:
-			return None
-		online_node = await box.query_selector('.online-status, div.online-status')
-		return True if online_node else False
-	except Exception:
-		return None
+		raise
+	return stream_page
+
+def _close_page_when_done(task: asyncio.Task):
+	"""Close the page a losing open_stream_for_streamer path produces, whenever it finishes."""
+	def _done(t):
+		if t.cancelled() or t.exception() is not None or t.result() is None:
+			return
+		asyncio.ensure_future(t.result().close())
+	task.add_done_callback(_done)
+
+async def open_stream_for_streamer(context, target_name: str, target_url: str | None = None):
+	"""Open target_name's stream, racing the Facepunch drop-box click against target_url.
+
+	Whichever path yields a page first wins, so a slow Facepunch doesn't delay the switch and
+	vice versa. The direct load is cancelled if the click wins; a popup that opens after the
+	direct load won is closed. Returns the new page or None.
+	"""
+	paths = [asyncio.create_task(_open_stream_via_facepunch(context, target_name))]
+	if target_url:
+		paths.append(asyncio.create_task(_open_stream_via_url(context, target_url)))
+	stream_page = None
+	pending = set(paths)
+	try:
+		while pending and stream_page is None:
+			done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+			for task in done:
+				if stream_page is None and not task.cancelled() and task.exception() is None:
+					stream_page = task.result()
+				elif stream_page is not None and not task.cancelled() and task.exception() is None and task.result() not in (None, stream_page):
+					await task.result().close()
 	finally:
-		try:
-			await page.close()
-		except Exception:
-			pass
+		for task in pending:
+			if task is paths[0]:
+				# Cancelling mid-click could orphan the popup; let it land and close it
+				_close_page_when_done(task)
+			else:
+				task.cancel()
+	return stream_page
 
 async def is_general_item_claimed_on_inventory(inv_page, item_name: str) -> bool | None:
 	"""Best-effort check if a general drop item appears claimed on the inventory page.
@@ -4767,11 +5868,24 @@ async def is_general_item_claimed_on_inventory(inv_page, item_name: str) -> bool
 			    if (/\byears?\s+ago\b/.test(t)) return true;
 			    return false;
 			  };
-			  const all = Array.from(document.querySelectorAll('p, span, div, a'));
-			  const nameEls = all.filter(el => {
-			    const txt = (el.textContent || '').toLowerCase();
-			    return txt && txt.includes(needle);
-			  }).slice(0, 40);
+			  // Let the native XPath engine find text matches instead of copying every node's text into JS.
+			  // translate() only folds ASCII, so non-ASCII needles (or ones needing both quote kinds) use the scan.
+			  const xpathLiteral = (s) => !s.includes("'") ? `'${s}'` : (!s.includes('"') ? `"${s}"` : null);
+			  const literal = /^[\x00-\x7f]*$/.test(needle) ? xpathLiteral(needle) : null;
+			  let nameEls = [];
+			  if (literal) {
+			    const it = document.evaluate(
+			      `//*[self::p or self::span or self::div or self::a][contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), ${literal})]`,
+			      document, null, XPathResult.ORDERED_NODE_ITERATOR_TYPE, null
+			    );
+			    let n;
+			    while (nameEls.length < 40 && (n = it.iterateNext())) nameEls.push(n);
+			  } else {
+			    nameEls = Array.from(document.querySelectorAll('p, span, div, a')).filter(el => {
+			      const txt = (el.textContent || '').toLowerCase();
+			      return txt && txt.includes(needle);
+			    }).slice(0, 40);
+			  }
 			  const upDepth = 6;
 			  for (const el of nameEls) {
 			    let node = el;
@@ -4809,15 +5923,19 @@ async def are_all_general_drops_complete(inv_page, general_list) -> bool:
 		if progress_map is None:
 			progress_map = {}
 		logging.info(f"[GENERAL-DROPS-CHECK] Found {len(progress_map)} items in general drops progress map")
+		# Lowercase titles once rather than per searched drop
+		titles_lower = [((title or '').lower(), pct) for title, pct in progress_map.items()]
 		def find_percent_for_any(needles: list[str]) -> int | None:
 			cands = [n.strip().lower() for n in (needles or []) if n and n.strip()]
 			if not cands:
 				return None
-			for title, pct in progress_map.items():
-				t = (title or '').lower()
+			for t, pct in titles_lower:
 				if any(n in t for n in cands):
 					return pct if isinstance(pct, int) else None
 			return None
+		# First pass uses only the scraped progress, so an incomplete drop returns before any
+		# claimed-area lookups are spent on drops without a progress bar
+		unresolved = []
 		for g in general_list:
 			item_name = g.get('item') if isinstance(g, dict) else None
 			alias = g.get('alias') if isinstance(g, dict) else None
@@ -4834,16 +5952,18 @@ async def are_all_general_drops_complete(inv_page, general_list) -> bool:
 					return False
 				logging.info(f"[GENERAL-DROPS-CHECK] General drop '{item_name}' is complete ({pct}%)")
 				continue
+			unresolved.append(item_name or alias)
+		for name in unresolved:
 			# A missing progress bar is ambiguous: Twitch may still be loading, the
 			# campaign may not have started, or selectors may have changed. Only mark
 			# it complete when the claimed-items area confirms the reward.
-			claimed = await is_general_item_claimed_on_inventory(inv_page, item_name or alias or "")
+			claimed = await is_general_item_claimed_on_inventory(inv_page, name or "")
 			if claimed is True:
-				logging.info(f"[GENERAL-DROPS-CHECK] Confirmed '{item_name or alias}' in claimed inventory")
+				logging.info(f"[GENERAL-DROPS-CHECK] Confirmed '{name}' in claimed inventory")
 				continue
 			logging.info(
 				f"[GENERAL-DROPS-CHECK] No progress or claimed confirmation for "
-				f"'{item_name or alias}' - completion is unknown"
+				f"'{name}' - completion is unknown"
 			)
 			return False
 		logging.info("[GENERAL-DROPS-CHECK] All general drops are complete - returning True")
@@ -4888,8 +6008,7 @@ def ensure_process_visibility_matches_preference():
 				logging.info("Restarting to match console visibility preference…")
 			except Exception:
 				pass
-			subprocess.Popen([preferred, script_path, *sys.argv[1:]], cwd=BASE_DIR, creationflags=flags)
-			os._exit(0)
+			_replace_process(preferred, [script_path, *sys.argv[1:]], flags)
 	except Exception:
 		pass
 
@@ -4897,6 +6016,8 @@ def ensure_process_visibility_matches_preference():
 if __name__ == "__main__":
 	# Parse command-line arguments
 	args = parse_arguments()
+	# The tray (and its pystray/Pillow imports) is skipped entirely when disabled by flag or preference
+	show_tray = not args.no_tray and bool(PREFERENCES.get('show_tray', True))
 	
 	# Ensure process matches the user's console visibility preference before running
 	try:
@@ -4905,7 +6026,7 @@ if __name__ == "__main__":
 		pass
 	
 	# On macOS, run tray in the main thread and the async app in a background thread
-	if IS_MAC and pystray is not None and not args.no_tray:
+	if IS_MAC and show_tray and _load_tray_modules():
 		def _run_async_app():
 			try:
 				asyncio.run(main(start_tray=False, test_mode=args.test, enable_web=not args.no_web))
@@ -4922,13 +6043,13 @@ if __name__ == "__main__":
 		except Exception as e:
 			logging.debug(f"Tray main loop exited: {e}")
 		# Request shutdown and wait briefly
-		EXIT_EVENT.set()
+		request_exit()
 		try:
 			thread.join(timeout=5.0)
 		except Exception:
 			pass
 	else:
 		try:
-			asyncio.run(main(start_tray=not args.no_tray, test_mode=args.test, enable_web=not args.no_web))
+			asyncio.run(main(start_tray=show_tray, test_mode=args.test, enable_web=not args.no_web))
 		except KeyboardInterrupt:
 			pass